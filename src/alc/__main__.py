@@ -0,0 +1,74 @@
+# -*- coding:utf-8 -*-
+'''
+Entry point of *alc*.
+
+usage::
+
+    python -m alc [--<config key>=<value> ...] [query ...]
+    python -m alc --batch [--jobs=N] [--input=<path>]
+                  [--<config key>=<value> ...] < queries
+
+e.g.::
+
+    python -m alc --first_week_day=6 --cache_path=/tmp/alc.sqlite 7 2014
+
+With *--batch*, queries are read from stdin (or *--input*) line by
+line. *--jobs* is number of worker processes (see *alc.batch*).
+
+Months of a query are written to stdout as each month is rendered
+(see *CalendarCommand.write*), so that a long span (e.g. '1900 +1199')
+is not kept in memory.
+
+This module imports nothing but *sys* until the command is executed,
+and *alc.command* imports modules for rendering only when they are used.
+'''
+
+import sys
+
+
+def parse_argv(argv):
+    '''
+    Return config of *CalendarCommand* from command line arguments.
+    Integer value is converted to int.
+
+    :param list argv: command line arguments without program name.
+    :rtype: dict
+    :return: config of *CalendarCommand*.
+    '''
+    config = {}
+    query = []
+    for arg in argv:
+        if arg.startswith('--') and '=' in arg:
+            key, value = arg[2:].split('=', 1)
+            config[key.replace('-', '_')] = \
+                int(value) if value.isdigit() else value
+        else:
+            query.append(arg)
+
+    config['query'] = ' '.join(query)
+    return config
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+
+    if '--batch' in argv:
+        from alc import batch
+        config = parse_argv([a for a in argv if a != '--batch'])
+        jobs = config.pop('jobs', 1)
+        path = config.pop('input', None)
+        stdin = open(path) if path else sys.stdin
+        try:
+            batch.run(stdin, sys.stdout, config, jobs)
+        finally:
+            if path:
+                stdin.close()
+        return
+
+    from alc.command import CalendarCommand
+    CalendarCommand(parse_argv(argv)).write(sys.stdout, flush=True)
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,299 @@
+# -*- coding:utf-8 -*-
+'''
+Events of local iCalendar (.ics) files.
+
+Events are parsed into an index stored in a SQLite file. An event is
+stored once per month which it overlaps, sorted by start date, so that
+events of a month are read without parsing the files. The index of a
+file is rebuilt only when its modification time or size is changed.
+
+e.g.::
+
+    index = EventIndex('/tmp/alc-events.sqlite')
+    index.update(['/path/to/calendar.ics'])
+    index.busy_days(2014, 7)
+    # set([1, 24, 25])
+    index.events(2014, 7)
+    # [(date(2014, 7, 1), date(2014, 7, 1), 'Meeting'), ...]
+    index.close()
+
+Only *DTSTART*, *DTEND* and *SUMMARY* of *VEVENT* are read. Time zone
+is ignored (date of the value is used), and recurrence rules are not
+expanded (only the first occurrence is indexed).
+'''
+
+import os
+import re
+
+from datetime import date
+
+_ESCAPED = re.compile(r'\\(.)')
+
+_UNESCAPE = {'n': ' ', 'N': ' '}
+
+
+def _unescape(text):
+    return _ESCAPED.sub(lambda m: _UNESCAPE.get(m.group(1), m.group(1)),
+                        text)
+
+
+def _decode(text):
+    '''
+    Return unicode of UTF-8 text. Invalid bytes are replaced, so that
+    an event is not lost by its summary.
+    '''
+    if isinstance(text, unicode):
+        return text
+    return text.decode('utf-8', 'replace')
+
+
+def _unfold(lines):
+    '''
+    Return logical lines of iCalendar. A line which starts with space or
+    tab continues the previous line.
+    '''
+    current = None
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if line[:1] in (' ', '\t'):
+            if current is not None:
+                current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+
+def _split_property(line):
+    '''
+    Return (name, value) of a content line. Parameters are discarded.
+    '''
+    quoted = False
+    for i, c in enumerate(line):
+        if c == '"':
+            quoted = not quoted
+        elif c == ':' and not quoted:
+            return line[:i].split(';', 1)[0].upper(), line[i + 1:]
+    return line.upper(), ''
+
+
+def _to_date(value):
+    return date(int(value[0:4]), int(value[4:6]), int(value[6:8]))
+
+
+def _end_ordinal(start, dtend):
+    '''
+    Return ordinal of the day after the last day of an event.
+    *DTEND* of a date is exclusive. *DTEND* at midnight does not include
+    the day.
+    '''
+    if not dtend:
+        return start.toordinal() + 1
+
+    end = _to_date(dtend).toordinal()
+    is_date = len(dtend) == 8
+    if is_date or (dtend[9:15] == '000000' and end > start.toordinal()):
+        return max(end, start.toordinal() + 1)
+    return end + 1
+
+
+def parse_ics(lines):
+    '''
+    Return events of iCalendar.
+    An event which has invalid date is skipped.
+
+    :param lines: iterable of lines (e.g. file object).
+    :rtype: generator
+    :return:
+        tuples of (start ordinal, end ordinal (exclusive), summary).
+        Summary is unicode.
+    '''
+    event = None
+    for line in _unfold(lines):
+        name, value = _split_property(line)
+        if name == 'BEGIN' and value.upper() == 'VEVENT':
+            event = {}
+        elif name == 'END' and value.upper() == 'VEVENT':
+            if event is not None and 'DTSTART' in event:
+                try:
+                    start = _to_date(event['DTSTART'])
+                    end = _end_ordinal(start, event.get('DTEND'))
+                except ValueError:
+                    start = None
+                if start is not None:
+                    yield (start.toordinal(), end,
+                           _decode(_unescape(event.get('SUMMARY', ''))))
+            event = None
+        elif event is not None and name in ('DTSTART', 'DTEND', 'SUMMARY'):
+            event[name] = value.strip() if name != 'SUMMARY' else value
+
+
+def _month_key(year, month):
+    return year * 12 + month - 1
+
+
+def _months(start, end):
+    '''
+    Return keys of months which a period of ordinals overlaps.
+    '''
+    first = date.fromordinal(start)
+    last = date.fromordinal(end - 1)
+    return xrange(_month_key(first.year, first.month),
+                  _month_key(last.year, last.month) + 1)
+
+
+def stamp(paths):
+    '''
+    Return modification time and size of files. It changes when any of
+    files is changed.
+
+    :param list paths: paths of iCalendar files.
+    :rtype: tuple
+    :return: tuples of (path, mtime, size). Missing file is (path,).
+    '''
+    result = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            result.append((path, st.st_mtime, st.st_size))
+        except OSError:
+            result.append((path,))
+    return tuple(result)
+
+
+class EventIndex(object):
+    '''
+    Index of events of iCalendar files stored in a SQLite file.
+
+    *sqlite3* is imported when an instance is created.
+    Any error of SQLite is ignored as *alc.cache.RenderCache*.
+    In that case, no event is returned.
+
+    :param str path: path of index file.
+    '''
+
+    def __init__(self, path):
+        import sqlite3
+
+        self._conn = None
+        try:
+            directory = os.path.dirname(path)
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory)
+            self._conn = sqlite3.connect(path)
+            self._conn.text_factory = str
+            self._setup()
+        except (OSError, sqlite3.Error):
+            self._conn = None
+
+    def _setup(self):
+        with self._conn:
+            self._conn.execute('PRAGMA synchronous = OFF')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS files ('
+                               'path TEXT PRIMARY KEY, mtime REAL, '
+                               'size INTEGER)')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS events ('
+                               'path TEXT, month INTEGER, start INTEGER, '
+                               'end INTEGER, summary TEXT)')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS events_month '
+                               'ON events (month, start)')
+
+    def update(self, paths):
+        '''
+        Rebuild index of files which are changed since last update.
+        Events of files which are not in *paths* are removed.
+
+        :param list paths: paths of iCalendar files.
+        :rtype: list
+        :return: paths of files which are parsed.
+        '''
+        if self._conn is None:
+            return []
+
+        import sqlite3
+        parsed = []
+        try:
+            with self._conn:
+                stored = dict((p, (mtime, size)) for p, mtime, size in
+                              self._conn.execute('SELECT * FROM files'))
+                for s in stamp(paths):
+                    path = s[0]
+                    if stored.pop(path, None) == s[1:]:
+                        continue
+                    self._remove(path)
+                    if len(s) == 3:
+                        self._add(path, *s[1:])
+                        parsed.append(path)
+                for path in stored:
+                    self._remove(path)
+        except (IOError, sqlite3.Error):
+            return []
+        return parsed
+
+    def _remove(self, path):
+        self._conn.execute('DELETE FROM events WHERE path = ?', (path,))
+        self._conn.execute('DELETE FROM files WHERE path = ?', (path,))
+
+    def _add(self, path, mtime, size):
+        with open(path, 'rb') as f:
+            self._conn.executemany(
+                'INSERT INTO events VALUES (?, ?, ?, ?, ?)',
+                ((path, month, start, end, summary)
+                 for start, end, summary in parse_ics(f)
+                 for month in _months(start, end)))
+        self._conn.execute('INSERT INTO files VALUES (?, ?, ?)',
+                           (path, mtime, size))
+
+    def events(self, year, month):
+        '''
+        Return events which overlap a month, sorted by start date.
+
+        :param int year: year.
+        :param int month: month.
+        :rtype: list
+        :return: tuples of (first date, last date, summary (unicode)).
+        '''
+        if self._conn is None:
+            return []
+
+        import sqlite3
+        try:
+            rows = self._conn.execute(
+                'SELECT start, end, summary FROM events WHERE month = ? '
+                'ORDER BY start, end, summary',
+                (_month_key(year, month),)).fetchall()
+        except sqlite3.Error:
+            return []
+        return [(date.fromordinal(start), date.fromordinal(end - 1),
+                 _decode(summary))
+                for start, end, summary in rows]
+
+    def busy_days(self, year, month):
+        '''
+        Return days of a month which have any event.
+
+        :param int year: year.
+        :param int month: month.
+        :rtype: set
+        :return: days of month.
+        '''
+        first = date(year, month, 1).toordinal()
+        days = set()
+        for start, end, _ in self.events(year, month):
+            for o in xrange(max(start.toordinal(), first),
+                            end.toordinal() + 1):
+                d = date.fromordinal(o)
+                if d.month != month:
+                    break
+                days.add(d.day)
+        return days
+
+    def close(self):
+        '''
+        Close the index file.
+        '''
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
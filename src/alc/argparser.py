@@ -0,0 +1,22 @@
+# -*- coding:utf-8 -*-
+
+import argparse
+
+from alc.query import ArgumentParserError
+
+
+class ThrowingArgumentParser(argparse.ArgumentParser):
+    '''
+    This is a wrapper class of *argparse.ArgumentParser*.
+    When failed to parse argument, raise *ArgumentParserError*.
+
+    *CalendarCommand* uses *alc.query.QueryParser*, so that *argparse*
+    is not imported on every query. This class is available for a
+    subclass which returns *argparse* parser from *get_query_parser*.
+    '''
+
+    def error(self, message):
+        '''
+        :raise ArgumentParserError: failed to parse arguments.
+        '''
+        raise ArgumentParserError(message)
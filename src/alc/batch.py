@@ -0,0 +1,185 @@
+# -*- coding:utf-8 -*-
+'''
+Batch mode of *alc*. Many queries are executed in one process.
+
+usage::
+
+    $ printf '7 2014\n2014 +1\n' | python -m alc --batch --first_week_day=6
+
+Each line of input is a query, or a request of *alc.protocol*
+(a line which starts with '{')::
+
+    7 2014
+    {"query": "7 2014", "config": {"output_format": "json"}}
+
+Each line of output is a script filter for a line of input. Newlines in
+a script filter are escaped, so that a document is in a line.
+
+With *--jobs N*, lines are rendered by *N* worker processes in chunks.
+Output is written in input order, and only a bounded number of chunks
+are in flight, so that a large input is not read at once.::
+
+    $ python -m alc --batch --jobs=4 --input=queries.txt > output.txt
+
+'''
+
+import itertools
+
+from collections import deque
+from alc.cache import LRUCache
+from alc.command import CalendarCommand
+
+# Number of commands kept for distinct configs.
+COMMAND_CACHE_SIZE = 16
+
+# Number of lines sent to a worker process at once.
+CHUNK_SIZE = 512
+
+# Number of chunks in flight per worker process.
+CHUNKS_PER_JOB = 2
+
+
+class BatchRunner(object):
+    '''
+    Executor of queries which reuses *CalendarCommand* for same config.
+    The query parser and rows of formatter are shared by all commands,
+    so only the query is parsed and rendered for each line.
+
+    :param dict config: default config of *CalendarCommand*.
+    :param command_class: class of command.
+    '''
+
+    def __init__(self, config=None, command_class=CalendarCommand):
+        self._config = dict(config or {})
+        self._config.pop('query', None)
+        self._command_class = command_class
+        self._commands = LRUCache(maxsize=COMMAND_CACHE_SIZE)
+        self._default = self.get_command(self._config)
+
+    def get_command(self, config):
+        '''
+        Return a command for config. A command is created once per config.
+
+        :param dict config: config of *CalendarCommand* without query.
+        :rtype: CalendarCommand
+        :return: command
+        '''
+        key = repr(sorted(config.items()))
+        command = self._commands.get(key)
+        if command is None:
+            command = self._command_class(config)
+            self._commands.set(key, command)
+        return command
+
+    def execute(self, line):
+        '''
+        Return a script filter for a line of input. Any error of a line
+        is returned as its script filter of *error_action*, so that
+        following lines are executed.
+
+        :param str line: a query or a request, without newline.
+        :rtype: str
+        :return: script filter in a line.
+        '''
+        try:
+            if not line.startswith('{'):
+                return self._escape(self._default.execute(line))
+
+            from alc.protocol import decode_request
+            config = decode_request(line, self._config)
+            query = config.pop('query', '')
+            return self._escape(self.get_command(config).execute(query))
+        except Exception as e:
+            return self._escape(self._default.error_action(e))
+
+    def run(self, lines, write):
+        '''
+        Execute all lines, and write a script filter per line.
+
+        :param lines: iterable of lines (e.g. *sys.stdin*).
+        :param write: function to write a string (e.g. *sys.stdout.write*).
+        :rtype: int
+        :return: number of executed lines.
+        '''
+        count = 0
+        for line in lines:
+            write(self.execute(line.rstrip('\r\n')) + '\n')
+            count += 1
+        return count
+
+    @staticmethod
+    def _escape(output):
+        return output.replace('\n', '&#10;') if '\n' in output else output
+
+
+# *BatchRunner* of a worker process.
+_worker_runner = None
+
+
+def _init_worker(config):
+    global _worker_runner
+    _worker_runner = BatchRunner(config)
+
+
+def _execute_chunk(lines):
+    execute = _worker_runner.execute
+    return ''.join([execute(line) + '\n' for line in lines])
+
+
+def run_parallel(lines, write, config=None, jobs=2, chunksize=CHUNK_SIZE):
+    '''
+    Execute all lines by worker processes, and write a script filter per
+    line in input order. At most *jobs * CHUNKS_PER_JOB* chunks are
+    in flight.
+
+    :param lines: iterable of lines.
+    :param write: function to write a string.
+    :param dict config: default config of *CalendarCommand*.
+    :param int jobs: number of worker processes.
+    :param int chunksize: number of lines sent to a worker at once.
+    :rtype: int
+    :return: number of executed lines.
+    '''
+    import multiprocessing
+
+    lines = iter(lines)
+    pool = multiprocessing.Pool(jobs, _init_worker, (config,))
+    pending = deque()
+    count = 0
+    try:
+        while True:
+            chunk = [line.rstrip('\r\n')
+                     for line in itertools.islice(lines, chunksize)]
+            if chunk:
+                pending.append(pool.apply_async(_execute_chunk, (chunk,)))
+                count += len(chunk)
+            if pending and (not chunk or
+                            len(pending) >= jobs * CHUNKS_PER_JOB):
+                write(pending.popleft().get())
+            if not chunk and not pending:
+                break
+        pool.close()
+    except:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+
+    return count
+
+
+def run(stdin, stdout, config=None, jobs=1):
+    '''
+    Execute queries from *stdin*, and write script filters to *stdout*.
+
+    :param file stdin: input of queries.
+    :param file stdout: output of script filters.
+    :param dict config: default config of *CalendarCommand*.
+    :param int jobs: number of worker processes. 1 is in this process.
+    :rtype: int
+    :return: number of executed lines.
+    '''
+    lines = iter(stdin.readline, '')
+    if jobs > 1:
+        return run_parallel(lines, stdout.write, config, jobs)
+    return BatchRunner(config).run(lines, stdout.write)
@@ -0,0 +1,108 @@
+# -*- coding:utf-8 -*-
+'''
+Bulk API to compute matrices of calendar for many (year, month) pairs.
+
+When *NumPy* is installed, *monthgrids* computes all matrices at once
+by arithmetic on day ordinals, and returns them as an array. It is the
+API for throughput. *monthcalendars* returns nested lists, and building
+the lists costs about as much as computing them month by month in pure
+Python (used when *NumPy* is not installed). In both cases, the result
+is same as *calendar.monthcalendar*.
+
+e.g.::
+
+    from alc import bulk
+    bulk.monthcalendars([2014, 2015], [7, 3], firstweekday=6)
+    # [[[0, 0, 1, 2, 3, 4, 5], ...], [[1, 2, 3, 4, 5, 6, 7], ...]]
+
+'''
+
+import calendar
+
+from alc.days import DAYS_IN_MONTH, days_in_month, weeks
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+_DAYS_BEFORE_MONTH = (0, 0, 31, 59, 90, 120, 151,
+                      181, 212, 243, 273, 304, 334)
+
+
+def monthcalendars(years, months, firstweekday=calendar.MONDAY):
+    '''
+    Return matrices of calendar for each pair of year and month.
+
+    The result is made of Python lists, so its time is dominated by
+    making the lists even if *NumPy* is installed. For many months, use
+    *monthgrids* and keep the result as an array.
+
+    :param list years: years (1-9999).
+    :param list months: months (1-12). Same length as *years*.
+    :param int firstweekday: first week day (0 is Monday, 6 is Sunday).
+    :rtype: list
+    :return: list of matrix of calendar.
+    :raise ValueError: If year or month is out of range.
+    '''
+    if numpy is None:
+        return _monthcalendars_python(years, months, firstweekday)
+
+    grids, weeks = monthgrids(years, months, firstweekday)
+    return [g[:w] for g, w in zip(grids.tolist(), weeks.tolist())]
+
+
+def monthgrids(years, months, firstweekday=calendar.MONDAY):
+    '''
+    Return matrices of calendar as *NumPy* array.
+    Each matrix has 6 weeks. Blank weeks at the end are filled with 0.
+    This is the fast path of this module: no Python object is made per
+    month (e.g. rows of month *i* are *grids[i, :weeks[i]]*).
+
+    :param years: array of years (1-9999).
+    :param months: array of months (1-12). Same length as *years*.
+    :param int firstweekday: first week day (0 is Monday, 6 is Sunday).
+    :rtype: tuple
+    :return:
+        (array of matrices whose shape is (N, 6, 7),
+        array of number of weeks whose shape is (N,))
+    :raise ImportError: If *NumPy* is not installed.
+    :raise ValueError: If year or month is out of range.
+    '''
+    if numpy is None:
+        raise ImportError('numpy is required for monthgrids')
+
+    y = numpy.asarray(years, dtype=numpy.int64)
+    m = numpy.asarray(months, dtype=numpy.int64)
+    if y.shape != m.shape:
+        raise ValueError('years and months must have same length')
+    if y.size and (y.min() < 1 or y.max() > 9999 or
+                   m.min() < 1 or m.max() > 12):
+        raise ValueError('year or month is out of range')
+
+    leap = (y % 4 == 0) & ((y % 100 != 0) | (y % 400 == 0))
+    y1 = y - 1
+    ordinals = (y1 * 365 + y1 // 4 - y1 // 100 + y1 // 400 +
+                numpy.take(_DAYS_BEFORE_MONTH, m) + (leap & (m > 2)) + 1)
+    offsets = ((ordinals + 6) % 7 - firstweekday) % 7
+    days = numpy.take(DAYS_IN_MONTH, m) + (leap & (m == 2))
+
+    cells = numpy.arange(42)[numpy.newaxis, :] - offsets[:, numpy.newaxis] + 1
+    valid = (cells >= 1) & (cells <= days[:, numpy.newaxis])
+    grids = numpy.where(valid, cells, 0).astype(numpy.int8).reshape(-1, 6, 7)
+
+    return grids, (offsets + days + 6) // 7
+
+
+def _monthcalendars_python(years, months, firstweekday):
+    '''
+    Pure Python implementation of *monthcalendars*.
+    '''
+    if len(years) != len(months):
+        raise ValueError('years and months must have same length')
+
+    result = []
+    for y, m in zip(years, months):
+        offset = (calendar.weekday(y, m, 1) - firstweekday) % 7
+        result.append(weeks(offset, days_in_month(y, m)))
+    return result
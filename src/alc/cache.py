@@ -0,0 +1,210 @@
+# -*- coding:utf-8 -*-
+
+import os
+import threading
+import time
+
+from alc import __version__
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    '''
+    Bounded mapping which discards the least recently used item.
+    It counts hits and misses of *get*, to measure effect of the cache.
+
+    e.g.::
+
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1)
+        cache.get('a')
+        # 1
+        cache.get('b')
+        # None
+        cache.info()
+        # {'hits': 1, 'misses': 1, 'maxsize': 2, 'currsize': 1}
+
+    :param int maxsize: max number of items.
+    '''
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        '''
+        Return a value of key and mark it as most recently used.
+
+        :param key: hashable key.
+        :param default: value returned when key is not cached.
+        :return: cached value or default.
+        '''
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data[key] = value
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        '''
+        Store a value. If the cache is full, the least recently used item
+        is discarded.
+
+        :param key: hashable key.
+        :param value: value to store.
+        '''
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        '''
+        Discard all items and reset counters.
+        '''
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        '''
+        Return statistics of this cache.
+
+        :rtype: dict
+        :return: hits, misses, maxsize and currsize.
+        '''
+        return {'hits': self.hits, 'misses': self.misses,
+                'maxsize': self.maxsize, 'currsize': len(self._data)}
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
+class RenderCache(object):
+    '''
+    Persistent mapping from a normalized query to rendered output,
+    stored in a SQLite file.
+
+    * When total size of values exceeds *max_bytes*, least recently
+      used values are discarded.
+    * The file is stamped with version of *alc*. When the version is
+      different (i.e. *alc* was upgraded), all values are discarded.
+
+    *sqlite3* is imported when an instance is created.
+    Any error of SQLite is ignored, because the cache is not essential.
+    In that case, *get* returns None and *set* does nothing.
+
+    :param str path: path of cache file.
+    :param int max_bytes: max of total size of values.
+    :param str version: version stamp.
+    '''
+
+    def __init__(self, path, max_bytes=1024 * 1024, version=__version__):
+        import sqlite3
+
+        self.max_bytes = max_bytes
+        self._conn = None
+        try:
+            directory = os.path.dirname(path)
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory)
+            self._conn = sqlite3.connect(path)
+            self._setup(version)
+        except (OSError, sqlite3.Error):
+            self._conn = None
+
+    def _setup(self, version):
+        with self._conn:
+            self._conn.execute('PRAGMA synchronous = OFF')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS meta ('
+                               'key TEXT PRIMARY KEY, value TEXT)')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS items ('
+                               'key TEXT PRIMARY KEY, value BLOB, '
+                               'size INTEGER, atime REAL)')
+            row = self._conn.execute('SELECT value FROM meta '
+                                     "WHERE key = 'version'").fetchone()
+            if row is None or row[0] != version:
+                self._conn.execute('DELETE FROM items')
+                self._conn.execute('INSERT OR REPLACE INTO meta '
+                                   "VALUES ('version', ?)", (version,))
+
+    def get(self, key):
+        '''
+        Return a value of key and update its access time.
+
+        :param str key: normalized query.
+        :rtype: str
+        :return: cached value. If it is not cached, return None.
+        '''
+        if self._conn is None:
+            return None
+
+        import sqlite3
+        try:
+            with self._conn:
+                row = self._conn.execute('SELECT value FROM items '
+                                         'WHERE key = ?', (key,)).fetchone()
+                if row is None:
+                    return None
+                self._conn.execute('UPDATE items SET atime = ? '
+                                   'WHERE key = ?', (time.time(), key))
+            return str(row[0])
+        except sqlite3.Error:
+            return None
+
+    def set(self, key, value):
+        '''
+        Store a value and evict least recently used values
+        when total size exceeds *max_bytes*.
+
+        :param str key: normalized query.
+        :param str value: rendered output.
+        '''
+        if self._conn is None:
+            return
+
+        import sqlite3
+        try:
+            with self._conn:
+                self._conn.execute('INSERT OR REPLACE INTO items '
+                                   'VALUES (?, ?, ?, ?)',
+                                   (key, sqlite3.Binary(value),
+                                    len(value), time.time()))
+                self._evict()
+        except sqlite3.Error:
+            pass
+
+    def _evict(self):
+        total = self._conn.execute('SELECT TOTAL(size) FROM items')\
+            .fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = []
+        for key, size in self._conn.execute('SELECT key, size FROM items '
+                                            'ORDER BY atime'):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self._conn.executemany('DELETE FROM items WHERE key = ?', evicted)
+
+    def close(self):
+        '''
+        Close the cache file.
+        '''
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,77 @@
+# -*- coding:utf-8 -*-
+
+import json
+import socket
+import sys
+
+from alc.env import socket_path
+
+
+class ServerError(Exception):
+    '''
+    When *alc* server failed to execute a request, this exception is raised.
+    '''
+    pass
+
+
+def request(config, path=None, timeout=1.0):
+    '''
+    Send config to *alc* server and return *Script Filter XML*.
+
+    :param dict config: configuration of *CalendarCommand*.
+    :param str path: path of Unix socket. Default is *env.socket_path()*.
+    :param float timeout: timeout of socket in seconds.
+    :rtype: str
+    :return: *Script Filter XML*
+    :raise socket.error: If server is not running.
+    :raise ServerError: If server failed to execute command.
+    '''
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(path or socket_path())
+        sock.sendall(json.dumps({'config': config}) + '\n')
+        response = json.loads(sock.makefile('rb').readline())
+    finally:
+        sock.close()
+
+    if 'error' in response:
+        raise ServerError(response['error'])
+    return response['output'].encode('utf-8')
+
+
+def execute(config, path=None):
+    '''
+    Return *Script Filter XML* from *alc* server.
+    If server is not running, execute *CalendarCommand* in this process.
+
+    e.g.::
+
+        from alc.client import execute
+        print execute({'query': '{query}'})
+
+    :param dict config: configuration of *CalendarCommand*.
+    :param str path: path of Unix socket.
+    :rtype: str
+    :return: *Script Filter XML*
+    '''
+    try:
+        return request(config, path)
+    except (socket.error, ValueError):
+        from alc.command import CalendarCommand
+        return CalendarCommand(config).execute()
+
+
+def main(argv=None):
+    '''
+    Execute a query from command line arguments. Config is given as
+    '*--<name>=<value>*' as *python -m alc* (see *alc.__main__*).
+    '''
+    from alc.__main__ import parse_argv
+
+    argv = sys.argv[1:] if argv is None else argv
+    print execute(parse_argv(argv))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,37 +1,18 @@
 # -*- coding:utf-8 -*-
 
-import argparse
-import calendar
-
-from alc.formatter import CalendarFormatter
-from alc.script_filter import ScriptFilter
+from alc.query import ArgumentParserError, QueryParser, is_expression
+from alc.timing import make_timer
 from datetime import datetime
 
 
-class ArgumentParserError(Exception):
-    '''
-    When failed to parse argument, this exception is raised.
-    '''
-    pass
-
-
-class ThrowingArgumentParser(argparse.ArgumentParser):
-    '''
-    This is a wrapper class of *argparse.ArgumentParser*.
-    When failed to parse argument, raise *ArgumentParserError*.
-    '''
-
-    def error(self, message):
-        '''
-        :raise ArgumentParserError: failed to parse arguments.
-        '''
-        raise ArgumentParserError(message)
-
-
 class CalendarCommand:
     '''
     Command for getting *Script Filter XML* of calendar.
 
+    Modules for rendering (*alc.formatter*, *alc.script_filter* and
+    *alc.cache*) are imported when they are used, to keep start-up
+    time short on a cache hit.
+
     :param dict config: configuration of command. The format is as follow.
 
     example::
@@ -55,105 +36,774 @@ class CalendarCommand:
     +---------------------------+------+----------------------------+
     | specified_datetime_format | str  | '%Y/%m'                    |
     +---------------------------+------+----------------------------+
+    | cache_path                | str  | None (disabled)            |
+    +---------------------------+------+----------------------------+
+    | cache_size                | int  | 1048576 (bytes)            |
+    +---------------------------+------+----------------------------+
+    | output_format             | str  | 'xml' ('xml' or 'json')    |
+    +---------------------------+------+----------------------------+
+    | timing                    | str  | None (see *alc.timing*)    |
+    +---------------------------+------+----------------------------+
+    | highlight_format          | str  | None (e.g. '[%02d]')       |
+    +---------------------------+------+----------------------------+
+    | ics_paths                 | list | None (see *alc.agenda*)    |
+    +---------------------------+------+----------------------------+
+    | ics_index_path            | str  | None (data directory)      |
+    +---------------------------+------+----------------------------+
+    | holidays_path             | str  | None (see *alc.holiday*)   |
+    +---------------------------+------+----------------------------+
+    | month_locales             | list | None (see *alc.monthname*) |
+    +---------------------------+------+----------------------------+
+    | week_format               | str  | None (e.g. 'W%02d')        |
+    +---------------------------+------+----------------------------+
+
+    When *cache_path* is specified, output of a query which names month
+    and year is stored in the file, because it does not depend on current
+    datetime. Next time, the output is returned without parsing query.
+
+    The last result is kept in the process. When a query is same as the
+    previous one after parsing (e.g. '12' and '12 ', or two invalid
+    queries), it is returned without rendering (see *memo_info*).
+
+    When *highlight_format* is specified, today is formatted by it in
+    calendars which include today.
+
+    When *ics_paths* is specified (a list, or a string separated by
+    *os.pathsep*), days which have events of the iCalendar files are
+    marked, and events of each month are listed after the month.
+    Events are read from an index which is updated only when the files
+    are changed.
+
+    When *holidays_path* is specified, holidays of the rule file are
+    marked, and number of business days is added to the title of each
+    month. If the rule file is not able to be loaded, calendar is shown
+    without holidays.
+
+    A month is also named in current locale and *month_locales* (a list,
+    or a string separated by ','), e.g. 'jul 2014' or 'juli 2014'.
+    When a name matches several months (e.g. 'ju'), they are returned
+    as candidates of completion.
+
+    When *week_format* is specified, each week row starts with its ISO
+    week number. A query of ISO week (e.g. 'w32 2014') shows the month of
+    the week.
+
+    When *timing* or *ALC_TIMING* environment variable is specified,
+    elapsed time of each phase of *execute* is recorded.
 
+    *ArgumentParserError* is still importable from this module.
+    *ThrowingArgumentParser* is moved to *alc.argparser*, so that
+    *argparse* is not imported on every query.
     '''
 
     _class_val_defs = {
         'query': '',
-        'first_week_day': calendar.MONDAY,
+        'first_week_day': 0,  # calendar.MONDAY
         'default_datetime_format': '%Y/%m/%d (%a)\t%H:%M:%S',
-        'specified_datetime_format': '%Y/%m'
+        'specified_datetime_format': '%Y/%m',
+        'cache_path': None,
+        'cache_size': 1024 * 1024,
+        'output_format': 'xml',
+        'timing': None,
+        'highlight_format': None,
+        'ics_paths': None,
+        'ics_index_path': None,
+        'holidays_path': None,
+        'month_locales': None,
+        'week_format': None
     }
 
+    _query_parser = None
+
+    _memo = None
+
     def __init__(self, config):
         for k, v in self._class_val_defs.items():
             value = config[k] if (k in config) else v
             setattr(self, '_{0}'.format(k), value)
 
-    def execute(self):
+        self._timer = make_timer(self._timing)
+
+    def execute(self, query=None):
         '''
         Execute thie command. Return string of *Script Filter XML*.
 
+        :param str query:
+            If it is specified, it replaces *query* of config, so that
+            a command is able to execute many queries (see *alc.batch*).
         :rtype: str
         :return: *Script Filter XML*
         :raise ValueError:
             If return type of *take_action* or *error_action* is not string.
         '''
 
+        if query is not None:
+            self._query = query
+
+        timer = self._timer
+
+        with timer.phase('cache'):
+            cache_key = self.get_cache_key()
+            if cache_key is not None:
+                from alc.cache import RenderCache
+                cache = RenderCache(self._cache_path, self._cache_size)
+                filter_xml = cache.get(cache_key)
+                if filter_xml is not None:
+                    cache.close()
+        if cache_key is not None and filter_xml is not None:
+            timer.emit(query=self._query, cache_hit=True)
+            return filter_xml
+
         filter_xml = ''
+        failed = False
         try:
-            parser = self.get_query_parser()
-            args = (self._query.strip().split(' ')
-                    if self._query.strip() != '' else '')
-            parsed_args = vars(parser.parse_args(args))
-            filter_xml = self.take_action(parsed_args)
+            query, filter_xml = self._route(self._query)
+            if filter_xml is not None:
+                timer.emit(query=self._query, cache_hit=False)
+                return filter_xml
+
+            parsed_args = self._parse(query)
+            with timer.phase('take_action'):
+                filter_xml = self.take_action(parsed_args)
         except Exception as e:
-            filter_xml = self.error_action(e)
+            failed = True
+            with timer.phase('error_action'):
+                filter_xml = self.error_action(e)
 
         if isinstance(filter_xml, basestring) is False:
             raise ValueError()
 
+        if cache_key is not None:
+            # Output of *error_action* is not stored, so that an error
+            # never hides a valid result of same key.
+            with timer.phase('cache'):
+                if isinstance(filter_xml, str) and not failed:
+                    cache.set(cache_key, filter_xml)
+                cache.close()
+
+        timer.emit(query=self._query, cache_hit=False)
         return filter_xml
 
+    def _route(self, query):
+        '''
+        Route a query which is not of months (see *alc.expression*).
+        A week (e.g. 'w32 2014') and a month name which matches one
+        month are converted to a query of months.
+
+        :param str query: query.
+        :rtype: tuple
+        :return:
+            (query of months, None), or (None, *Script Filter XML*) of a
+            date expression or candidates of month name.
+        '''
+        if not is_expression(query):
+            return query, None
+
+        timer = self._timer
+        with timer.phase('month_name'):
+            week = self.week_query(query)
+            candidates = ([] if week is not None
+                          else self.month_candidates(query))
+        if week is not None:
+            return week, None
+        if len(candidates) == 1:
+            return ' '.join([str(candidates[0][0])] +
+                            query.strip().split(' ')[1:]), None
+
+        with timer.phase('expression'):
+            if candidates:
+                return None, self.completion_action(query, candidates)
+            return None, self.expression_action(query)
+
+    def _parse(self, query):
+        '''
+        Return parsed query of months as dict.
+        '''
+        timer = self._timer
+        with timer.phase('get_query_parser'):
+            parser = self.get_query_parser()
+        with timer.phase('split'):
+            args = (query.strip().split(' ')
+                    if query.strip() != '' else '')
+        with timer.phase('parse_args'):
+            return vars(parser.parse_args(args))
+
+    def write(self, fp, flush=False):
+        '''
+        Execute this command, and write *Script Filter XML* to a file.
+        Output is same as *execute*.
+
+        Items of months are written as each month is rendered (see
+        *alc.script_filter.ScriptFilterWriter*), so that memory does not
+        grow with number of months (e.g. '1900 +1199'). A query which is
+        cacheable or not of months, and an invalid query, are written at
+        once as *execute*.
+
+        :param file fp: file-like object which has *write*.
+        :param bool flush:
+            If True, *fp* is flushed after each item, so that a reader
+            receives items as they are rendered.
+        '''
+        if self.get_cache_key() is not None:
+            filter_xml = self.execute()
+        else:
+            try:
+                query, filter_xml = self._route(self._query)
+                if filter_xml is None:
+                    query_args = self._parse(query)
+                    months = self.get_range(query_args)
+                    self._check_range(*months)
+            except Exception as e:
+                filter_xml = self.error_action(e)
+
+        if filter_xml is not None:
+            fp.write(filter_xml)
+            if flush:
+                fp.flush()
+            return
+
+        from alc.script_filter import ScriptFilterWriter
+
+        with ScriptFilterWriter(fp, self._output_format, flush) as writer:
+            for item in self._items(*months):
+                writer.append_item(item)
+        self._timer.emit(query=self._query, cache_hit=False)
+
+    def get_cache_key(self):
+        '''
+        Return a normalized query and config as key of rendered output.
+        Only a query which names year (e.g. '7 2014', '2014' or
+        '7 2014 +2') is cacheable, because others depend on current
+        datetime. The query is split as the query parser does, so that
+        a query which the parser rejects (e.g. '7  2014') is not
+        cacheable.
+
+        :rtype: str
+        :return: key of cache. If query is not cacheable, return None.
+        '''
+        if self._cache_path is None:
+            return None
+
+        tokens = self._query.strip().split(' ')
+        args = [a for a in tokens if not a.startswith('+')]
+        spans = [a[1:] for a in tokens if a.startswith('+')]
+        if not all(a.isdigit() for a in args + spans) or len(spans) > 1:
+            return None
+        if not (len(args) == 2 or (len(args) == 1 and int(args[0]) > 12)):
+            return None
+
+        return repr((self.__class__.__name__,
+                     tuple(int(a) for a in args),
+                     tuple(int(a) for a in spans), self._output_config(),
+                     self._time_locale(), self._highlight(),
+                     self._agenda_stamp(), self._holiday_stamp()))
+
+    def _time_locale(self):
+        '''
+        Return current locale of LC_TIME, which affects week header and
+        titles (same as *alc.formatter._time_locale*). *_locale* is read
+        instead of *locale*, because it is already imported on start-up.
+        '''
+        import _locale
+        return _locale.setlocale(_locale.LC_TIME)
+
+    def _output_config(self):
+        '''
+        Return config which affects output, as a list of (key, value).
+        '''
+        return [(k, getattr(self, '_{0}'.format(k)))
+                for k in sorted(self._class_val_defs.keys())
+                if k not in ('query', 'cache_path', 'cache_size', 'timing',
+                             'ics_paths', 'ics_index_path', 'holidays_path',
+                             'month_locales')]
+
+    def _highlight(self):
+        '''
+        Return today if *highlight_format* is specified, otherwise None.
+        '''
+        if self._highlight_format is None:
+            return None
+        return datetime.now().date()
+
+    def get_ics_paths(self):
+        '''
+        Return paths of iCalendar files of *ics_paths* as a list.
+
+        :rtype: list
+        :return: paths of iCalendar files.
+        '''
+        paths = self._ics_paths
+        if not paths:
+            return []
+        if isinstance(paths, basestring):
+            import os
+            return [p for p in paths.split(os.pathsep) if p]
+        return list(paths)
+
+    def _agenda_stamp(self):
+        '''
+        Return stamp of iCalendar files, or None if agenda is disabled.
+        '''
+        paths = self.get_ics_paths()
+        if not paths:
+            return None
+        from alc.agenda import stamp
+        return stamp(paths)
+
+    def get_event_index(self):
+        '''
+        Return index of events of *ics_paths*, which is updated for
+        changed files.
+
+        :rtype: alc.agenda.EventIndex
+        :return: index of events
+        '''
+        import os
+        from alc.agenda import EventIndex
+        from alc.env import data_dir
+
+        path = self._ics_index_path or os.path.join(data_dir(),
+                                                    'events.sqlite')
+        index = EventIndex(path)
+        index.update(self.get_ics_paths())
+        return index
+
+    def _holiday_stamp(self):
+        '''
+        Return stamp of the rule file of holidays, or None if holidays
+        are disabled.
+        '''
+        if self._holidays_path is None:
+            return None
+
+        import os
+        try:
+            st = os.stat(self._holidays_path)
+        except OSError:
+            return (self._holidays_path,)
+        return (self._holidays_path, st.st_mtime, st.st_size)
+
+    def get_holidays(self, years=()):
+        '''
+        Return holidays of *holidays_path*. Compiled holidays are stored
+        in workflow data directory.
+
+        :param list years: years which are compiled in advance.
+        :rtype: alc.holiday.HolidayCalendar
+        :return:
+            holidays. If the rule file is not able to be loaded, return
+            None, so that calendar is shown without holidays.
+        '''
+        import os
+        from alc.env import data_dir
+        from alc.holiday import HolidayCalendar
+
+        try:
+            holidays = HolidayCalendar(
+                self._holidays_path,
+                os.path.join(data_dir(), 'holidays.cache'))
+            for year in years:
+                holidays.masks(year)
+        except (IOError, OSError, ValueError):
+            return None
+        return holidays
+
+    def format_event(self, first, last, summary):
+        '''
+        Return title of an event item.
+
+        e.g.::
+
+            07/24\tMeeting
+            07/24-07/26\tTrip
+
+        :param date first: first date of event.
+        :param date last: last date of event.
+        :param unicode summary: summary of event.
+        :rtype: unicode
+        :return: title of item.
+        '''
+        label = first.strftime('%m/%d')
+        if last != first:
+            label += last.strftime('-%m/%d')
+        return '%s\t%s' % (label, summary) if summary else label
+
+    def format_business_days(self, title, count):
+        '''
+        Return title of a month with number of business days.
+
+        :param str title: title of month.
+        :param int count: number of business days.
+        :rtype: str
+        :return: title of item.
+        '''
+        return '%s\t(%d business days)' % (title, count)
+
+    @classmethod
+    def _last_result(cls):
+        '''
+        Return the slot of the last result shared by all instances.
+        '''
+        if CalendarCommand._memo is None:
+            from alc.cache import LRUCache
+            CalendarCommand._memo = LRUCache(maxsize=1)
+        return CalendarCommand._memo
+
+    @classmethod
+    def memo_info(cls):
+        '''
+        Return statistics of the last result. *hits* is number of
+        queries which are answered without rendering, because the parsed
+        query is same as the previous one (e.g. '12' and '12 ').
+
+        :rtype: dict
+        :return: hits, misses, maxsize and currsize.
+        '''
+        return cls._last_result().info()
+
+    @classmethod
+    def memo_clear(cls):
+        '''
+        Discard the last result and its statistics.
+        '''
+        CalendarCommand._memo = None
+
     def get_query_parser(self):
         '''
         Return argument parser of this command.
+        The parser is created once and shared by all instances.
+        A subclass is able to return any object which has *parse_args*
+        (e.g. *alc.argparser.ThrowingArgumentParser*).
 
-        :rtype: argparse.ArgumentParser
+        :rtype: alc.query.QueryParser
         :return: argument parser
         '''
-        parser = ThrowingArgumentParser()
+        if CalendarCommand._query_parser is None:
+            parser = QueryParser()
+            parser.add_argument('month', 1, 12, skippable=True)
+            parser.add_argument('year', 0, 9999)
+            parser.add_argument('span', 0, 1199, prefix='+')
+            CalendarCommand._query_parser = parser
 
-        parser.add_argument('month', nargs='?', type=int,
-                            choices=range(1, (12 + 1)))
-        parser.add_argument('year', nargs='?', type=int,
-                            choices=range(0, (9999 + 1)))
-
-        return parser
+        return CalendarCommand._query_parser
 
     def take_action(self, query_args):
         '''
         Create script filter xml.
         When it succeeds in parsing the query, this method is called.
+        When months, titles and config are same as the previous call
+        (e.g. '12' and '12 '), the last result is returned without
+        rendering (see *memo_info*).
 
         :param dict query_args: parsed query
         :rtype: str
         :return: *Script Filter XML*
         '''
-        len_query_args = len([k for k in query_args.keys()
-                              if query_args[k] is not None])
+        from alc.formatter import _time_locale
+        from alc.script_filter import ScriptFilter
+
+        timer = self._timer
+        tmp_datetime, tmp_dateformat, count = self.get_range(query_args)
+        highlight = self._highlight()
+        agenda_stamp = self._agenda_stamp()
+        holiday_stamp = self._holiday_stamp()
+
+        with timer.phase('memo'):
+            memo = self._last_result()
+            memo_key = (self.__class__, tmp_datetime.strftime(tmp_dateformat),
+                        tmp_datetime.year, tmp_datetime.month, count,
+                        _time_locale(), tuple(self._output_config()),
+                        highlight, agenda_stamp, holiday_stamp)
+            filter_xml = memo.get(memo_key)
+        if filter_xml is not None:
+            return filter_xml
+
+        index, holidays = self._overlays(tmp_datetime, count)
+        try:
+            with timer.phase('format'):
+                f = self._formatter(tmp_datetime)
+                header = f.weekheader()
+                months = list(f.months(count, highlight,
+                                       *self._marks(index, holidays)))
+
+            with timer.phase('script_filter'):
+                sf = ScriptFilter()
+                for d, rows in months:
+                    for item in self._month_items(
+                            d, d.strftime(tmp_dateformat), header, rows,
+                            index, holidays):
+                        sf.append_item(item)
+        finally:
+            self._close_overlays(index, holidays)
+
+        with timer.phase('serialize'):
+            filter_xml = self.serialize(sf)
+
+        memo.set(memo_key, filter_xml)
+        return filter_xml
+
+    def _check_range(self, tmp_datetime, tmp_dateformat, count):
+        '''
+        Raise ValueError if the last month is out of range.
+        '''
+        last_year = (tmp_datetime.year * 12 + tmp_datetime.month +
+                     count - 2) // 12
+        if last_year > 9999:
+            raise ValueError('year is out of range: %d' % last_year)
+
+    def _formatter(self, tmp_datetime):
+        from alc.formatter import CalendarFormatter
+
+        return CalendarFormatter(tmp_datetime, self._first_week_day,
+                                 highlight_format=self._highlight_format,
+                                 week_format=self._week_format)
+
+    def _overlays(self, tmp_datetime, count):
+        '''
+        Return (index of events, holidays) of months. Each of them is None
+        if it is disabled.
+        '''
+        timer = self._timer
+        index = None
+        if self._agenda_stamp() is not None:
+            with timer.phase('agenda'):
+                index = self.get_event_index()
+        holidays = None
+        if self._holiday_stamp() is not None:
+            last_year = (tmp_datetime.year * 12 + tmp_datetime.month +
+                         count - 2) // 12
+            with timer.phase('holiday'):
+                holidays = self.get_holidays(
+                    range(tmp_datetime.year, min(last_year, 9999) + 1))
+        return index, holidays
+
+    def _close_overlays(self, index, holidays):
+        if index is not None:
+            index.close()
+        if holidays is not None:
+            holidays.save()
+
+    def _marks(self, index, holidays):
+        '''
+        Return (busy, holidays) arguments of *CalendarFormatter.months*.
+        '''
+        return (index.busy_days if index is not None else None,
+                holidays.days if holidays is not None else None)
+
+    def _month_items(self, d, title, header, rows, index, holidays):
+        '''
+        Return titles of items of a month: title, week header, rows and
+        events.
+        '''
+        if holidays is not None:
+            title = self.format_business_days(
+                title, holidays.business_days(d.year, d.month))
+        yield title
+        yield header
+        for w in rows:
+            yield w
+        if index is not None:
+            for event in index.events(d.year, d.month):
+                yield self.format_event(*event)
+
+    def _items(self, tmp_datetime, tmp_dateformat, count):
+        '''
+        Return titles of items of months. Each month is rendered when
+        its items are read.
+        '''
+        index, holidays = self._overlays(tmp_datetime, count)
+        try:
+            f = self._formatter(tmp_datetime)
+            header = f.weekheader()
+            for d, rows in f.months(count, self._highlight(),
+                                    *self._marks(index, holidays)):
+                for item in self._month_items(
+                        d, d.strftime(tmp_dateformat), header, rows,
+                        index, holidays):
+                    yield item
+        finally:
+            self._close_overlays(index, holidays)
+
+    def get_month_locales(self):
+        '''
+        Return names of additional locales of month names.
+
+        :rtype: list
+        '''
+        if not self._month_locales:
+            return []
+        if isinstance(self._month_locales, basestring):
+            return [n for n in self._month_locales.split(',') if n]
+        return list(self._month_locales)
+
+    def week_query(self, query):
+        '''
+        Return query of the month of an ISO week. The first word is
+        'w' and week number, followed by optional year and span.
+
+        e.g.::
+
+            CalendarCommand({}).week_query('w32 2014 +1')
+            # '8 2014 +1'
+
+        :param str query: query.
+        :rtype: str
+        :return: query of month. If query is not of week, return None.
+        :raise ValueError: If the week is not in the year.
+        '''
+        args = query.strip().split(' ')
+        if args[0][:1] not in ('w', 'W') or not args[0][1:].isdigit():
+            return None
+
+        rest = args[1:]
+        year = int(rest.pop(0)) if rest and rest[0].isdigit() \
+            else datetime.now().year
+
+        from alc.formatter import week_month
+        month = week_month(year, int(args[0][1:]))
+        return ' '.join([str(month), str(year)] + rest)
+
+    def month_candidates(self, query):
+        '''
+        Return months which the first word of query names
+        (see *alc.monthname*).
+
+        :param str query: query.
+        :rtype: list
+        :return:
+            tuples of (month, full name). If the first word is not
+            letters or is a keyword of expression (e.g. 'today'), return
+            empty list.
+        '''
+        from alc.expression import is_keyword
+
+        word = query.strip().split(' ')[0].decode('utf-8', 'replace')
+        if not word.isalpha() or is_keyword(word):
+            return []
+
+        from alc.monthname import complete
+        return complete(word, self.get_month_locales())
+
+    def completion_action(self, query, candidates):
+        '''
+        Create script filter xml of candidates of month name. Each item
+        is invalid, and completes the name followed by rest of query.
+
+        :param str query: query.
+        :param list candidates: tuples of (month, full name (unicode)).
+        :rtype: str
+        :return: *Script Filter XML*
+        '''
+        from alc.script_filter import ScriptFilter
 
-        tmp_datetime = datetime.now()
-        tmp_dateformat = self._default_datetime_format
+        rest = ' '.join(query.strip().split(' ')[1:]).decode('utf-8',
+                                                             'replace')
+        sf = ScriptFilter()
+        for _, name in candidates:
+            sf.append_item(name, autocomplete=u'%s %s' % (name, rest))
+        return self.serialize(sf)
 
-        if len_query_args is not 0:
-            month = query_args['month']
-            year = query_args['year'] if (len_query_args is 2) \
-                else tmp_datetime.year
+    def expression_action(self, query):
+        '''
+        Create script filter xml of a date expression (see
+        *alc.expression*). The result item is valid, and a date is
+        completed as 'YYYY-MM-DD'.
+
+        :param str query: date expression.
+        :rtype: str
+        :return: *Script Filter XML*
+        :raise alc.expression.ExpressionError: If query is invalid.
+        '''
+        from alc.expression import evaluate
+        from alc.script_filter import ScriptFilter
 
-            tmp_datetime = datetime.strptime('%s-%s' % (year, month), '%Y-%m')
-            tmp_dateformat = self._specified_datetime_format
+        result = evaluate(query, datetime.now().date())
 
         sf = ScriptFilter()
-        f = CalendarFormatter(tmp_datetime)
-        CalendarFormatter.setfirstweekday(self._first_week_day)
+        if isinstance(result, int):
+            sf.append_item('%d days' % result, valid=True,
+                           autocomplete=' '.join(query.split()))
+        else:
+            week = result.isocalendar()[1]
+            sf.append_item('%s\tW%02d' % (result.strftime('%Y/%m/%d (%a)'),
+                                          week),
+                           valid=True, autocomplete=result.isoformat())
+        return self.serialize(sf)
+
+    def get_range(self, query_args):
+        '''
+        Return months to display from parsed query.
+
+        +---------------+--------------------------+-----------------+
+        | query         | the first month          | number of months|
+        +===============+==========================+=================+
+        | (empty)       | current datetime         | 1               |
+        +---------------+--------------------------+-----------------+
+        | month         | month of current year    | 1               |
+        +---------------+--------------------------+-----------------+
+        | month year    | month of year            | 1               |
+        +---------------+--------------------------+-----------------+
+        | year          | January of year          | 12              |
+        +---------------+--------------------------+-----------------+
+        | ... +span     | (as above)               | 1 + span        |
+        +---------------+--------------------------+-----------------+
 
-        sf.append_item(f.datetime(tmp_dateformat))
-        sf.append_item(f.weekheader())
-        for w in f.weekdays():
-            sf.append_item(w)
+        :param dict query_args: parsed query
+        :rtype: tuple
+        :return: (datetime, datetime format, number of months)
+        '''
+        month = query_args.get('month')
+        year = query_args.get('year')
+        span = query_args.get('span')
 
-        return sf.xml_s
+        now = datetime.now()
+        if month is None and year is None and span is None:
+            return now, self._default_datetime_format, 1
+
+        if year is None:
+            year = now.year
+            month = month or now.month
+        elif month is None:
+            month = 1
+            span = 11 if span is None else span
+
+        tmp_datetime = datetime(year, month, 1)
+        return tmp_datetime, self._specified_datetime_format, 1 + (span or 0)
 
     def error_action(self, e):
         '''
         Create error script filter xml.
         This method is called when an error occurs in *'execute'*.
+        Output is same for all errors, so it is served from the last
+        result when the previous query was also an error.
 
         :param Exception e: exception from *execute*.
         :rtype: str
         :return: *Script Filter XML*
         '''
+        memo = self._last_result()
+        memo_key = (self.__class__, 'error', self._output_format)
+        filter_xml = memo.get(memo_key)
+        if filter_xml is not None:
+            return filter_xml
+
+        from alc.script_filter import ScriptFilter
+
         sf = ScriptFilter()
         sf.append_item('usage: alc [month (1-12)] [year (1900-9999)]')
+        filter_xml = self.serialize(sf)
+
+        memo.set(memo_key, filter_xml)
+        return filter_xml
+
+    def serialize(self, sf):
+        '''
+        Return string of script filter in the format of *output_format*.
+
+        :param ScriptFilter sf: script filter.
+        :rtype: str
+        :return: *Script Filter XML* or *Script Filter JSON*
+        '''
+        if self._output_format == 'json':
+            return sf.json_s
         return sf.xml_s
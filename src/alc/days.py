@@ -0,0 +1,60 @@
+# -*- coding:utf-8 -*-
+'''
+Days of months, shared by *alc.formatter*, *alc.bulk*, *alc.holiday*
+and *alc.expression*.
+
+This module imports nothing, so that a module which needs only days of
+months (e.g. *alc.expression*) does not import *calendar* and *locale*.
+'''
+
+# Days of months of a common year (index 0 is unused).
+DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def isleap(year):
+    '''
+    Return True for a leap year (same as *calendar.isleap*).
+
+    :param int year: year.
+    :rtype: bool
+    '''
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def days_in_month(year, month):
+    '''
+    Return number of days of a month.
+
+    e.g.::
+
+        days_in_month(2016, 2), days_in_month(2014, 7)
+        # (29, 31)
+
+    :param int year: year.
+    :param int month: month.
+    :rtype: int
+    '''
+    days = DAYS_IN_MONTH[month]
+    if month == 2 and isleap(year):
+        days += 1
+    return days
+
+
+def weeks(offset, days):
+    '''
+    Return a matrix of calendar from blank cells before the first day
+    and days of month.
+
+    e.g.::
+
+        weeks(6, 31)[0]
+        # [0, 0, 0, 0, 0, 0, 1]
+
+    :param int offset: blank cells before the first day.
+    :param int days: days of month.
+    :rtype: list
+    :return: weeks, each of them is list of 7 days (0 is blank cell).
+    '''
+    cells = [0] * offset + range(1, days + 1)
+    cells += [0] * (-len(cells) % 7)
+    return [cells[j:j + 7] for j in xrange(0, len(cells), 7)]
@@ -0,0 +1,32 @@
+# -*- coding:utf-8 -*-
+
+import os
+import tempfile
+
+BUNDLE_ID = 'jp.sbkro.alc'
+
+
+def data_dir():
+    '''
+    Return a directory for persistent data of this workflow.
+    Alfred exports it as *alfred_workflow_data*. When it is not set
+    (e.g. running from a terminal), '~/.alc' is used.
+
+    :rtype: str
+    :return: path of data directory.
+    '''
+    return os.environ.get('alfred_workflow_data',
+                          os.path.expanduser('~/.alc'))
+
+
+def socket_path():
+    '''
+    Return a path of Unix socket for *alc* server.
+    It is placed in temporary directory, because length of
+    socket path is limited (104 bytes on OSX).
+
+    :rtype: str
+    :return: path of Unix socket.
+    '''
+    return os.path.join(tempfile.gettempdir(),
+                        '%s.%d.sock' % (BUNDLE_ID, os.getuid()))
@@ -0,0 +1,250 @@
+# -*- coding:utf-8 -*-
+'''
+Date expressions of *alc* query.
+
++---------------------------+------------------------------------------+
+| expression                | result                                   |
++===========================+==========================================+
+| 2014-07-26                | the date                                 |
++---------------------------+------------------------------------------+
+| today, tomorrow, yesterday| the date                                 |
++---------------------------+------------------------------------------+
+| +30d, -2w, +3m, +1y       | today + offset                           |
++---------------------------+------------------------------------------+
+| next fri, last monday     | next (last) week day after (before) today|
++---------------------------+------------------------------------------+
+| 2014-07-26 +30d           | date + offset (also '2014-07-26 + 30d')  |
++---------------------------+------------------------------------------+
+| 2014-07-26 next fri       | next week day after date                 |
++---------------------------+------------------------------------------+
+| 2014-12-25 - 2014-07-26   | number of days between dates             |
++---------------------------+------------------------------------------+
+
+A date is shown with its week day and ISO week number.
+
+An expression is compiled into a plan which does not depend on today,
+and plans are cached by normalized expression. So a repeated query is
+evaluated without tokenizing and parsing.
+
+e.g.::
+
+    plan = compile_expression('2014-07-26 +30d')
+    plan(date.today())
+    # datetime.date(2014, 8, 25)
+'''
+
+import re
+
+from datetime import date, timedelta
+
+from alc.cache import LRUCache
+from alc.days import days_in_month
+# *is_expression* is in *alc.query*, which is imported on start-up.
+from alc.query import is_expression
+
+_TOKEN = re.compile(r'\s*(?:(\d{4}-\d{1,2}-\d{1,2})|([+-]?)(\d+)([dwmy])|'
+                    r'([+-])|([a-z]+))', re.IGNORECASE)
+
+_WEEKDAYS = {}
+for _i, _name in enumerate(['monday', 'tuesday', 'wednesday', 'thursday',
+                            'friday', 'saturday', 'sunday']):
+    _WEEKDAYS[_name] = _WEEKDAYS[_name[:3]] = _i
+del _i, _name
+
+_RELATIVE = {'today': 0, 'tomorrow': 1, 'yesterday': -1}
+
+_DIRECTIONS = ('next', 'last')
+
+_plans = LRUCache(maxsize=128)
+
+
+class ExpressionError(ValueError):
+    '''
+    When a query is not a date expression, this exception is raised.
+    '''
+    pass
+
+
+def is_keyword(word):
+    '''
+    Return True if a word is a keyword of expression (e.g. 'today',
+    'next' or 'fri'). *CalendarCommand* does not look up such a word as
+    a month name.
+
+    :param unicode word: word.
+    :rtype: bool
+    '''
+    word = word.lower()
+    return word in _RELATIVE or word in _WEEKDAYS or word in _DIRECTIONS
+
+
+def _tokenize(expression):
+    tokens = []
+    pos = 0
+    expression = expression.strip()
+    while pos < len(expression):
+        m = _TOKEN.match(expression, pos)
+        if m is None or m.end() == pos:
+            raise ExpressionError('invalid expression: %r' % expression)
+        literal, sign, number, unit, operator, word = m.groups()
+        if literal:
+            tokens.append(('date', literal))
+        elif number:
+            tokens.append(('offset', (sign, int(number), unit.lower())))
+        elif operator:
+            tokens.append(('operator', operator))
+        else:
+            tokens.append(('word', word.lower()))
+        pos = m.end()
+    return tokens
+
+
+def _to_date(literal):
+    try:
+        return date(*[int(v) for v in literal.split('-')])
+    except ValueError:
+        raise ExpressionError('invalid date: %r' % literal)
+
+
+def add_months(d, months):
+    '''
+    Return date which is *months* months after *d*. The day is clamped
+    to the last day of the month (e.g. 01/31 + 1 month is 02/28).
+
+    :param date d: date.
+    :param int months: number of months (may be negative).
+    :rtype: date
+    '''
+    index = d.year * 12 + d.month - 1 + months
+    year, month = divmod(index, 12)
+    month += 1
+    return date(year, month, min(d.day, days_in_month(year, month)))
+
+
+def _offset_step(sign, number, unit):
+    n = -number if sign == '-' else number
+    if unit == 'd':
+        delta = timedelta(days=n)
+        return lambda d, today: d + delta
+    if unit == 'w':
+        delta = timedelta(weeks=n)
+        return lambda d, today: d + delta
+    months = n if unit == 'm' else n * 12
+    return lambda d, today: add_months(d, months)
+
+
+def _weekday_step(direction, weekday):
+    if direction == 'next':
+        return lambda d, today: d + timedelta(
+            days=(weekday - d.weekday() - 1) % 7 + 1)
+    return lambda d, today: d - timedelta(
+        days=(d.weekday() - weekday - 1) % 7 + 1)
+
+
+def _date_operand(tokens, pos):
+    '''
+    Return (step which returns a date, next position) of a date operand
+    at *pos*, or (None, pos) if it is not a date operand.
+    '''
+    kind, value = tokens[pos]
+    if kind == 'date':
+        d = _to_date(value)
+        return (lambda current, today: d), pos + 1
+    if kind == 'word' and value in _RELATIVE:
+        delta = timedelta(days=_RELATIVE[value])
+        return (lambda current, today: today + delta), pos + 1
+    if kind == 'word' and value in _DIRECTIONS:
+        if pos + 1 >= len(tokens) or tokens[pos + 1][1] not in _WEEKDAYS:
+            raise ExpressionError('week day is expected after %r' % value)
+        return _weekday_step(value, _WEEKDAYS[tokens[pos + 1][1]]), pos + 2
+    return None, pos
+
+
+def _compile(tokens):
+    if not tokens:
+        raise ExpressionError('empty expression')
+
+    # A plan starts from today, and the first operand may replace it.
+    steps = []
+    step, pos = _date_operand(tokens, 0)
+    if step is not None:
+        steps.append(step)
+
+    subtrahend = None
+    while pos < len(tokens):
+        kind, value = tokens[pos]
+        if kind == 'offset':
+            steps.append(_offset_step(*value))
+            pos += 1
+        elif kind == 'operator' and pos + 1 < len(tokens):
+            next_kind, next_value = tokens[pos + 1]
+            if next_kind == 'offset' and not next_value[0]:
+                steps.append(_offset_step(value, *next_value[1:]))
+                pos += 2
+            elif value == '-':
+                subtrahend, pos = _date_operand(tokens, pos + 1)
+                if subtrahend is None or pos != len(tokens):
+                    raise ExpressionError('date is expected after \'-\'')
+            else:
+                raise ExpressionError('offset is expected after \'+\'')
+        elif kind == 'word' and value in _DIRECTIONS:
+            step, pos = _date_operand(tokens, pos)
+            steps.append(step)
+        else:
+            raise ExpressionError('unexpected token: %r' % (value,))
+
+    def plan(today):
+        current = today
+        for step in steps:
+            current = step(current, today)
+        if subtrahend is not None:
+            return (current - subtrahend(today, today)).days
+        return current
+    return plan
+
+
+def compile_expression(expression):
+    '''
+    Return a plan of a date expression. Plans are cached by normalized
+    expression.
+
+    :param str expression: date expression.
+    :rtype: function
+    :return:
+        function which receives today and returns a date, or number of
+        days (int) for difference of dates.
+    :raise ExpressionError: If the expression is invalid.
+    '''
+    key = ' '.join(expression.lower().split())
+    plan = _plans.get(key)
+    if plan is None:
+        plan = _compile(_tokenize(key))
+        _plans.set(key, plan)
+    return plan
+
+
+def evaluate(expression, today=None):
+    '''
+    Return result of a date expression.
+
+    :param str expression: date expression.
+    :param date today: base date. Default is today.
+    :rtype: date or int
+    :return: a date, or number of days for difference of dates.
+    :raise ExpressionError: If the expression is invalid.
+    '''
+    plan = compile_expression(expression)
+    try:
+        return plan(today or date.today())
+    except (ValueError, OverflowError) as e:
+        raise ExpressionError(str(e))
+
+
+def plan_cache_info():
+    '''
+    Return statistics of cache of plans.
+
+    :rtype: dict
+    :return: hits, misses, maxsize and currsize.
+    '''
+    return _plans.info()
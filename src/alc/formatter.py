@@ -1,17 +1,225 @@
 # -*- coding:utf-8 -*-
 
 import calendar
+import locale
+
+from alc.cache import LRUCache
+from alc.days import DAYS_IN_MONTH, days_in_month, weeks
+from datetime import date, timedelta
+
+# Tables of *cell_table* keyed by (day format, blank).
+_CELL_TABLES = {}
+
+
+def monthcalendars(year, month, count, firstweekday=calendar.MONDAY):
+    '''
+    Return matrices of calendar for consecutive months.
+    Each matrix is same as *calendar.monthcalendar*, but week day of
+    the first day is computed only once. For following months, it is
+    derived from the number of days of the previous month.
+
+    e.g.::
+
+        for y, m, weeks in monthcalendars(2015, 3, 3):
+            print y, m, weeks[0]
+        # 2015 3 [0, 0, 0, 0, 0, 0, 1]
+        # 2015 4 [0, 0, 1, 2, 3, 4, 5]
+        # 2015 5 [0, 0, 0, 0, 1, 2, 3]
+
+    :param int year: year of the first month.
+    :param int month: the first month.
+    :param int count: number of months.
+    :param int firstweekday: first week day (0 is Monday, 6 is Sunday).
+    :rtype: generator
+    :return: tuples of (year, month, matrix of calendar).
+    :raise ValueError: If a month is out of range of year 1-9999.
+    '''
+    for y, m, offset, days in _month_offsets(year, month, count,
+                                             firstweekday):
+        yield y, m, weeks(offset, days)
+
+
+def _month_offsets(year, month, count, firstweekday):
+    '''
+    Return (year, month, blank cells before the first day, days of month)
+    for consecutive months.
+    '''
+    offset = (calendar.weekday(year, month, 1) - firstweekday) % 7
+
+    for i in xrange(count):
+        if year > 9999:
+            raise ValueError('year is out of range: %d' % year)
+
+        days = days_in_month(year, month)
+        yield year, month, offset, days
+
+        offset = (offset + days) % 7
+        month += 1
+        if month > 12:
+            month = 1
+            year += 1
+
+
+def cell_table(day_format='%02d', blank=''):
+    '''
+    Return strings of cells in a row, indexed by day (0 is blank cell).
+    Each cell is followed by tab. A table is made once per style.
+
+    e.g.::
+
+        cell_table()[0], cell_table()[7]
+        # ('\t', '07\t')
+        cell_table('%2d', '  ')[0], cell_table('%2d', '  ')[7]
+        # ('  \t', ' 7\t')
+
+    :param str day_format: format of day.
+    :param str blank: string of blank cell.
+    :rtype: tuple
+    :return: 32 strings of cells.
+    '''
+    key = (day_format, blank)
+    cells = _CELL_TABLES.get(key)
+    if cells is None:
+        cells = (blank + '\t',) + tuple((day_format % d) + '\t'
+                                        for d in xrange(1, 32))
+        _CELL_TABLES[key] = cells
+    return cells
+
+
+def _rows(offset, days, cells):
+    '''
+    Return rows of a month from blank cells before the first day,
+    days of month and a table of *cell_table*.
+    '''
+    line = cells[:1] * offset + cells[1:days + 1]
+    line += cells[:1] * (-len(line) % 7)
+    return tuple(''.join(line[j:j + 7]) for j in xrange(0, len(line), 7))
+
+
+def week_numbers(year, month, offset, firstweekday, count):
+    '''
+    Return ISO 8601 week numbers of rows of a month.
+
+    A row has exactly one Thursday for any first week day, and the week
+    of a row is the week of its Thursday. Because ISO year of a Thursday
+    is its calendar year, the week is derived from day of year of the
+    Thursday, without *date.isocalendar* for every row.
+
+    e.g.::
+
+        week_numbers(2014, 12, 0, calendar.MONDAY, 5)
+        # [49, 50, 51, 52, 1]
+
+    :param int year: year.
+    :param int month: month.
+    :param int offset: blank cells before the first day.
+    :param int firstweekday: first week day (0 is Monday, 6 is Sunday).
+    :param int count: number of rows.
+    :rtype: list
+    :return: week numbers.
+    '''
+    leap = calendar.isleap(year)
+    days_in_year = 366 if leap else 365
+    day_of_year = sum(DAYS_IN_MONTH[:month]) + (leap and month > 2) + 1
+    thursday = (day_of_year - offset +
+                (calendar.THURSDAY - firstweekday) % 7)
+
+    numbers = []
+    for d in xrange(thursday, thursday + 7 * count, 7):
+        if d < 1:
+            d += 366 if calendar.isleap(year - 1) else 365
+        elif d > days_in_year:
+            d -= days_in_year
+        numbers.append((d - 1) // 7 + 1)
+    return numbers
+
+
+def week_month(year, week):
+    '''
+    Return month of an ISO 8601 week. It is the month of Thursday of the
+    week, which has most days of the week.
+
+    :param int year: ISO year.
+    :param int week: week number (1-53).
+    :rtype: int
+    :return: month.
+    :raise ValueError: If the week is not in the year.
+    '''
+    if week < 1:
+        raise ValueError('week is out of range: %d' % week)
+    jan4 = date(year, 1, 4)
+    thursday = jan4 + timedelta(days=3 - jan4.weekday() + 7 * (week - 1))
+    if thursday.year != year:
+        raise ValueError('week is out of range: %d' % week)
+    return thursday.month
+
+
+def _highlight(rows, offset, days, highlight_format, lead=0):
+    '''
+    Return rows in which cells of *days* are replaced with
+    *highlight_format*. Only rows which have the days are rebuilt.
+    *lead* is number of cells before days (e.g. week number).
+    '''
+    rows = list(rows)
+    for day in days:
+        index, column = divmod(offset + day - 1, 7)
+        cells = rows[index].split('\t')
+        cells[column + lead] = highlight_format % day
+        rows[index] = '\t'.join(cells)
+    return tuple(rows)
+
+
+def _time_locale():
+    '''
+    Return current locale of LC_TIME, which affects names of week days.
+    '''
+    return locale.setlocale(locale.LC_TIME)
 
 
 class CalendarFormatter:
     '''
     Provide functions to getting string from specified datetime.
 
+    Rendered week rows and week headers are shared by all instances
+    through LRU cache. They are keyed by (year, month, first week day,
+    style of cells, locale), because the result never changes for same
+    key. Rows are joined from strings of *cell_table*, so that no day
+    is formatted on rendering.
+
+    First week day is owned by each instance, so that formatters of
+    different first week days are able to run concurrently in threads.
+
     :param datetime datetime: be formatted datetime.
+    :param int firstweekday:
+        first week day (0 is Monday, 6 is Sunday).
+        Default is *calendar.firstweekday()*.
+    :param str day_format: format of day (see *cell_table*).
+    :param str blank: string of blank cell (see *cell_table*).
+    :param str highlight_format:
+        format of highlighted day (e.g. '[%02d]'). A highlighted cell is
+        patched over cached rows, so rows are shared by every day.
+    :param str busy_format: format of days which have events.
+    :param str holiday_format: format of holidays.
+    :param str week_format:
+        format of ISO week number (e.g. 'W%02d'). If it is specified,
+        each row starts with a cell of week number (see *week_numbers*),
+        and week header starts with a blank cell.
     '''
 
-    def __init__(self, datetime):
+    _cache = LRUCache(maxsize=64)
+
+    def __init__(self, datetime, firstweekday=None, day_format='%02d',
+                 blank='', highlight_format='[%02d]', busy_format='%02d*',
+                 holiday_format='(%02d)', week_format=None):
         self._datetime = datetime
+        if firstweekday is None:
+            firstweekday = calendar.firstweekday()
+        self._calendar = calendar.TextCalendar(firstweekday)
+        self._style = (day_format, blank)
+        self._highlight_format = highlight_format
+        self._busy_format = busy_format
+        self._holiday_format = holiday_format
+        self._week_format = week_format
 
     def datetime(self, datetime_format='%Y/%m/%d'):
         '''
@@ -27,41 +235,123 @@ class CalendarFormatter:
         '''
         return self._datetime.strftime(datetime_format)
 
-    def weekdays(self):
+    def weekdays(self, highlight=None):
         '''
         Return a matrix of calendar from specified datetime.
-        Day format is '%02d' and during the date separeted by tab.
+        Day format is '%02d' (default) and during the date separeted by tab.
 
+        :param date highlight: day to highlight (e.g. today).
         :rtype: generator
         :return: matrix of calendar.
         '''
+        for _, rows in self.months(1, highlight):
+            for w in rows:
+                yield w
+
+    def months(self, count, highlight=None, busy=None, holidays=None):
+        '''
+        Return matrices of calendar for *count* months from specified
+        datetime. Week day of the first day is computed only once as
+        *monthcalendars*, and matrices which are cached are reused.
 
+        e.g.::
+
+            f = CalendarFormatter(datetime(2015, 3, 1))
+            for d, rows in f.months(3):
+                print d.strftime('%Y/%m')
+                for w in rows:
+                    print w
+
+        :param int count: number of months.
+        :param date highlight:
+            day to highlight (e.g. today). If it is in the months, the cell
+            is formatted by *highlight_format*.
+        :param busy:
+            function which receives year and month, and returns days
+            which have events. The cells are formatted by *busy_format*.
+        :param holidays:
+            function which receives year and month, and returns holidays.
+            The cells are formatted by *holiday_format*.
+            When a day has some marks, *highlight* takes precedence over
+            *busy*, and *busy* over *holidays*.
+        :rtype: generator
+        :return:
+            tuples of (datetime, rows of *weekdays*). The first datetime is
+            specified datetime, and the others are first day of the month.
+        '''
         y = self._datetime.year
         m = self._datetime.month
+        firstweekday = self._calendar.firstweekday
+        style = self._style
+        cells = cell_table(*style)
+        week_format = self._week_format
+        lead = 0 if week_format is None else 1
+        time_locale = _time_locale()
 
-        for w in calendar.monthcalendar(y, m):
-            formatter = lambda x: '%02d\t' % x if (x != 0) else '\t'
-            yield ''.join(map(formatter, w))
+        offsets = _month_offsets(y, m, count, firstweekday)
+        for i, (y, m, offset, days) in enumerate(offsets):
+            key = ('weekdays', y, m, firstweekday, style, week_format,
+                   time_locale)
+            rows = self._cache.get(key)
+            if rows is None:
+                rows = _rows(offset, days, cells)
+                if week_format is not None:
+                    rows = tuple(
+                        (week_format % n) + '\t' + row
+                        for n, row in zip(week_numbers(y, m, offset,
+                                                       firstweekday,
+                                                       len(rows)), rows))
+                self._cache.set(key, rows)
 
-    @classmethod
-    def weekheader(cls):
+            if holidays is not None:
+                days = holidays(y, m)
+                if days:
+                    rows = _highlight(rows, offset, days,
+                                      self._holiday_format, lead)
+            if busy is not None:
+                days = busy(y, m)
+                if days:
+                    rows = _highlight(rows, offset, days, self._busy_format,
+                                      lead)
+            if (highlight is not None and highlight.month == m and
+                    highlight.year == y):
+                rows = _highlight(rows, offset, (highlight.day,),
+                                  self._highlight_format, lead)
+
+            if i == 0:
+                yield self._datetime, rows
+            else:
+                yield self._datetime.replace(year=y, month=m, day=1), rows
+
+    def weekheader(self):
         '''
         Return a week header.
 
         e.g.::
 
-            CalendarFormatter.weekheader()
+            CalendarFormatter(datetime.now(), calendar.MONDAY).weekheader()
             # Mo\tTu\tWe\tTh\tFr\tSt\tSu
 
         :rtype: str
         :return: week header.
         '''
-        return calendar.weekheader(2).replace(' ', '\t')
+        key = ('weekheader', self._calendar.firstweekday,
+               self._week_format is not None, self._style[1], _time_locale())
+        header = self._cache.get(key)
+        if header is None:
+            header = self._calendar.formatweekheader(2).replace(' ', '\t')
+            if self._week_format is not None:
+                header = self._style[1] + '\t' + header
+            self._cache.set(key, header)
+        return header
 
     @classmethod
     def setfirstweekday(cls, firstweekday):
         '''
-        Set the weekday to start each week.
+        Set the weekday to start each week of formatters which are created
+        without *firstweekday*. It changes global state of *calendar*
+        module, so pass *firstweekday* to the constructor instead when
+        formatters run concurrently.
 
         :param int firstweekday:
             first week day (0 is Monday, 6 is Sunday).
@@ -84,3 +374,20 @@ class CalendarFormatter:
         :return: calendar.MONDAY
         '''
         return calendar.MONDAY
+
+    @classmethod
+    def cache_info(cls):
+        '''
+        Return statistics of the cache shared by all instances.
+
+        :rtype: dict
+        :return: hits, misses, maxsize and currsize.
+        '''
+        return cls._cache.info()
+
+    @classmethod
+    def cache_clear(cls):
+        '''
+        Discard rendered week rows and week headers.
+        '''
+        cls._cache.clear()
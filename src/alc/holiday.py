@@ -0,0 +1,276 @@
+# -*- coding:utf-8 -*-
+'''
+Holidays defined by rules in a local JSON file.
+
+A rule file is a list of rules as follow::
+
+    [
+        {"name": "New Year's Day", "month": 1, "day": 1},
+        {"name": "Coming of Age Day", "month": 1, "weekday": 0, "nth": 2},
+        {"name": "Memorial Day", "month": 5, "weekday": 0, "nth": -1},
+        {"name": "Good Friday", "easter": -2}
+    ]
+
++-----------------------+-------------------------------------------------+
+| keys                  | holiday                                         |
++=======================+=================================================+
+| month, day            | fixed date.                                     |
++-----------------------+-------------------------------------------------+
+| month, weekday, nth   | *nth* week day of month (0 is Monday). Negative |
+|                       | *nth* counts from the end of month.             |
++-----------------------+-------------------------------------------------+
+| easter                | days from Easter Sunday (Gregorian).            |
++-----------------------+-------------------------------------------------+
+
+Optional *since* and *until* limit years of a rule.
+
+Rules are compiled once per year into bitmaps of days (bit *d* of
+*masks[month]* is set for a holiday), and the bitmaps are stored in a
+JSON file with the stamp of the rule file. A holiday is looked up by
+a bit test, without evaluating rules.
+'''
+
+import calendar
+import os
+
+from datetime import date, timedelta
+
+from alc.days import days_in_month
+
+# Week days which are not business days. (Saturday and Sunday)
+WEEKEND = (calendar.SATURDAY, calendar.SUNDAY)
+
+
+def easter(year):
+    '''
+    Return Easter Sunday of Gregorian calendar.
+
+    :param int year: year.
+    :rtype: date
+    :return: Easter Sunday.
+    '''
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _nth_weekday(year, month, weekday, nth):
+    if nth > 0:
+        first = (weekday - calendar.weekday(year, month, 1)) % 7 + 1
+        day = first + (nth - 1) * 7
+    else:
+        days = days_in_month(year, month)
+        last = days - (calendar.weekday(year, month, days) - weekday) % 7
+        day = last + (nth + 1) * 7
+    if 1 <= day <= days_in_month(year, month):
+        return date(year, month, day)
+    return None
+
+
+def _compile_rule(rule):
+    '''
+    Return a function which receives year and returns date of a rule.
+    '''
+    if not isinstance(rule, dict):
+        raise ValueError('rule must be JSON object: %r' % (rule,))
+
+    try:
+        return _compile_values(rule)
+    except (TypeError, KeyError):
+        # e.g. {"month": null, "day": 1}
+        raise ValueError('invalid rule: %r' % (rule,))
+
+
+def _compile_values(rule):
+    keys = set(rule) - set(['name', 'since', 'until'])
+    if keys == set(['month', 'day']):
+        month, day = int(rule['month']), int(rule['day'])
+        func = lambda y: date(y, month, day)
+    elif keys == set(['month', 'weekday', 'nth']):
+        month, weekday, nth = (int(rule['month']), int(rule['weekday']),
+                               int(rule['nth']))
+        if nth == 0 or not 0 <= weekday <= 6:
+            raise ValueError('invalid rule: %r' % (rule,))
+        func = lambda y: _nth_weekday(y, month, weekday, nth)
+    elif keys == set(['easter']):
+        offset = timedelta(days=int(rule['easter']))
+        func = lambda y: easter(y) + offset
+    else:
+        raise ValueError('invalid rule: %r' % (rule,))
+
+    since = int(rule.get('since', 1))
+    until = int(rule.get('until', 9999))
+
+    def compiled(year):
+        if not since <= year <= until:
+            return None
+        try:
+            return func(year)
+        except ValueError:
+            # e.g. February 29 of a common year
+            return None
+    return compiled
+
+
+def load_rules(path):
+    '''
+    Return compiled rules of a rule file.
+
+    :param str path: path of rule file.
+    :rtype: list
+    :return: functions which receive year and return date (or None).
+    :raise ValueError: If a rule is invalid.
+    :raise IOError: If the file is not readable.
+    '''
+    import json
+
+    with open(path) as f:
+        rules = json.load(f)
+    if not isinstance(rules, list):
+        raise ValueError('rules must be JSON array')
+    return [_compile_rule(r) for r in rules]
+
+
+def compile_year(rules, year):
+    '''
+    Return bitmaps of holidays of a year.
+
+    :param list rules: compiled rules of *load_rules*.
+    :param int year: year.
+    :rtype: list
+    :return: 13 integers. Bit *d* of *masks[month]* is set for a holiday.
+    '''
+    masks = [0] * 13
+    for rule in rules:
+        d = rule(year)
+        if d is not None and d.year == year:
+            masks[d.month] |= 1 << d.day
+    return masks
+
+
+class HolidayCalendar(object):
+    '''
+    Holidays of a rule file. Bitmaps of each year are compiled when the
+    year is used first, and stored in *cache_path* by *save*.
+    The stored bitmaps are discarded when the rule file is changed.
+
+    e.g.::
+
+        holidays = HolidayCalendar('holidays.json', '/tmp/holidays.cache')
+        holidays.days(2014, 7)
+        # set([21])
+        holidays.business_days(2014, 7)
+        # 22
+        holidays.save()
+
+    :param str path: path of rule file.
+    :param str cache_path: path of compiled bitmaps. None is not stored.
+    :raise OSError: If the rule file does not exist.
+    '''
+
+    def __init__(self, path, cache_path=None):
+        st = os.stat(path)
+        self.path = path
+        self.stamp = [os.path.abspath(path), st.st_mtime, st.st_size]
+        self._cache_path = cache_path
+        self._rules = None
+        self._years = self._load_cache()
+        self._dirty = False
+
+    def _load_cache(self):
+        if self._cache_path is None or not os.path.exists(self._cache_path):
+            return {}
+
+        import json
+        try:
+            with open(self._cache_path) as f:
+                cache = json.load(f)
+            if cache.get('stamp') != self.stamp:
+                return {}
+            return dict((int(y), m) for y, m in cache['years'].items())
+        except (IOError, ValueError, KeyError, AttributeError):
+            return {}
+
+    def masks(self, year):
+        '''
+        Return bitmaps of holidays of a year (see *compile_year*).
+
+        :param int year: year.
+        :rtype: list
+        :return: 13 integers.
+        '''
+        masks = self._years.get(year)
+        if masks is None:
+            if self._rules is None:
+                self._rules = load_rules(self.path)
+            masks = self._years[year] = compile_year(self._rules, year)
+            self._dirty = True
+        return masks
+
+    def is_holiday(self, d):
+        '''
+        Return True if the date is a holiday.
+
+        :param date d: date.
+        :rtype: bool
+        '''
+        return bool(self.masks(d.year)[d.month] >> d.day & 1)
+
+    def days(self, year, month):
+        '''
+        Return holidays of a month.
+
+        :param int year: year.
+        :param int month: month.
+        :rtype: set
+        :return: days of month.
+        '''
+        mask = self.masks(year)[month]
+        return set(d for d in xrange(1, 32) if mask >> d & 1)
+
+    def business_days(self, year, month, weekend=WEEKEND):
+        '''
+        Return number of days which are neither weekend nor holiday.
+
+        :param int year: year.
+        :param int month: month.
+        :param tuple weekend: week days which are not business days.
+        :rtype: int
+        :return: number of business days.
+        '''
+        mask = self.masks(year)[month]
+        weekday = calendar.weekday(year, month, 1)
+        count = 0
+        for d in xrange(1, days_in_month(year, month) + 1):
+            if (weekday + d - 1) % 7 not in weekend and not mask >> d & 1:
+                count += 1
+        return count
+
+    def save(self):
+        '''
+        Store compiled bitmaps in *cache_path* if any year is compiled.
+        Failure of writing is ignored, because the cache is not essential.
+        '''
+        if self._cache_path is None or not self._dirty:
+            return
+
+        import json
+        try:
+            directory = os.path.dirname(self._cache_path)
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory)
+            with open(self._cache_path, 'w') as f:
+                json.dump({'stamp': self.stamp,
+                           'years': dict((str(y), m) for y, m
+                                         in self._years.items())}, f)
+            self._dirty = False
+        except (IOError, OSError):
+            pass
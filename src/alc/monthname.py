@@ -0,0 +1,263 @@
+# -*- coding:utf-8 -*-
+'''
+Completion of month names in a query (e.g. 'jul 2014').
+
+Full names and abbreviations of *calendar* are read once per LC_TIME
+locale into a sorted list of lowercase names, and the list is kept in
+the process. A prefix is looked up by binary search, without reading
+names of *calendar* (which formats them by *strftime* on every access).
+
+e.g.::
+
+    complete('ju')
+    # [(6, u'June'), (7, u'July')]
+    complete('juli', ['de_DE.UTF-8'])
+    # [(7, u'Juli')]
+
+A name is matched in order of exact name, prefix and fuzzy (letters in
+order, e.g. 'jly'). Fuzzy match is tried only for full names and
+3 letters or more.
+
+Names of another locale are read in a child process, because LC_TIME
+is global state of the process, and switching it would change week
+headers rendered by other threads (e.g. *alc.server* with
+*--threading*) in the meantime. The names are stored in a file of
+*data_dir()* per locale and version of *alc*, so that the child process
+is started only when the file is missing.
+'''
+
+import bisect
+import calendar
+import locale
+import os
+import sys
+import threading
+
+# Minimum length of fuzzy match.
+FUZZY_MIN_LENGTH = 3
+
+_indexes = {}
+
+_lock = threading.Lock()
+
+
+class MonthNameIndex(object):
+    '''
+    Sorted prefix index of month names.
+
+    :param list names: full names of months (index 0 is ignored).
+    :param list abbrs: abbreviations of months (index 0 is ignored).
+    '''
+
+    def __init__(self, names, abbrs):
+        self.names = [None] + list(names[1:13])
+        entries = sorted(set((n.lower(), m)
+                             for m in range(1, 13)
+                             for n in (names[m], abbrs[m]) if n))
+        self._keys = [k for k, _ in entries]
+        self._months = [m for _, m in entries]
+        self._full = [(n.lower(), m) for m, n in enumerate(names)
+                      if m > 0 and n]
+
+    def exact(self, text):
+        '''
+        Return months whose name or abbreviation is *text*.
+
+        :param unicode text: lowercase text.
+        :rtype: list
+        '''
+        lo = bisect.bisect_left(self._keys, text)
+        hi = bisect.bisect_right(self._keys, text)
+        return self._months[lo:hi]
+
+    def prefix(self, text):
+        '''
+        Return months whose name or abbreviation starts with *text*.
+
+        :param unicode text: lowercase text.
+        :rtype: list
+        :return: sorted months.
+        '''
+        lo = bisect.bisect_left(self._keys, text)
+        hi = lo
+        while hi < len(self._keys) and self._keys[hi].startswith(text):
+            hi += 1
+        return sorted(set(self._months[lo:hi]))
+
+    def fuzzy(self, text):
+        '''
+        Return months whose full name includes letters of *text* in order.
+
+        :param unicode text: lowercase text.
+        :rtype: list
+        '''
+        if len(text) < FUZZY_MIN_LENGTH:
+            return []
+        return [m for name, m in self._full if _is_subsequence(text, name)]
+
+
+def _is_subsequence(text, name):
+    chars = iter(name)
+    return all(c in chars for c in text)
+
+
+def _read_names():
+    '''
+    Return (full names, abbreviations) of current LC_TIME locale as
+    unicode.
+    '''
+    try:
+        encoding = locale.getlocale(locale.LC_TIME)[1] or 'utf-8'
+    except ValueError:
+        encoding = 'utf-8'
+
+    def decode(name):
+        if isinstance(name, unicode):
+            return name
+        return name.decode(encoding, 'replace')
+
+    return ([decode(n) for n in calendar.month_name],
+            [decode(n) for n in calendar.month_abbr])
+
+
+_PROBE = '''
+import json
+import locale
+import sys
+
+sys.path.insert(0, %r)
+from alc.monthname import _read_names
+
+locale.setlocale(locale.LC_TIME, sys.argv[1])
+print json.dumps(_read_names())
+'''
+
+
+def _read_locale_names(name):
+    '''
+    Return (full names, abbreviations) of a locale, which are read in a
+    child process. If the locale is not supported, return None.
+    '''
+    import json
+    import subprocess
+
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen([sys.executable, '-c', _PROBE % src_dir,
+                                name],
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    output, _ = process.communicate()
+    if process.returncode != 0:
+        return None
+    return json.loads(output)
+
+
+def _names_path(name):
+    '''
+    Return a path of the file which stores names of a locale.
+    '''
+    from alc import __version__
+    from alc.env import data_dir
+
+    safe = ''.join(c if c.isalnum() or c in '.-_@' else '_' for c in name)
+    return os.path.join(data_dir(), 'monthnames',
+                        '%s-%s.json' % (safe, __version__))
+
+
+def _load_locale_names(name):
+    '''
+    Return (True, names) stored by *_save_locale_names*. names is None
+    for a locale which is not supported. If the file is missing or
+    broken, return (False, None).
+    '''
+    import json
+
+    path = _names_path(name)
+    if not os.path.exists(path):
+        return False, None
+    try:
+        with open(path) as f:
+            stored = json.load(f)
+        if stored['locale'] != name:
+            return False, None
+        return True, stored['names']
+    except (IOError, ValueError, KeyError, TypeError):
+        return False, None
+
+
+def _save_locale_names(name, names):
+    '''
+    Store names of a locale. Failure of writing is ignored, because the
+    file is not essential.
+    '''
+    import json
+
+    path = _names_path(name)
+    try:
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        with open(path, 'w') as f:
+            json.dump({'locale': name, 'names': names}, f)
+    except (IOError, OSError):
+        pass
+
+
+def _build(name):
+    if name is None or name == locale.setlocale(locale.LC_TIME):
+        return MonthNameIndex(*_read_names())
+
+    found, names = _load_locale_names(name)
+    if not found:
+        names = _read_locale_names(name)
+        _save_locale_names(name, names)
+    if names is None:
+        return None
+    return MonthNameIndex(*names)
+
+
+def month_index(name=None):
+    '''
+    Return index of month names of a locale. An index is built once per
+    locale under a lock. LC_TIME of this process is not changed.
+
+    :param str name: locale name. Default is current LC_TIME locale.
+    :rtype: MonthNameIndex
+    :return: index. If the locale is not supported, return None.
+    '''
+    key = name or locale.setlocale(locale.LC_TIME)
+    with _lock:
+        if key not in _indexes:
+            _indexes[key] = _build(name)
+        return _indexes[key]
+
+
+def complete(text, locales=()):
+    '''
+    Return months which match a text in current locale and *locales*.
+
+    :param unicode text: month name, abbreviation or prefix of them.
+    :param list locales: names of additional locales.
+    :rtype: list
+    :return:
+        sorted tuples of (month, full name). Name of the first matched
+        locale is used.
+    '''
+    indexes = [i for i in [month_index()] + [month_index(n) for n in locales]
+               if i is not None]
+    text = text.lower()
+    for search in ('exact', 'prefix', 'fuzzy'):
+        found = {}
+        for index in indexes:
+            for m in getattr(index, search)(text):
+                found.setdefault(m, index.names[m])
+        if found:
+            return sorted(found.items())
+    return []
+
+
+def index_clear():
+    '''
+    Clear indexes of all locales.
+    '''
+    with _lock:
+        _indexes.clear()
@@ -0,0 +1,56 @@
+# -*- coding:utf-8 -*-
+'''
+JSON request of *alc* server and batch mode.
+
+A request is a JSON object in a line. *query* overrides *query* of
+*config*, and both of them are optional.::
+
+    {"query": "7 2014", "config": {"first_week_day": 6}}
+
+'''
+
+import json
+
+
+def to_str(obj):
+    '''
+    Convert unicode in decoded JSON to UTF-8 string, so that command
+    receives same type of config as the workflow script.
+
+    :param obj: decoded JSON.
+    :return: same object whose unicode is converted.
+    '''
+    if isinstance(obj, unicode):
+        return obj.encode('utf-8')
+    if isinstance(obj, dict):
+        return dict((to_str(k), to_str(v)) for k, v in obj.items())
+    if isinstance(obj, list):
+        return [to_str(v) for v in obj]
+    return obj
+
+
+def decode_request(line, defaults=None):
+    '''
+    Return config of *CalendarCommand* from a request line.
+
+    :param str line: JSON of request.
+    :param dict defaults: config which is overridden by the request.
+    :rtype: dict
+    :return: config of *CalendarCommand*.
+    :raise ValueError:
+        If the line is not JSON object, *config* is not JSON object or
+        *query* is not string.
+    '''
+    request = json.loads(line)
+    if not isinstance(request, dict):
+        raise ValueError('request must be JSON object')
+    if not isinstance(request.get('config', {}), dict):
+        raise ValueError('config must be JSON object')
+
+    config = dict(defaults or {})
+    config.update(to_str(request.get('config', {})))
+    if 'query' in request:
+        config['query'] = to_str(request['query'])
+    if not isinstance(config.get('query', ''), basestring):
+        raise ValueError('query must be string')
+    return config
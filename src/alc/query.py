@@ -0,0 +1,147 @@
+# -*- coding:utf-8 -*-
+
+
+class ArgumentParserError(Exception):
+    '''
+    When failed to parse argument, this exception is raised.
+    '''
+    pass
+
+
+class Namespace(object):
+    '''
+    Result of *QueryParser.parse_args*. Each argument is an attribute,
+    so that *vars()* returns a dict like *argparse.Namespace*.
+    '''
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+    def __eq__(self, other):
+        return vars(self) == vars(other)
+
+    def __ne__(self, other):
+        return not (self == other)
+
+    def __repr__(self):
+        return 'Namespace(%s)' % ', '.join(
+            '%s=%r' % kv for kv in sorted(vars(self).items()))
+
+
+class QueryParser(object):
+    '''
+    Lightweight parser of query. It accepts optional arguments,
+    each of them is an integer in range.
+    Unlike *argparse.ArgumentParser*, a value is validated by comparison
+    with bounds, and an instance is able to be reused for every query.
+
+    * Positional argument is filled in order of *add_argument*.
+      When a value of *skippable* argument is out of range, the value is
+      given to the next positional argument instead.
+    * Argument with *prefix* (e.g. '+2') is able to be put anywhere.
+
+    e.g.::
+
+        parser = QueryParser()
+        parser.add_argument('month', 1, 12, skippable=True)
+        parser.add_argument('year', 0, 9999)
+        parser.add_argument('span', 0, 1199, prefix='+')
+        vars(parser.parse_args(['7']))
+        # {'month': 7, 'year': None, 'span': None}
+        vars(parser.parse_args(['2015', '+2']))
+        # {'month': None, 'year': 2015, 'span': 2}
+
+    '''
+
+    def __init__(self):
+        self._names = []
+        self._positionals = []
+        self._prefixed = []
+
+    def add_argument(self, name, low, high, prefix=None, skippable=False):
+        '''
+        Add an optional argument.
+
+        :param str name: name of argument.
+        :param int low: min value of argument.
+        :param int high: max value of argument.
+        :param str prefix:
+            prefix of value. If it is None, the argument is positional.
+        :param bool skippable:
+            If True, out of range value is given to the next positional
+            argument.
+        '''
+        self._names.append(name)
+        if prefix is None:
+            self._positionals.append((name, low, high, skippable))
+        else:
+            self._prefixed.append((prefix, name, low, high))
+
+    def parse_args(self, args):
+        '''
+        Parse arguments.
+
+        :param list args: list of argument string.
+        :rtype: Namespace
+        :return: parsed arguments. Omitted argument is None.
+        :raise ArgumentParserError: failed to parse arguments.
+        '''
+        ns = Namespace(**dict.fromkeys(self._names))
+        i = 0
+        for token in args:
+            for prefix, name, low, high in self._prefixed:
+                if token.startswith(prefix):
+                    setattr(ns, name,
+                            _to_int(name, token[len(prefix):], low, high))
+                    break
+            else:
+                i = self._parse_positional(ns, i, token)
+
+        return ns
+
+    def _parse_positional(self, ns, i, token):
+        error = None
+        while i < len(self._positionals):
+            name, low, high, skippable = self._positionals[i]
+            i += 1
+            try:
+                setattr(ns, name, _to_int(name, token, low, high))
+                return i
+            except ArgumentParserError as e:
+                error = error or e
+                if not skippable:
+                    break
+
+        raise error or ArgumentParserError(
+            'unrecognized arguments: %s' % token)
+
+
+def _to_int(name, token, low, high):
+    '''
+    Convert token to int, and check it is in range.
+    '''
+    try:
+        value = int(token)
+    except ValueError:
+        raise ArgumentParserError(
+            'argument %s: invalid int value: %r' % (name, token))
+
+    if value < low or high < value:
+        raise ArgumentParserError(
+            'argument %s: invalid choice: %d (choose from %d-%d)'
+            % (name, value, low, high))
+    return value
+
+
+def is_expression(query):
+    '''
+    Return True if a query may be a date expression, i.e. it is not a
+    query of months (digits and '+N'). *CalendarCommand.execute* uses it
+    to route a query to expressions, month names and weeks, without
+    importing *alc.expression*.
+
+    :param str query: query.
+    :rtype: bool
+    '''
+    return query.strip(' 0123456789+') != ''
+
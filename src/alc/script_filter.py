@@ -1,6 +1,59 @@
 # -*- coding:utf-8 -*-
 
-import xml.etree.ElementTree as etree
+_ITEM_TEMPLATE = ('<item autocomplete="%s" uid="%s" valid="%s">'
+                  '<title>%s</title></item>')
+
+_JSON_ITEM_TEMPLATE = '{"uid":%s,"valid":%s,"autocomplete":%s,"title":%s}'
+
+_JSON_VALID = {'yes': 'true', 'no': 'false'}
+
+
+def _escape_cdata(text):
+    '''
+    Escape character data as same as *xml.etree.ElementTree.tostring*.
+    '''
+    if '&' in text:
+        text = text.replace('&', '&amp;')
+    if '<' in text:
+        text = text.replace('<', '&lt;')
+    if '>' in text:
+        text = text.replace('>', '&gt;')
+    return text.encode('us-ascii', 'xmlcharrefreplace')
+
+
+def _escape_attrib(text):
+    '''
+    Escape attribute value as same as *xml.etree.ElementTree.tostring*.
+    '''
+    if '&' in text:
+        text = text.replace('&', '&amp;')
+    if '<' in text:
+        text = text.replace('<', '&lt;')
+    if '>' in text:
+        text = text.replace('>', '&gt;')
+    if '"' in text:
+        text = text.replace('"', '&quot;')
+    if '\n' in text:
+        text = text.replace('\n', '&#10;')
+    return text.encode('us-ascii', 'xmlcharrefreplace')
+
+
+def _xml_item(uid, valid, autocomplete, title):
+    return _ITEM_TEMPLATE % (_escape_attrib(autocomplete), _escape_attrib(uid),
+                             valid, _escape_cdata(title))
+
+
+def _json_item_function():
+    '''
+    Return a function which formats an item as JSON.
+    *json* is imported when JSON is used.
+    '''
+    from json.encoder import encode_basestring_ascii as encode
+
+    def json_item(uid, valid, autocomplete, title):
+        return _JSON_ITEM_TEMPLATE % (encode(uid), _JSON_VALID[valid],
+                                      encode(autocomplete), encode(title))
+    return json_item
 
 
 class ScriptFilter:
@@ -64,11 +117,22 @@ class ScriptFilter:
         #     <title>Firefox</title>
         #   </item>
         # </items>
+        print sf.json_s
+        # {"items":[
+        #   {"uid":"0","valid":false,"autocomplete":"","title":"Safari"},
+        #   ...
+        # ]}
 
+    Items are kept as tuples of (title, uid, valid, autocomplete) as they
+    are appended. Default *uid* (index of item) and attribute values are
+    made when the script filter is serialized. DOM elements are built
+    only when *xml* is read, so that *xml.etree* is not imported on usual
+    path.
     '''
 
     def __init__(self):
-        self._node_items = etree.Element('items')
+        self._items = []
+        self._node_items = None
 
     def append_item(self, title, uid=None, valid=False, autocomplete=''):
         '''
@@ -93,33 +157,157 @@ class ScriptFilter:
         if title is None or title is '':
             raise ValueError('Argument \'title\' is requred.')
 
-        attr_uid = uid if uid else str(len(self._node_items))
-        attr_valid = 'yes' if valid else 'no'
-
-        node_item = etree.SubElement(self._node_items, 'item',
-                                     uid=attr_uid,
-                                     valid=attr_valid,
-                                     autocomplete=autocomplete)
+        self._items.append((title, uid, valid, autocomplete))
+        self._node_items = None
 
-        node_title = etree.SubElement(node_item, 'title')
-        node_title.text = title
+    def _attributes(self):
+        '''
+        Return (uid, valid, autocomplete, title) of each item.
+        Default *uid* is index of item, and *valid* is 'yes' or 'no'.
+        '''
+        for i, (title, uid, valid, autocomplete) in enumerate(self._items):
+            yield (uid if uid else str(i), 'yes' if valid else 'no',
+                   autocomplete, title)
 
     @property
     def xml(self):
         '''
         Return script filter xml as DOM elements.
+        The elements are built at first access after appending items.
+        Changes of returned elements are not reflected to *xml_s*.
 
         :rtype: xml.etree.Element
         :return: DOM element of script filter xml.
         '''
+        if self._node_items is None:
+            import xml.etree.ElementTree as etree
+
+            node_items = etree.Element('items')
+            for uid, valid, autocomplete, title in self._attributes():
+                node_item = etree.SubElement(node_items, 'item',
+                                             uid=uid,
+                                             valid=valid,
+                                             autocomplete=autocomplete)
+                node_title = etree.SubElement(node_item, 'title')
+                node_title.text = title
+            self._node_items = node_items
+
         return self._node_items
 
     @property
     def xml_s(self):
         '''
         Return script filter xml as string.
+        The result is same as *xml.etree.ElementTree.tostring(self.xml)*,
+        but it is written without building DOM elements.
 
         :rtype: str
         :return: String of script filter xml.
         '''
-        return etree.tostring(self._node_items)
+        if not self._items:
+            return '<items />'
+
+        buf = ['<items>']
+        for attributes in self._attributes():
+            buf.append(_xml_item(*attributes))
+        buf.append('</items>')
+
+        return ''.join(buf)
+
+    @property
+    def json_s(self):
+        '''
+        Return script filter as JSON string (Alfred v3+).
+        Each item has same *uid*, *valid*, *autocomplete* and *title*
+        as *xml_s*.
+
+        :rtype: str
+        :return: String of script filter JSON.
+        '''
+        json_item = _json_item_function()
+        buf = [json_item(*attributes) for attributes in self._attributes()]
+        return '{"items":[%s]}' % ','.join(buf)
+
+
+class ScriptFilterWriter(object):
+    '''
+    Writer of script filter which writes each item to a file-like object
+    as soon as it is appended, instead of keeping items in memory.
+    Output is same as *xml_s* or *json_s* of *ScriptFilter* which has
+    same items.
+
+    e.g.::
+
+        with ScriptFilterWriter(sys.stdout) as writer:
+            for title in titles:
+                writer.append_item(title)
+
+    The head of script filter is written with the first item, because
+    a script filter without items is written in another form
+    (e.g. '<items />').
+
+    :param file fp: file-like object which has *write*.
+    :param str output_format: 'xml' or 'json'.
+    :param bool flush:
+        If True, *fp* is flushed after each item and the end, so that a
+        reader of a buffered stream receives items as they are written.
+    :raise ValueError: If *output_format* is unknown.
+    '''
+
+    def __init__(self, fp, output_format='xml', flush=False):
+        if output_format == 'xml':
+            self._item, self._empty = _xml_item, '<items />'
+            self._head, self._separator, self._tail = \
+                '<items>', '', '</items>'
+        elif output_format == 'json':
+            self._item, self._empty = _json_item_function(), '{"items":[]}'
+            self._head, self._separator, self._tail = \
+                '{"items":[', ',', ']}'
+        else:
+            raise ValueError('unknown output format: %r' % output_format)
+
+        self._fp = fp
+        self._flush = flush
+        self._count = 0
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def append_item(self, title, uid=None, valid=False, autocomplete=''):
+        '''
+        Write an item. Arguments are same as *ScriptFilter.append_item*.
+
+        :raises ValueError:
+            If *title* is None or empty string, or writer is closed.
+        '''
+        if title is None or title is '':
+            raise ValueError('Argument \'title\' is requred.')
+        if self.closed:
+            raise ValueError('I/O operation on closed writer.')
+
+        item = self._item(uid if uid else str(self._count),
+                          'yes' if valid else 'no', autocomplete, title)
+        if self._count == 0:
+            self._fp.write(self._head + item)
+        else:
+            self._fp.write(self._separator + item)
+        self._count += 1
+        if self._flush:
+            self._fp.flush()
+
+    def close(self):
+        '''
+        Write the end of script filter. The file-like object is not
+        closed.
+        '''
+        if self.closed:
+            return
+        self._fp.write(self._tail if self._count else self._empty)
+        self.closed = True
+        if self._flush:
+            self._fp.flush()
@@ -0,0 +1,187 @@
+# -*- coding:utf-8 -*-
+
+import argparse
+import json
+import os
+import SocketServer
+import threading
+
+from alc.command import CalendarCommand
+from alc.env import socket_path
+from alc.protocol import decode_request
+
+
+class CalendarRequestHandler(SocketServer.StreamRequestHandler):
+    '''
+    Handler of a connection to *CalendarServer*.
+    A request and a response are JSON object terminated by newline.
+    (see *alc.protocol*)
+
+    request::
+
+        {"config": {"query": "7 2014", "first_week_day": 6}}
+
+    response::
+
+        {"output": "<items>...</items>"}
+
+    '''
+
+    def handle(self):
+        for line in iter(self.rfile.readline, ''):
+            self.wfile.write(self.server.dispatch(line) + '\n')
+            self.wfile.flush()
+
+
+class CalendarServer(SocketServer.UnixStreamServer):
+    '''
+    Long-lived *alc* process listening on a Unix socket.
+    By keeping modules imported, a query is answered without
+    starting Python interpreter.
+
+    :param str path: path of Unix socket.
+    '''
+
+    def __init__(self, path, handler_class=CalendarRequestHandler):
+        if os.path.exists(path):
+            os.unlink(path)
+        SocketServer.UnixStreamServer.__init__(self, path, handler_class)
+
+    def dispatch(self, line):
+        '''
+        Execute *CalendarCommand* from a request line.
+
+        :param str line: JSON of request.
+        :rtype: str
+        :return: JSON of response.
+        '''
+        try:
+            config = decode_request(line)
+            return json.dumps({'output': self.execute(config)})
+        except Exception as e:
+            return json.dumps({'error': '%s: %s' % (type(e).__name__, e)})
+
+    def execute(self, config):
+        '''
+        Return *Script Filter XML* for config.
+
+        :param dict config: configuration of *CalendarCommand*.
+        :rtype: str
+        :return: *Script Filter XML*
+        '''
+        return CalendarCommand(config).execute()
+
+    def server_close(self):
+        SocketServer.UnixStreamServer.server_close(self)
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+class _Call(object):
+    '''
+    An in-flight execution of *Coalescer*.
+    '''
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class Coalescer(object):
+    '''
+    Wrapper of a function which shares one execution among identical
+    calls in flight. While a call for a config is executed, other calls
+    for same config wait for it and receive same result.
+
+    e.g.::
+
+        execute = Coalescer(lambda c: CalendarCommand(c).execute())
+        execute({'query': '2014 +11'})
+
+    :param execute: function which receives config.
+    '''
+
+    def __init__(self, execute):
+        self._execute = execute
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self.coalesced = 0
+
+    def __call__(self, config):
+        key = repr(sorted(config.items()))
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if leader:
+            try:
+                call.result = self._execute(config)
+            except Exception as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._inflight[key]
+                call.event.set()
+        else:
+            call.event.wait()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+
+class ThreadingCalendarServer(SocketServer.ThreadingMixIn, CalendarServer):
+    '''
+    *CalendarServer* which handles each connection in a thread.
+    Requests of a connection are answered in order, and identical
+    requests in flight on different connections share one render
+    (see *Coalescer*). Rendering of a connection never blocks others.
+
+    :param str path: path of Unix socket.
+    '''
+
+    daemon_threads = True
+
+    def __init__(self, path, handler_class=CalendarRequestHandler):
+        CalendarServer.__init__(self, path, handler_class)
+        self.coalescer = Coalescer(
+            lambda config: CalendarServer.execute(self, config))
+
+    def execute(self, config):
+        return self.coalescer(config)
+
+
+def serve(path=None, threaded=False):
+    '''
+    Start *CalendarServer* and serve until interrupted.
+
+    :param str path: path of Unix socket. Default is *env.socket_path()*.
+    :param bool threaded: If True, start *ThreadingCalendarServer*.
+    '''
+    server_class = ThreadingCalendarServer if threaded else CalendarServer
+    server = server_class(path or socket_path())
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='alc.server')
+    parser.add_argument('--socket', default=socket_path(),
+                        help='path of Unix socket')
+    parser.add_argument('--threading', action='store_true',
+                        help='handle each connection in a thread')
+    args = parser.parse_args(argv)
+    serve(args.socket, args.threading)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+# -*- coding:utf-8 -*-
+'''
+Per-phase timing of *CalendarCommand*.
+
+Timing is enabled by *timing* config key or *ALC_TIMING* environment
+variable. The value is a sink or a list of sinks (comma separated in
+environment variable).
+
++----------------+-----------------------------------------------------+
+| sink           | description                                         |
++================+=====================================================+
+| 'stderr'       | write a JSON line to stderr.                        |
++----------------+-----------------------------------------------------+
+| 'jsonl'        | append a JSON line to 'timing.jsonl' in workflow    |
+|                | data directory.                                     |
++----------------+-----------------------------------------------------+
+| 'jsonl:<path>' | append a JSON line to <path>.                       |
++----------------+-----------------------------------------------------+
+| callable       | call with a record (dict).                          |
++----------------+-----------------------------------------------------+
+
+A record is as follow::
+
+    {"query": "7 2014", "time": 1406376000.0, "total": 0.00012,
+     "phases": {"split": 0.000002, "parse_args": 0.00001, ...}}
+
+Timing never changes output of a command. An unknown sink disables
+timing, and a sink which raises an exception is removed. Each of them
+is reported on stderr once.
+'''
+
+import os
+import sys
+import time
+
+ENVIRON_KEY = 'ALC_TIMING'
+
+# Messages which are already reported by *_report*.
+_reported = set()
+
+
+def _report(message):
+    '''
+    Write a message of timing to stderr once per process.
+    '''
+    if message in _reported:
+        return
+    _reported.add(message)
+    try:
+        sys.stderr.write('alc: %s\n' % message)
+    except Exception:
+        pass
+
+
+class _NullPhase(object):
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+class NullTimer(object):
+    '''
+    Timer which records nothing. It is used when timing is disabled.
+    '''
+
+    enabled = False
+
+    _phase = _NullPhase()
+
+    def phase(self, name):
+        '''
+        Return a context manager which does nothing.
+        '''
+        return self._phase
+
+    def emit(self, **kwargs):
+        '''
+        Do nothing.
+        '''
+        pass
+
+
+class _Phase(object):
+
+    def __init__(self, timer, name):
+        self._timer = timer
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        phases = self._timer.phases
+        phases[self._name] = (phases.get(self._name, 0.0) +
+                              time.time() - self._start)
+        return False
+
+
+class Timer(object):
+    '''
+    Timer which records elapsed time of each phase, and passes them
+    to sinks.
+
+    e.g.::
+
+        timer = Timer([sys.stderr.write])
+        with timer.phase('parse_args'):
+            ...
+        timer.emit(query='7 2014')
+
+    :param list sinks: callables which receive a record.
+    '''
+
+    enabled = True
+
+    def __init__(self, sinks):
+        self.sinks = sinks
+        self.phases = {}
+        self._start = time.time()
+
+    def phase(self, name):
+        '''
+        Return a context manager which records elapsed time as *name*.
+        Elapsed time of same name is accumulated.
+
+        :param str name: name of phase.
+        '''
+        return _Phase(self, name)
+
+    def emit(self, **kwargs):
+        '''
+        Pass a record to sinks, and reset phases. A sink which raises an
+        exception is reported and removed.
+
+        :param kwargs: additional values of record (e.g. query).
+        '''
+        now = time.time()
+        record = dict(kwargs, time=now, total=now - self._start,
+                      phases=self.phases)
+        for sink in list(self.sinks):
+            try:
+                sink(record)
+            except Exception as e:
+                self.sinks.remove(sink)
+                _report('timing sink is disabled: %s: %s'
+                        % (type(e).__name__, e))
+
+        self.phases = {}
+        self._start = time.time()
+
+
+def _stderr_sink(record):
+    import json
+    sys.stderr.write(json.dumps(record, sort_keys=True) + '\n')
+
+
+def _jsonl_sink(path):
+    def sink(record):
+        import json
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        with open(path, 'a') as f:
+            f.write(json.dumps(record, sort_keys=True) + '\n')
+    return sink
+
+
+def _to_sink(spec):
+    if callable(spec):
+        return spec
+    if spec == 'stderr':
+        return _stderr_sink
+    if spec == 'jsonl':
+        from alc.env import data_dir
+        return _jsonl_sink(os.path.join(data_dir(), 'timing.jsonl'))
+    if spec.startswith('jsonl:'):
+        return _jsonl_sink(spec[len('jsonl:'):])
+    raise ValueError('unknown timing sink: %r' % spec)
+
+
+def make_timer(spec=None):
+    '''
+    Return a timer for sinks.
+
+    :param spec:
+        a sink or list of sinks. If it is None, *ALC_TIMING* environment
+        variable is used.
+    :rtype: Timer
+    :return:
+        *Timer*, or *NullTimer* if timing is disabled. If a sink is
+        unknown, it is reported and *NullTimer* is returned.
+    '''
+    if spec is None:
+        spec = os.environ.get(ENVIRON_KEY)
+        if spec:
+            spec = spec.split(',')
+    if not spec:
+        return NullTimer()
+
+    if isinstance(spec, basestring) or callable(spec):
+        spec = [spec]
+    try:
+        return Timer([_to_sink(s) for s in spec])
+    except Exception as e:
+        _report('timing is disabled: %s' % e)
+        return NullTimer()
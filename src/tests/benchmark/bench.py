@@ -0,0 +1,239 @@
+# -*- coding:utf-8 -*-
+'''
+Benchmark of *alc*.
+
+usage::
+
+    $ cd ./src
+    $ python -m tests.benchmark.bench --output result.json
+    $ python -m tests.benchmark.bench --baseline result.json --threshold 0.2
+
+Each result is the best time per call in seconds of some repeats.
+With *--baseline*, results are compared with saved results, and exit
+status is 1 when any of them is slower than *threshold* (ratio).
+With *--import-budget*, exit status is 1 also when *import_time* is
+over the budget in seconds (e.g. 0.02).
+'''
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import timeit
+
+from datetime import datetime
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+
+CONFIG = {
+    'first_week_day': 6,
+    'default_datetime_format': '%Y/%m/%d (%a)\t%H:%M:%S',
+    'specified_datetime_format': '%Y/%m'
+}
+
+
+def _timeit(func, number, repeat):
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def bench_cold_start(repeat):
+    '''
+    Start a new interpreter and execute a query, as Alfred does.
+    '''
+    argv = [sys.executable, '-m', 'alc', '7', '2014']
+
+    def run():
+        subprocess.check_call(argv, cwd=SRC_DIR,
+                              stdout=open(os.devnull, 'w'))
+    return _timeit(run, 1, max(repeat, 5))
+
+
+_IMPORT_PROBE = '''
+import time
+t = time.time()
+import alc.__main__
+import alc.command
+print time.time() - t
+'''
+
+
+def bench_import_time(repeat):
+    '''
+    Import entry module and command in a new interpreter. It was about
+    3ms after heavy imports were deferred, and about 30ms before.
+    (*-X importtime* is not available in Python 2.7.)
+    '''
+    argv = [sys.executable, '-c', _IMPORT_PROBE]
+    return min(float(subprocess.check_output(argv, cwd=SRC_DIR))
+               for _ in xrange(max(repeat, 5)))
+
+
+def bench_execute(query, memo=False):
+    '''
+    Execute a query in warm process. Unless *memo* is True, the last
+    result is discarded before each call, so that rendering is measured.
+    '''
+    from alc.command import CalendarCommand
+
+    config = dict(CONFIG, query=query)
+    if memo:
+        return lambda: CalendarCommand(config).execute()
+
+    def run():
+        CalendarCommand.memo_clear()
+        CalendarCommand(config).execute()
+    return run
+
+
+def bench_weekdays(cached):
+    '''
+    Format rows of a month.
+    '''
+    from alc.formatter import CalendarFormatter
+
+    f = CalendarFormatter(datetime(2014, 7, 26))
+    if cached:
+        return lambda: list(f.weekdays())
+
+    def run():
+        CalendarFormatter.cache_clear()
+        list(f.weekdays())
+    return run
+
+
+def bench_serialize(items, attr):
+    '''
+    Serialize a script filter which has *items* items.
+    '''
+    from alc.script_filter import ScriptFilter
+
+    sf = ScriptFilter()
+    for i in xrange(items):
+        sf.append_item('%02d\t' % (i % 31 + 1) * 7)
+    return lambda: getattr(sf, attr)
+
+
+def bench_append(items):
+    '''
+    Append *items* items to a script filter.
+    '''
+    from alc.script_filter import ScriptFilter
+
+    def run():
+        sf = ScriptFilter()
+        for i in xrange(items):
+            sf.append_item('dummy')
+    return run
+
+
+def run(repeat=5, number=1000, cold_start=True):
+    '''
+    Run all benchmarks.
+
+    :param int repeat: number of repeats.
+    :param int number: number of calls in a repeat.
+    :param bool cold_start: If False, cold start is not measured.
+    :rtype: dict
+    :return: best time per call in seconds keyed by name of benchmark.
+    '''
+    results = {}
+    if cold_start:
+        results['cold_start'] = bench_cold_start(repeat)
+        results['import_time'] = bench_import_time(repeat)
+
+    for name, query in [('default', ''), ('specific', '7 2014'),
+                        ('year', '2014'), ('error', '13 2014'),
+                        ('expression', '2014-07-26 +30d')]:
+        results['execute_%s' % name] = \
+            _timeit(bench_execute(query), number, repeat)
+    for name, query in [('specific', '7 2014'), ('error', '13 2014')]:
+        results['execute_%s_memo' % name] = \
+            _timeit(bench_execute(query, True), number, repeat)
+
+    results['weekdays_cached'] = _timeit(bench_weekdays(True),
+                                         number, repeat)
+    results['weekdays_uncached'] = _timeit(bench_weekdays(False),
+                                           number, repeat)
+
+    for items in [10, 100, 1000]:
+        n = max(number * 10 // items, 1)
+        results['xml_s_%d' % items] = \
+            _timeit(bench_serialize(items, 'xml_s'), n, repeat)
+        results['json_s_%d' % items] = \
+            _timeit(bench_serialize(items, 'json_s'), n, repeat)
+        results['append_%d' % items] = \
+            _timeit(bench_append(items), n, repeat)
+
+    return results
+
+
+def compare(results, baseline, threshold):
+    '''
+    Compare results with baseline.
+
+    :param dict results: current results.
+    :param dict baseline: saved results.
+    :param float threshold:
+        allowed ratio of slowdown (e.g. 0.2 allows 20% slower).
+    :rtype: list
+    :return: tuples of (name, baseline, current, ratio) of regressions.
+    '''
+    regressions = []
+    for name in sorted(set(results) & set(baseline)):
+        ratio = results[name] / baseline[name]
+        if ratio > 1 + threshold:
+            regressions.append((name, baseline[name], results[name], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='tests.benchmark.bench')
+    parser.add_argument('--output', help='write results as JSON')
+    parser.add_argument('--baseline', help='compare with saved JSON')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='allowed ratio of slowdown (default: 0.2)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--number', type=int, default=1000)
+    parser.add_argument('--no-cold-start', action='store_true')
+    parser.add_argument('--import-budget', type=float,
+                        help='allowed seconds of import_time')
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat, args.number, not args.no_cold_start)
+    document = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+    else:
+        print json.dumps(document, indent=2, sort_keys=True)
+
+    status = 0
+    if (args.import_budget is not None and 'import_time' in results and
+            results['import_time'] > args.import_budget):
+        sys.stderr.write('import_time: %.3gs is over budget %.3gs\n'
+                         % (results['import_time'], args.import_budget))
+        status = 1
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for name, before, after, ratio in regressions:
+            sys.stderr.write('%s: %.3gs -> %.3gs (x%.2f)\n'
+                             % (name, before, after, ratio))
+        if regressions:
+            status = 1
+
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,14 @@
 # -*- coding: utf-8 -*-
 
 import calendar
+import os
+import tempfile
+import threading
+import xml.etree.ElementTree as etree
 
+from alc import client
 from alc.command import CalendarCommand
+from alc.server import CalendarServer
 from freezegun import freeze_time
 
 
@@ -185,3 +191,84 @@ def test_query_is_invalid():
     actual = CalendarCommand(config).execute()
 
     assert expect == actual
+
+
+def test_query_is_year():
+    '''
+    Integration scenario when have been put only year in Aflred's prompt.
+    '''
+    config = {
+        'query': '2013',
+        'first_week_day': calendar.SUNDAY,
+        'default_datetime_format': '%Y/%m/%d (%a)\t%H:%M:%S',
+        'specified_datetime_format': '%Y/%m'
+    }
+    actual = CalendarCommand(config).execute()
+
+    titles = [t.text for t in etree.fromstring(actual).iter('title')]
+    months = [t for t in titles if '/' in t]
+
+    assert ['2013/%02d' % m for m in range(1, 13)] == months
+    assert titles[-1] == '29\t30\t31\t\t\t\t\t'
+
+
+def test_query_include_span():
+    '''
+    Integration scenario when have been put month, year and span
+    in Aflred's prompt.
+    '''
+    config = {
+        'query': '1 2013 +1',
+        'first_week_day': calendar.SUNDAY,
+        'default_datetime_format': '%Y/%m/%d (%a)\t%H:%M:%S',
+        'specified_datetime_format': '%Y/%m'
+    }
+    actual = CalendarCommand(config).execute()
+    one_month = CalendarCommand(dict(config, query='1 2013')).execute()
+
+    assert actual.startswith(one_month[:-len('</items>')])
+    assert '<title>2013/02</title>' in actual
+
+
+def test_output_format_is_json():
+    '''
+    Integration scenario when output format is JSON.
+    '''
+    config = {
+        'query': '13 2013',
+        'output_format': 'json'
+    }
+    expect = '{"items":[' + \
+             '{"uid":"0","valid":false,"autocomplete":"",' + \
+             '"title":"usage: alc [month (1-12)] [year (1900-9999)]"}' + \
+             ']}'
+
+    actual = CalendarCommand(config).execute()
+
+    assert expect == actual
+
+
+def test_server():
+    '''
+    Integration scenario when the query is answered by *alc* server.
+    '''
+    path = os.path.join(tempfile.mkdtemp(), 'alc.sock')
+    server = CalendarServer(path)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+
+    config = {
+        'query': '1 2013',
+        'first_week_day': calendar.SUNDAY,
+        'default_datetime_format': '%Y/%m/%d (%a)\t%H:%M:%S',
+        'specified_datetime_format': '%Y/%m'
+    }
+    try:
+        expect = CalendarCommand(config).execute()
+        actual = client.request(config, path)
+    finally:
+        server.shutdown()
+        thread.join()
+        server.server_close()
+
+    assert expect == actual
@@ -0,0 +1,152 @@
+# -*- coding:utf-8 -*-
+
+import os
+import shutil
+import tempfile
+
+from mock import patch
+from datetime import date
+from alc.agenda import EventIndex, parse_ics, stamp
+
+ICS = '''BEGIN:VCALENDAR
+VERSION:2.0
+BEGIN:VEVENT
+DTSTART;VALUE=DATE:20140724
+DTEND;VALUE=DATE:20140727
+SUMMARY:Trip
+END:VEVENT
+BEGIN:VEVENT
+DTSTART;TZID="Asia/Tokyo":20140701T100000
+DTEND;TZID="Asia/Tokyo":20140701T110000
+SUMMARY:Meeting\\, weekly
+ (room A)
+END:VEVENT
+BEGIN:VEVENT
+DTSTART:20140731T220000Z
+DTEND:20140802T000000Z
+SUMMARY:Night
+END:VEVENT
+BEGIN:VEVENT
+DTSTART:invalid
+SUMMARY:Broken
+END:VEVENT
+END:VCALENDAR
+'''
+
+
+def _ordinals(*dates):
+    return tuple(d.toordinal() for d in dates)
+
+
+def test_parse_ics():
+    '''
+    Unit test for *parse_ics()*.
+
+    :type: normal
+    :case: parse events of date, datetime and invalid date.
+    :expect: events of valid date. End is exclusive.
+    '''
+    actual = list(parse_ics(ICS.replace('\n', '\r\n').splitlines(True)))
+
+    assert [
+        _ordinals(date(2014, 7, 24), date(2014, 7, 27)) + ('Trip',),
+        _ordinals(date(2014, 7, 1), date(2014, 7, 2)) +
+        ('Meeting, weekly(room A)',),
+        _ordinals(date(2014, 7, 31), date(2014, 8, 2)) + ('Night',)
+    ] == actual
+
+
+def test_parse_ics_non_ascii():
+    '''
+    Unit test for *parse_ics()* of non-ASCII summary.
+
+    :type: normal
+    :case: summary is UTF-8, and another summary has invalid byte.
+    :expect: summaries are decoded to unicode.
+    '''
+    actual = list(parse_ics(['BEGIN:VEVENT', 'DTSTART:20140724',
+                             'SUMMARY:R\xc3\xa9union '
+                             '\xe4\xbc\x9a\xe8\xad\xb0',
+                             'END:VEVENT', 'BEGIN:VEVENT',
+                             'DTSTART:20140725', 'SUMMARY:\xff',
+                             'END:VEVENT']))
+
+    assert [u'R\xe9union \u4f1a\u8b70', u'\ufffd'] == \
+        [summary for _, _, summary in actual]
+    assert all(isinstance(summary, unicode) for _, _, summary in actual)
+
+
+class TestEventIndex:
+    '''
+    Unit test for *EventIndex*.
+    '''
+
+    def setup(self):
+        self.directory = tempfile.mkdtemp()
+        self.ics = os.path.join(self.directory, 'calendar.ics')
+        with open(self.ics, 'w') as f:
+            f.write(ICS)
+        self.index = EventIndex(os.path.join(self.directory, 'index.sqlite'))
+
+    def teardown(self):
+        self.index.close()
+        shutil.rmtree(self.directory)
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: update index and read a month.
+        :expect: events which overlap the month, sorted by start.
+        '''
+        assert [self.ics] == self.index.update([self.ics])
+
+        assert [(date(2014, 7, 1), date(2014, 7, 1),
+                 'Meeting, weekly(room A)'),
+                (date(2014, 7, 24), date(2014, 7, 26), 'Trip'),
+                (date(2014, 7, 31), date(2014, 8, 1), 'Night')] == \
+            self.index.events(2014, 7)
+        assert [(date(2014, 7, 31), date(2014, 8, 1), 'Night')] == \
+            self.index.events(2014, 8)
+        assert set([1, 24, 25, 26, 31]) == self.index.busy_days(2014, 7)
+        assert set([1]) == self.index.busy_days(2014, 8)
+
+    @patch('alc.agenda.parse_ics', return_value=iter([]))
+    def test_file_is_not_changed(self, m_parse_ics):
+        '''
+        :type: normal
+        :case: update index twice without changing file.
+        :expect: file is not parsed again.
+        '''
+        self.index.update([self.ics])
+
+        assert [] == self.index.update([self.ics])
+        assert 1 == m_parse_ics.call_count
+
+    def test_file_is_changed(self):
+        '''
+        :type: normal
+        :case: file is changed or removed after update.
+        :expect: index is rebuilt.
+        '''
+        self.index.update([self.ics])
+        with open(self.ics, 'a') as f:
+            f.write('BEGIN:VEVENT\nDTSTART:20140702\nSUMMARY:New\n'
+                    'END:VEVENT\n')
+
+        assert [self.ics] == self.index.update([self.ics])
+        assert set([1, 2, 24, 25, 26, 31]) == self.index.busy_days(2014, 7)
+
+        assert [] == self.index.update([])
+        assert [] == self.index.events(2014, 7)
+
+    def test_file_is_missing(self):
+        '''
+        :type: error
+        :case: file does not exist.
+        :expect: no event.
+        '''
+        missing = os.path.join(self.directory, 'missing.ics')
+
+        assert [] == self.index.update([missing])
+        assert ((missing,),) == stamp([missing])
+        assert [] == self.index.events(2014, 7)
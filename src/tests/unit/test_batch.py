@@ -0,0 +1,169 @@
+# -*- coding:utf-8 -*-
+
+from mock import patch
+from StringIO import StringIO
+from alc.batch import BatchRunner, run, run_parallel, CHUNKS_PER_JOB
+from alc.command import CalendarCommand
+
+
+class TestBatchRunner:
+    '''
+    Unit test for *BatchRunner*.
+    '''
+
+    def test_query(self):
+        '''
+        :type: normal
+        :case: execute a line of query.
+        :expect: return same output as *CalendarCommand* in a line.
+        '''
+        runner = BatchRunner({'first_week_day': 6})
+        expect = CalendarCommand({'query': '7 2014',
+                                  'first_week_day': 6}).execute()
+
+        assert expect.replace('\n', '&#10;') == runner.execute('7 2014')
+
+    def test_request(self):
+        '''
+        :type: normal
+        :case: execute a line of JSON request.
+        :expect: config of request overrides default config.
+        '''
+        runner = BatchRunner({'first_week_day': 6})
+        expect = CalendarCommand({'query': '7 2014', 'first_week_day': 6,
+                                  'output_format': 'json'}).execute()
+
+        actual = runner.execute('{"query": "7 2014", '
+                                '"config": {"output_format": "json"}}')
+
+        assert expect == actual
+
+    def test_request_is_invalid(self):
+        '''
+        :type: error
+        :case: execute a line of invalid JSON.
+        :expect: return usage.
+        '''
+        actual = BatchRunner().execute('{invalid')
+
+        assert 'usage: alc' in actual
+
+    def test_record_is_invalid(self):
+        '''
+        :type: error
+        :case: run lines which have records of invalid types.
+        :expect: each of them is usage, and following lines are executed.
+        '''
+        lines = ['{"config": [1]}\n', '{"query": 5}\n', '7 2014\n']
+        output = StringIO()
+        runner = BatchRunner({'cache_path': '/nonexistent/cache.sqlite'})
+
+        assert 3 == runner.run(lines, output.write)
+        actual = output.getvalue().splitlines()
+        assert all('usage: alc' in l for l in actual[:2])
+        assert '2014/07' in actual[2]
+
+    @patch('alc.command.CalendarCommand.execute',
+           side_effect=[AttributeError('broken'), 'dummy'])
+    def test_command_raises(self, m_execute):
+        '''
+        :type: error
+        :case: command raises an exception for a line.
+        :expect: the line is usage, and the next line is executed.
+        '''
+        runner = BatchRunner()
+
+        assert 'usage: alc' in runner.execute('7 2014')
+        assert 'dummy' == runner.execute('8 2014')
+
+    def test_command_is_reused(self):
+        '''
+        :type: normal
+        :case: execute lines of same config.
+        :expect: a command is created once per config.
+        '''
+        runner = BatchRunner()
+        with patch.object(runner, '_command_class') as m_class:
+            m_class.return_value.execute.return_value = 'dummy'
+            runner.execute('{"query": "7", "config": {"first_week_day": 6}}')
+            runner.execute('{"query": "8", "config": {"first_week_day": 6}}')
+            runner.execute('{"query": "8", "config": {"first_week_day": 0}}')
+
+        assert 2 == m_class.call_count
+
+    def test_output_has_newline(self):
+        '''
+        :type: normal
+        :case: output of a command includes newline.
+        :expect: newline is escaped.
+        '''
+        runner = BatchRunner()
+        with patch.object(runner._default, 'execute',
+                          return_value='<items>\n<item />\n</items>'):
+            actual = runner.execute('7 2014')
+
+        assert '<items>&#10;<item />&#10;</items>' == actual
+
+
+def test_run():
+    '''
+    Unit test for *run()*.
+
+    :type: normal
+    :case: call this function with lines of query.
+    :expect: a line of output per a line of input.
+    '''
+    stdout = StringIO()
+    count = run(StringIO('7 2014\n13 2014\n\n2014 +1\n'), stdout)
+    lines = stdout.getvalue().split('\n')
+
+    assert 4 == count
+    assert ['', ] == lines[4:]
+    assert 'usage: alc' in lines[1]
+    assert all(l.startswith('<items>') for l in lines[:4])
+
+
+class TestRunParallel:
+    '''
+    Unit test for *run_parallel()*.
+    '''
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: call this function with lines of query.
+        :expect: same output as sequential execution in input order.
+        '''
+        lines = ['%d %d\n' % (m, 2000 + m) for m in range(14)] * 3
+        expect = StringIO()
+        run(StringIO(''.join(lines)), expect)
+
+        actual = StringIO()
+        count = run_parallel(lines, actual.write, jobs=2, chunksize=4)
+
+        assert len(lines) == count
+        assert expect.getvalue() == actual.getvalue()
+
+    def test_in_flight_is_bounded(self):
+        '''
+        :type: normal
+        :case: call this function with many lines.
+        :expect: lines are not read far ahead of written output.
+        '''
+        jobs, chunksize = 2, 3
+        state = {'read': 0, 'written': 0, 'ahead': 0}
+
+        def lines():
+            for i in xrange(100):
+                state['read'] += 1
+                yield '7 2014\n'
+
+        def write(output):
+            state['written'] += output.count('\n')
+            state['ahead'] = max(state['ahead'],
+                                 state['read'] - state['written'])
+
+        count = run_parallel(lines(), write, jobs=jobs, chunksize=chunksize)
+
+        assert 100 == count == state['written']
+        assert state['ahead'] <= chunksize * (jobs * CHUNKS_PER_JOB + 1)
@@ -0,0 +1,93 @@
+# -*- coding:utf-8 -*-
+
+import calendar
+
+from mock import patch
+from nose.plugins.skip import SkipTest
+from nose.tools import raises
+from alc import bulk
+
+YEARS = [y for y in range(1999, 2002) for m in range(1, 13)] + [1, 9999]
+MONTHS = [m for y in range(1999, 2002) for m in range(1, 13)] + [1, 12]
+
+
+def _expect(firstweekday):
+    cal = calendar.Calendar(firstweekday)
+    return [cal.monthdayscalendar(y, m) for y, m in zip(YEARS, MONTHS)]
+
+
+class TestMonthcalendars:
+    '''
+    Unit test for *bulk.monthcalendars()*.
+    '''
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: call this function for every first week day.
+        :expect: same as *calendar.monthcalendar*.
+        '''
+        if bulk.numpy is None:
+            raise SkipTest('numpy is not installed')
+
+        for firstweekday in range(7):
+            assert _expect(firstweekday) == \
+                bulk.monthcalendars(YEARS, MONTHS, firstweekday)
+
+    @patch('alc.bulk.numpy', None)
+    def test_numpy_is_not_installed(self):
+        '''
+        :type: normal
+        :case: *NumPy* is not installed.
+        :expect: same as *calendar.monthcalendar*.
+        '''
+        for firstweekday in range(7):
+            assert _expect(firstweekday) == \
+                bulk.monthcalendars(YEARS, MONTHS, firstweekday)
+
+    def test_args_are_invalid(self):
+        '''
+        :type: error
+        :case: year or month is out of range, or lengths are different.
+        :expect: raise ValueError.
+        '''
+        @raises(ValueError)
+        def execute(years, months):
+            bulk.monthcalendars(years, months)
+
+        for numpy in set([bulk.numpy, None]):
+            with patch('alc.bulk.numpy', numpy):
+                execute([2014], [13])
+                execute([10000], [1])
+                execute([2014, 2015], [1])
+
+
+class TestMonthgrids:
+    '''
+    Unit test for *bulk.monthgrids()*.
+    '''
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: call this function.
+        :expect: return matrices which have 6 weeks and number of weeks.
+        '''
+        if bulk.numpy is None:
+            raise SkipTest('numpy is not installed')
+
+        grids, weeks = bulk.monthgrids([2010, 2014], [2, 7])
+
+        assert (2, 6, 7) == grids.shape
+        assert [4, 5] == weeks.tolist()
+        assert [0] * 7 == grids[0][4].tolist()
+
+    @raises(ImportError)
+    @patch('alc.bulk.numpy', None)
+    def test_numpy_is_not_installed(self):
+        '''
+        :type: error
+        :case: *NumPy* is not installed.
+        :expect: raise ImportError.
+        '''
+        bulk.monthgrids([2015], [2])
@@ -0,0 +1,136 @@
+# -*- coding:utf-8 -*-
+
+import os
+import shutil
+import tempfile
+
+from alc.cache import LRUCache, RenderCache
+
+
+class TestLRUCache:
+    '''
+    Unit test for *LRUCache*.
+    '''
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: set a value and get it.
+        :expect: return the value and count a hit.
+        '''
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1)
+
+        assert 1 == cache.get('a')
+        assert {'hits': 1, 'misses': 0,
+                'maxsize': 2, 'currsize': 1} == cache.info()
+
+    def test_key_is_not_cached(self):
+        '''
+        :type: normal
+        :case: get a value which is not cached.
+        :expect: return default and count a miss.
+        '''
+        cache = LRUCache(maxsize=2)
+
+        assert cache.get('a') is None
+        assert 'default' == cache.get('a', 'default')
+        assert 2 == cache.info()['misses']
+
+    def test_cache_is_full(self):
+        '''
+        :type: normal
+        :case: set values over maxsize.
+        :expect: least recently used item is discarded.
+        '''
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        assert 'a' in cache
+        assert 'b' not in cache
+        assert 'c' in cache
+        assert 2 == len(cache)
+
+    def test_clear(self):
+        '''
+        :type: normal
+        :case: call *clear*.
+        :expect: items and counters are reset.
+        '''
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1)
+        cache.get('a')
+        cache.clear()
+
+        assert {'hits': 0, 'misses': 0,
+                'maxsize': 2, 'currsize': 0} == cache.info()
+
+
+class TestRenderCache:
+    '''
+    Unit test for *RenderCache*.
+    '''
+
+    def setup(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'data', 'cache.sqlite')
+
+    def teardown(self):
+        shutil.rmtree(self.directory)
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: set a value and get it from another instance.
+        :expect: return the value.
+        '''
+        cache = RenderCache(self.path)
+        cache.set('key', '<items />')
+        cache.close()
+
+        cache = RenderCache(self.path)
+        assert '<items />' == cache.get('key')
+        assert cache.get('other') is None
+
+    def test_total_size_exceeds_max_bytes(self):
+        '''
+        :type: normal
+        :case: total size of values exceeds *max_bytes*.
+        :expect: least recently used value is discarded.
+        '''
+        cache = RenderCache(self.path, max_bytes=10)
+        cache.set('a', '12345')
+        cache.set('b', '12345')
+        cache.get('a')
+        cache.set('c', '12345')
+
+        assert '12345' == cache.get('a')
+        assert cache.get('b') is None
+        assert '12345' == cache.get('c')
+
+    def test_version_is_changed(self):
+        '''
+        :type: normal
+        :case: open the cache with another version.
+        :expect: all values are discarded.
+        '''
+        cache = RenderCache(self.path, version='0.1.0')
+        cache.set('key', '<items />')
+        cache.close()
+
+        cache = RenderCache(self.path, version='0.2.0')
+        assert cache.get('key') is None
+
+    def test_path_is_invalid(self):
+        '''
+        :type: error
+        :case: cache file can not be opened.
+        :expect: cache is disabled without raising.
+        '''
+        cache = RenderCache(self.directory)
+        cache.set('key', '<items />')
+
+        assert cache.get('key') is None
@@ -0,0 +1,98 @@
+# -*- coding:utf-8 -*-
+
+import socket
+
+from mock import patch
+from nose.tools import raises
+from StringIO import StringIO
+from alc.client import execute, main, request, ServerError
+
+
+class TestRequest:
+    '''
+    Unit test for *request()*.
+    '''
+
+    @patch('socket.socket')
+    def test_default(self, m_socket):
+        '''
+        :type: normal
+        :case: server returns output.
+        :expect: return output as string.
+        '''
+        m_sock = m_socket.return_value
+        m_sock.makefile.return_value.readline.return_value = \
+            '{"output": "<items />"}\n'
+
+        actual = request({'query': ''}, '/tmp/dummy.sock')
+
+        m_sock.connect.assert_called_once_with('/tmp/dummy.sock')
+        m_sock.sendall.assert_called_once_with('{"config": {"query": ""}}\n')
+        m_sock.close.assert_called_once_with()
+        assert '<items />' == actual
+        assert isinstance(actual, str)
+
+    @raises(ServerError)
+    @patch('socket.socket')
+    def test_server_returns_error(self, m_socket):
+        '''
+        :type: error
+        :case: server returns error.
+        :expect: raise ServerError.
+        '''
+        m_sock = m_socket.return_value
+        m_sock.makefile.return_value.readline.return_value = \
+            '{"error": "dummy"}\n'
+
+        request({'query': ''}, '/tmp/dummy.sock')
+
+
+class TestExecute:
+    '''
+    Unit test for *execute()*.
+    '''
+
+    @patch('alc.client.request', return_value='dummy')
+    def test_default(self, m_request):
+        '''
+        :type: normal
+        :case: server is running.
+        :expect: return output of server.
+        '''
+        actual = execute({'query': ''})
+
+        m_request.assert_called_once_with({'query': ''}, None)
+        assert 'dummy' == actual
+
+    @patch('alc.command.CalendarCommand.execute', return_value='local')
+    @patch('alc.client.request', side_effect=socket.error())
+    def test_server_is_not_running(self, m_request, m_execute):
+        '''
+        :type: normal
+        :case: server is not running.
+        :expect: execute command in this process.
+        '''
+        actual = execute({'query': ''})
+
+        m_execute.assert_called_once_with()
+        assert 'local' == actual
+
+
+class TestMain:
+    '''
+    Unit test for *main()*.
+    '''
+
+    @patch('sys.stdout', new_callable=StringIO)
+    @patch('alc.client.execute', return_value='dummy')
+    def test_default(self, m_execute, m_stdout):
+        '''
+        :type: normal
+        :case: call this function with query and config.
+        :expect: query and config are forwarded.
+        '''
+        main(['--first_week_day=6', '7', '2014'])
+
+        m_execute.assert_called_once_with({'query': '7 2014',
+                                           'first_week_day': 6})
+        assert 'dummy\n' == m_stdout.getvalue()
@@ -1,11 +1,18 @@
 # -*- coding:utf-8 -*-
 
 import calendar
+import os
+import shutil
+import tempfile
 
 from nose.tools import raises
 from mock import patch, call
-from alc.command import CalendarCommand, ThrowingArgumentParser
+from alc.argparser import ThrowingArgumentParser
+from alc.command import CalendarCommand
+from alc.script_filter import ScriptFilter
+from datetime import date, datetime
 from freezegun import freeze_time
+from StringIO import StringIO
 
 
 class Test__Init__():
@@ -65,12 +72,27 @@ class Test__Init__():
         assert cmd._specified_datetime_format == '%Y/%m'
 
 
+def test_argument_parser_error():
+    '''
+    Unit test for re-export of *ArgumentParserError*.
+
+    :type: normal
+    :case: import *ArgumentParserError* from *alc.command*.
+    :expect: same class as *alc.query.ArgumentParserError*.
+    '''
+    from alc.command import ArgumentParserError
+    from alc.query import ArgumentParserError as expect
+
+    assert expect is ArgumentParserError
+
+
 class TestGetQueryParser():
     '''
     Unit test for *CalendarCommand.get_query_parser()*.
     '''
 
-    @patch('alc.command.ThrowingArgumentParser.add_argument')
+    @patch('alc.command.CalendarCommand._query_parser', None)
+    @patch('alc.query.QueryParser.add_argument')
     def test_default(self, m_add_argument):
         '''
         :type: normal
@@ -80,10 +102,19 @@ class TestGetQueryParser():
         cmd = CalendarCommand({})
         cmd.get_query_parser()
 
-        m_add_argument.assert_any_call('month', nargs='?',
-                                       type=int, choices=range(1, 13))
-        m_add_argument.assert_any_call('year', nargs='?',
-                                       type=int, choices=range(0, 10000))
+        m_add_argument.assert_any_call('month', 1, 12, skippable=True)
+        m_add_argument.assert_any_call('year', 0, 9999)
+        m_add_argument.assert_any_call('span', 0, 1199, prefix='+')
+
+    def test_parser_is_shared(self):
+        '''
+        :type: normal
+        :case: call this method of two instances.
+        :expect: same parser is returned.
+        '''
+        parser = CalendarCommand({}).get_query_parser()
+
+        assert parser is CalendarCommand({}).get_query_parser()
 
 
 class TestExecute():
@@ -112,6 +143,21 @@ class TestExecute():
 
         assert actual == expect
 
+    @patch('alc.command.CalendarCommand.take_action',
+           return_value='dummy')
+    def test_query_is_specified(self, m_take_action):
+        '''
+        :type: normal
+        :case: call this method with query.
+        :expect: query replaces query of config.
+        '''
+        cmd = CalendarCommand({'query': '1 2000'})
+        cmd.execute('7 2014')
+
+        m_take_action.assert_called_once_with(
+            {'month': 7, 'year': 2014, 'span': None})
+        assert '7 2014' == cmd._query
+
     @patch('alc.command.CalendarCommand.error_action',
            return_value='dummy')
     @patch('alc.command.CalendarCommand.get_query_parser',
@@ -144,12 +190,467 @@ class TestExecute():
         cmd = CalendarCommand({})
         cmd.execute()
 
+    @patch('alc.cache.RenderCache')
+    @patch('alc.command.CalendarCommand.get_query_parser')
+    def test_cache_hit(self, m_get_query_parser, m_RenderCache):
+        '''
+        :type: normal
+        :case: output of query is cached.
+        :expect: return cached output without parsing query.
+        '''
+        m_RenderCache.return_value.get.return_value = 'cached'
+        cmd = CalendarCommand({'query': '7 2014', 'cache_path': 'path'})
+        actual = cmd.execute()
+
+        m_RenderCache.assert_called_once_with('path', 1024 * 1024)
+        assert not m_get_query_parser.called
+        assert 'cached' == actual
+
+    @patch('alc.cache.RenderCache')
+    @patch('alc.command.CalendarCommand.take_action', return_value='dummy')
+    def test_cache_miss(self, m_take_action, m_RenderCache):
+        '''
+        :type: normal
+        :case: output of query is not cached.
+        :expect: output is stored in cache.
+        '''
+        m_RenderCache.return_value.get.return_value = None
+        cmd = CalendarCommand({'query': '7 2014', 'cache_path': 'path'})
+        actual = cmd.execute()
+
+        m_RenderCache.return_value.set.assert_called_once_with(
+            cmd.get_cache_key(), 'dummy')
+        assert 'dummy' == actual
+
+    @patch('alc.cache.RenderCache')
+    @patch('alc.command.CalendarCommand.error_action', return_value='dummy')
+    def test_cache_error(self, m_error_action, m_RenderCache):
+        '''
+        :type: error
+        :case: cacheable query is invalid. (month is 13)
+        :expect: output of *error_action* is not stored in cache.
+        '''
+        m_RenderCache.return_value.get.return_value = None
+        actual = CalendarCommand({'query': '13 2014',
+                                  'cache_path': 'path'}).execute()
+
+        assert not m_RenderCache.return_value.set.called
+        assert m_RenderCache.return_value.close.called
+        assert 'dummy' == actual
+
+    def test_query_has_double_space(self):
+        '''
+        :type: error
+        :case: execute '7  2014' and then '7 2014' with a cache file.
+        :expect: usage error of the former is not returned for the latter.
+        '''
+        CalendarCommand.memo_clear()
+        directory = tempfile.mkdtemp()
+        config = {'cache_path': os.path.join(directory, 'cache.sqlite')}
+        try:
+            error = CalendarCommand(dict(config, query='7  2014')).execute()
+            actual = CalendarCommand(dict(config, query='7 2014')).execute()
+        finally:
+            CalendarCommand.memo_clear()
+            shutil.rmtree(directory)
+
+        assert 'usage: alc' in error
+        assert '<title>2014/07</title>' in actual
+
+
+class TestTiming():
+    '''
+    Unit test for timing of *CalendarCommand.execute()*.
+    '''
+
+    def setup(self):
+        CalendarCommand.memo_clear()
+
+    def teardown(self):
+        CalendarCommand.memo_clear()
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: callable is specified as *timing*.
+        :expect: elapsed time of each phase is passed.
+        '''
+        records = []
+        CalendarCommand({'query': '7 2014', 'timing': records.append})\
+            .execute()
+
+        assert 1 == len(records)
+        assert set(['get_query_parser', 'split', 'parse_args', 'take_action',
+                    'format', 'script_filter', 'serialize']) <= \
+            set(records[0]['phases'])
+        assert '7 2014' == records[0]['query']
+
+    def test_timing_is_disabled(self):
+        '''
+        :type: normal
+        :case: *timing* is not specified.
+        :expect: nothing is recorded.
+        '''
+        with patch.dict('os.environ', {}, clear=True):
+            cmd = CalendarCommand({'query': '7 2014'})
+
+        assert not cmd._timer.enabled
+
+
+class TestGetCacheKey():
+    '''
+    Unit test for *CalendarCommand.get_cache_key()*.
+    '''
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: query names month and year.
+        :expect: same key is returned for same normalized query.
+        '''
+        cmd1 = CalendarCommand({'query': '7 2014', 'cache_path': 'path'})
+        cmd2 = CalendarCommand({'query': ' 07 2014 ', 'cache_path': 'path'})
+        cmd3 = CalendarCommand({'query': '7 2014', 'cache_path': 'path',
+                                'first_week_day': calendar.SUNDAY})
+        cmd4 = CalendarCommand({'query': '7 2014 +2', 'cache_path': 'path'})
+
+        assert cmd1.get_cache_key() is not None
+        assert cmd1.get_cache_key() == cmd2.get_cache_key()
+        assert cmd1.get_cache_key() != cmd3.get_cache_key()
+        assert cmd1.get_cache_key() != cmd4.get_cache_key()
+
+    def test_query_is_year(self):
+        '''
+        :type: normal
+        :case: query names only year.
+        :expect: return key.
+        '''
+        for query in ['2014', '2014 +2']:
+            cmd = CalendarCommand({'query': query, 'cache_path': 'path'})
+            assert cmd.get_cache_key() is not None
+
+    def test_locale_is_changed(self):
+        '''
+        :type: normal
+        :case: LC_TIME locale is changed.
+        :expect: key of each locale is different.
+        '''
+        cmd = CalendarCommand({'query': '7 2014', 'cache_path': 'path'})
+        key = cmd.get_cache_key()
+
+        with patch('_locale.setlocale', return_value='de_DE.UTF-8'):
+            assert key != cmd.get_cache_key()
+
+    def test_query_is_not_cacheable(self):
+        '''
+        :type: normal
+        :case: query depends on current datetime, or cache is disabled.
+        :expect: return None.
+        '''
+        for query in ['', '7', 'a 2014', '7 +2', '+2', '7 2014 +a',
+                      '7  2014']:
+            cmd = CalendarCommand({'query': query, 'cache_path': 'path'})
+            assert cmd.get_cache_key() is None
+
+        assert CalendarCommand({'query': '7 2014'}).get_cache_key() is None
+
+
+class TestTakeActionMultiMonth():
+    '''
+    Unit test for *CalendarCommand.take_action()* with multiple months.
+    '''
+
+    def setup(self):
+        CalendarCommand.memo_clear()
+
+    def teardown(self):
+        CalendarCommand.memo_clear()
+
+    @patch('alc.script_filter.ScriptFilter.xml_s')
+    @patch('alc.script_filter.ScriptFilter.append_item')
+    def test_default(self, m_append_item, m_xml_s):
+        '''
+        :type: normal
+        :case: span is specified.
+        :expect: blocks of months are stacked.
+        '''
+        cmd = CalendarCommand({})
+        cmd.take_action({'month': 2, 'year': 2015, 'span': 1})
+
+        expect_args_list = [call('2015/02'),
+                            call('Mo\tTu\tWe\tTh\tFr\tSa\tSu'),
+                            call('\t\t\t\t\t\t01\t'),
+                            call('02\t03\t04\t05\t06\t07\t08\t'),
+                            call('09\t10\t11\t12\t13\t14\t15\t'),
+                            call('16\t17\t18\t19\t20\t21\t22\t'),
+                            call('23\t24\t25\t26\t27\t28\t\t'),
+                            call('2015/03'),
+                            call('Mo\tTu\tWe\tTh\tFr\tSa\tSu'),
+                            call('\t\t\t\t\t\t01\t'),
+                            call('02\t03\t04\t05\t06\t07\t08\t'),
+                            call('09\t10\t11\t12\t13\t14\t15\t'),
+                            call('16\t17\t18\t19\t20\t21\t22\t'),
+                            call('23\t24\t25\t26\t27\t28\t29\t'),
+                            call('30\t31\t\t\t\t\t\t')]
+
+        assert expect_args_list == m_append_item.call_args_list
+
+    @patch('alc.script_filter.ScriptFilter.xml_s')
+    @patch('alc.script_filter.ScriptFilter.append_item')
+    def test_first_week_day_is_specified(self, m_append_item, m_xml_s):
+        '''
+        :type: normal
+        :case: first week day is Sunday.
+        :expect: global first week day of *calendar* is not changed.
+        '''
+        calendar.setfirstweekday(calendar.MONDAY)
+        cmd = CalendarCommand({'first_week_day': calendar.SUNDAY})
+        cmd.take_action({'month': 2, 'year': 2015, 'span': None})
+
+        assert call('Su\tMo\tTu\tWe\tTh\tFr\tSa') == \
+            m_append_item.call_args_list[1]
+        assert calendar.MONDAY == calendar.firstweekday()
+
+
+class TestTakeActionHighlight():
+    '''
+    Unit test for *CalendarCommand.take_action()* with *highlight_format*.
+    '''
+
+    def setup(self):
+        CalendarCommand.memo_clear()
+
+    def teardown(self):
+        CalendarCommand.memo_clear()
+
+    @freeze_time('2014-07-24 23:18:00')
+    def test_default(self):
+        '''
+        :type: normal
+        :case: *highlight_format* is specified.
+        :expect: today is highlighted in the month of today only.
+        '''
+        cmd = CalendarCommand({'highlight_format': '[%02d]'})
+        actual = cmd.take_action({'month': 7, 'year': 2014, 'span': 1})
+
+        assert '<title>21\t22\t23\t[24]\t25\t26\t27\t</title>' in actual
+        assert actual.count('[') == 1
+
+    def test_highlight_format_is_not_specified(self):
+        '''
+        :type: normal
+        :case: *highlight_format* is not specified.
+        :expect: today is not highlighted.
+        '''
+        actual = CalendarCommand({}).take_action({})
+
+        assert '[' not in actual
+
+    def test_cache_key(self):
+        '''
+        :type: normal
+        :case: *highlight_format* is specified.
+        :expect: key of cache differs from day to day.
+        '''
+        config = {'query': '7 2014', 'cache_path': 'dummy',
+                  'highlight_format': '[%02d]'}
+        with freeze_time('2014-07-24'):
+            first = CalendarCommand(config).get_cache_key()
+        with freeze_time('2014-07-25'):
+            second = CalendarCommand(config).get_cache_key()
+
+        assert first != second
+
+
+class TestTakeActionAgenda():
+    '''
+    Unit test for *CalendarCommand.take_action()* with *ics_paths*.
+    '''
+
+    def setup(self):
+        CalendarCommand.memo_clear()
+        self.directory = tempfile.mkdtemp()
+        self.ics = os.path.join(self.directory, 'calendar.ics')
+        with open(self.ics, 'w') as f:
+            f.write('BEGIN:VCALENDAR\nBEGIN:VEVENT\n'
+                    'DTSTART;VALUE=DATE:20140724\n'
+                    'DTEND;VALUE=DATE:20140726\n'
+                    'SUMMARY:Trip\nEND:VEVENT\nEND:VCALENDAR\n')
+        self.config = {
+            'ics_paths': self.ics,
+            'ics_index_path': os.path.join(self.directory, 'index.sqlite')
+        }
+
+    def teardown(self):
+        CalendarCommand.memo_clear()
+        shutil.rmtree(self.directory)
+
+    @patch('alc.script_filter.ScriptFilter.xml_s')
+    @patch('alc.script_filter.ScriptFilter.append_item')
+    def test_default(self, m_append_item, m_xml_s):
+        '''
+        :type: normal
+        :case: *ics_paths* is specified.
+        :expect: busy days are marked, and events follow the month.
+        '''
+        cmd = CalendarCommand(self.config)
+        cmd.take_action({'month': 7, 'year': 2014, 'span': None})
+
+        expect_args_list = [call('2014/07'),
+                            call('Mo\tTu\tWe\tTh\tFr\tSa\tSu'),
+                            call('\t01\t02\t03\t04\t05\t06\t'),
+                            call('07\t08\t09\t10\t11\t12\t13\t'),
+                            call('14\t15\t16\t17\t18\t19\t20\t'),
+                            call('21\t22\t23\t24*\t25*\t26\t27\t'),
+                            call('28\t29\t30\t31\t\t\t\t'),
+                            call('07/24-07/25\tTrip')]
+
+        assert expect_args_list == m_append_item.call_args_list
+
+    def test_summary_is_not_ascii(self):
+        '''
+        :type: normal
+        :case: summary of an event is not ASCII, and output is XML.
+        :expect: characters are escaped as character references.
+        '''
+        with open(self.ics, 'w') as f:
+            f.write('BEGIN:VEVENT\nDTSTART:20140724\n'
+                    'SUMMARY:R\xc3\xa9union \xe4\xbc\x9a\xe8\xad\xb0\n'
+                    'END:VEVENT\n')
+        actual = CalendarCommand(dict(self.config, query='7 2014')).execute()
+
+        assert '<title>07/24\tR&#233;union &#20250;&#35696;</title>' \
+            in actual
+
+    def test_file_is_changed(self):
+        '''
+        :type: normal
+        :case: iCalendar file is changed between queries.
+        :expect: last result and cache key are not reused.
+        '''
+        config = dict(self.config, query='7 2014', cache_path='dummy')
+        first_key = CalendarCommand(config).get_cache_key()
+        first = CalendarCommand(config).take_action(
+            {'month': 7, 'year': 2014})
+        with open(self.ics, 'a') as f:
+            f.write('BEGIN:VEVENT\nDTSTART:20140701\nSUMMARY:New\n'
+                    'END:VEVENT\n')
+        second_key = CalendarCommand(config).get_cache_key()
+        second = CalendarCommand(config).take_action(
+            {'month': 7, 'year': 2014})
+
+        assert first_key != second_key
+        assert 'New' not in first
+        assert '07/01\tNew' in second
+
+    def test_format_event(self):
+        '''
+        :type: normal
+        :case: format events of a day and days, without summary.
+        :expect: title of item.
+        '''
+        cmd = CalendarCommand({})
+
+        assert '07/24\tMeeting' == cmd.format_event(
+            date(2014, 7, 24), date(2014, 7, 24), 'Meeting')
+        assert '07/24-08/01' == cmd.format_event(
+            date(2014, 7, 24), date(2014, 8, 1), '')
+
+
+class TestTakeActionHoliday():
+    '''
+    Unit test for *CalendarCommand.take_action()* with *holidays_path*.
+    '''
+
+    def setup(self):
+        CalendarCommand.memo_clear()
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'holidays.json')
+        with open(self.path, 'w') as f:
+            f.write('[{"name": "Marine Day", "month": 7, "weekday": 0, '
+                    '"nth": 3}]')
+
+    def teardown(self):
+        CalendarCommand.memo_clear()
+        shutil.rmtree(self.directory)
+
+    @patch('alc.script_filter.ScriptFilter.xml_s')
+    @patch('alc.script_filter.ScriptFilter.append_item')
+    def test_default(self, m_append_item, m_xml_s):
+        '''
+        :type: normal
+        :case: *holidays_path* is specified.
+        :expect: holidays are marked, and business days are in title.
+        '''
+        with patch.dict('os.environ',
+                        {'alfred_workflow_data': self.directory}):
+            cmd = CalendarCommand({'holidays_path': self.path})
+            cmd.take_action({'month': 7, 'year': 2014, 'span': None})
+
+        assert call('2014/07\t(22 business days)') == \
+            m_append_item.call_args_list[0]
+        assert call('(21)\t22\t23\t24\t25\t26\t27\t') == \
+            m_append_item.call_args_list[5]
+        assert os.path.exists(os.path.join(self.directory,
+                                           'holidays.cache'))
+
+    def test_file_is_missing(self):
+        '''
+        :type: error
+        :case: rule file does not exist.
+        :expect: calendar is shown without holidays.
+        '''
+        config = {'query': '7 2014',
+                  'holidays_path': os.path.join(self.directory, 'missing')}
+        actual = CalendarCommand(config).execute()
+        CalendarCommand.memo_clear()
+
+        assert CalendarCommand({'query': '7 2014'}).execute() == actual
+
+    def test_file_is_invalid(self):
+        '''
+        :type: error
+        :case: rule file is not JSON array.
+        :expect: calendar is shown without holidays.
+        '''
+        with open(self.path, 'w') as f:
+            f.write('{}')
+        with patch.dict('os.environ',
+                        {'alfred_workflow_data': self.directory}):
+            actual = CalendarCommand({'query': '7 2014 +6',
+                                      'holidays_path': self.path}).execute()
+
+        assert 'usage: alc' not in actual
+        assert 'business days' not in actual
+
+    def test_value_is_invalid(self):
+        '''
+        :type: error
+        :case: rule has a value of wrong type.
+        :expect: calendar is shown without holidays.
+        '''
+        with open(self.path, 'w') as f:
+            f.write('[{"month": null, "day": 1}]')
+        with patch.dict('os.environ',
+                        {'alfred_workflow_data': self.directory}):
+            actual = CalendarCommand({'query': '7 2014',
+                                      'holidays_path': self.path}).execute()
+
+        assert 'usage: alc' not in actual
+        assert 'business days' not in actual
+
 
 class TestTakeAction():
     '''
     Unit test for *CalendarCommand.take_action()*.
     '''
 
+    def setup(self):
+        CalendarCommand.memo_clear()
+
+    def teardown(self):
+        CalendarCommand.memo_clear()
+
     @patch('alc.script_filter.ScriptFilter.xml_s')
     @patch('alc.script_filter.ScriptFilter.append_item')
     @freeze_time('2014-07-24 23:18:00')
@@ -220,11 +721,279 @@ class TestTakeAction():
         assert m_xml_s == actual
 
 
+class TestSerialize():
+    '''
+    Unit test for *CalendarCommand.serialize()*.
+    '''
+
+    @patch('alc.script_filter.ScriptFilter.json_s')
+    @patch('alc.script_filter.ScriptFilter.xml_s')
+    def test_default(self, m_xml_s, m_json_s):
+        '''
+        :type: normal
+        :case: *output_format* is not specified.
+        :expect: return *Script Filter XML*.
+        '''
+        assert m_xml_s == CalendarCommand({}).serialize(ScriptFilter())
+
+    @patch('alc.script_filter.ScriptFilter.json_s')
+    @patch('alc.script_filter.ScriptFilter.xml_s')
+    def test_output_format_is_json(self, m_xml_s, m_json_s):
+        '''
+        :type: normal
+        :case: *output_format* is 'json'.
+        :expect: return *Script Filter JSON*.
+        '''
+        cmd = CalendarCommand({'output_format': 'json'})
+
+        assert m_json_s == cmd.serialize(ScriptFilter())
+
+
+class TestExpressionAction():
+    '''
+    Unit test for *CalendarCommand.expression_action()*.
+    '''
+
+    @freeze_time('2014-07-26 23:18:00')
+    def test_default(self):
+        '''
+        :type: normal
+        :case: execute date expression.
+        :expect: a valid item of the date with week number.
+        '''
+        actual = CalendarCommand({'query': '+30d'}).execute()
+
+        assert '<items><item autocomplete="2014-08-25" uid="0" ' \
+               'valid="yes"><title>2014/08/25 (Mon)\tW35</title>' \
+               '</item></items>' == actual
+
+    def test_difference(self):
+        '''
+        :type: normal
+        :case: execute difference of dates.
+        :expect: a valid item of number of days.
+        '''
+        actual = CalendarCommand({'query': '2014-12-25 - 2014-07-26',
+                                  'output_format': 'json'}).execute()
+
+        assert '{"items":[{"uid":"0","valid":true,' \
+               '"autocomplete":"2014-12-25 - 2014-07-26",' \
+               '"title":"152 days"}]}' == actual
+
+    @patch('alc.command.CalendarCommand.error_action', return_value='dummy')
+    def test_expression_is_invalid(self, m_error_action):
+        '''
+        :type: error
+        :case: execute invalid expression.
+        :expect: return string of *error_action*.
+        '''
+        assert 'dummy' == CalendarCommand({'query': '12 x'}).execute()
+
+
+class TestMonthName():
+    '''
+    Unit test for month names of *CalendarCommand.execute()*.
+    '''
+
+    def setup(self):
+        CalendarCommand.memo_clear()
+
+    def teardown(self):
+        CalendarCommand.memo_clear()
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: name a month by abbreviation and full name.
+        :expect: same as a query of month number.
+        '''
+        expect = CalendarCommand({'query': '7 2014 +1'}).execute()
+
+        assert expect == CalendarCommand({'query': 'jul 2014 +1'}).execute()
+        assert expect == CalendarCommand({'query': 'July 2014 +1'}).execute()
+
+    def test_name_is_ambiguous(self):
+        '''
+        :type: normal
+        :case: name matches several months.
+        :expect: invalid items which complete each name and rest of query.
+        '''
+        actual = CalendarCommand({'query': 'ju 2014'}).execute()
+
+        assert '<items><item autocomplete="June 2014" uid="0" valid="no">' \
+               '<title>June</title></item><item autocomplete="July 2014" ' \
+               'uid="1" valid="no"><title>July</title></item></items>' == \
+            actual
+
+    def test_name_is_not_ascii(self):
+        '''
+        :type: normal
+        :case: candidates are localized names which are not ASCII.
+        :expect: names are escaped as character references.
+        '''
+        cmd = CalendarCommand({})
+        candidates = [(3, u'M\xe4rz'), (5, u'Mai')]
+
+        assert '<items><item autocomplete="M&#228;rz 2014" uid="0" ' \
+               'valid="no"><title>M&#228;rz</title></item><item ' \
+               'autocomplete="Mai 2014" uid="1" valid="no"><title>Mai' \
+               '</title></item></items>' == \
+            cmd.completion_action('ma 2014', candidates)
+        assert '{"items":[{"uid":"0","valid":false,' \
+               '"autocomplete":"M\\u00e4rz ","title":"M\\u00e4rz"}]}' == \
+            CalendarCommand({'output_format': 'json'}).completion_action(
+                'm\xc3\xa4', candidates[:1])
+
+        with patch('alc.monthname.complete', return_value=candidates):
+            actual = CalendarCommand({'query': 'ma 2014'}).execute()
+        assert '<title>M&#228;rz</title>' in actual
+
+    @patch('alc.command.CalendarCommand.error_action', return_value='dummy')
+    def test_name_is_unknown(self, m_error_action):
+        '''
+        :type: error
+        :case: first word is not a month name nor an expression.
+        :expect: return string of *error_action*.
+        '''
+        assert 'dummy' == CalendarCommand({'query': 'xyz 2014'}).execute()
+
+    @patch('alc.monthname.complete')
+    def test_name_is_keyword(self, m_complete):
+        '''
+        :type: normal
+        :case: first word is a keyword of expression.
+        :expect: month names are not looked up.
+        '''
+        for query in ['today', 'Tomorrow', 'next fri', 'last Mon', 'sun']:
+            assert [] == CalendarCommand({}).month_candidates(query)
+
+        assert 0 == m_complete.call_count
+
+    def test_month_locales_is_specified(self):
+        '''
+        :type: normal
+        :case: *month_locales* is a string separated by ','.
+        :expect: return list of locale names.
+        '''
+        cmd = CalendarCommand({'month_locales': 'de_DE.UTF-8,fr_FR.UTF-8'})
+
+        assert ['de_DE.UTF-8', 'fr_FR.UTF-8'] == cmd.get_month_locales()
+        assert [] == CalendarCommand({}).get_month_locales()
+
+
+class TestWeekQuery():
+    '''
+    Unit test for *CalendarCommand.week_query()*.
+    '''
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: query of week, year and span.
+        :expect: return query of the month of the week.
+        '''
+        cmd = CalendarCommand({})
+
+        assert '8 2014' == cmd.week_query('w32 2014')
+        assert '12 2015 +1' == cmd.week_query('W53 2015 +1')
+        assert cmd.week_query('7 2014') is None
+        assert cmd.week_query('wed') is None
+
+    @freeze_time('2014-07-24 23:18:00')
+    def test_year_is_not_specified(self):
+        '''
+        :type: normal
+        :case: query of week without year.
+        :expect: week of current year.
+        '''
+        assert '3 2014 +2' == CalendarCommand({}).week_query('w10 +2')
+
+    def test_execute(self):
+        '''
+        :type: normal
+        :case: execute query of week with *week_format*.
+        :expect: same as a query of the month.
+        '''
+        CalendarCommand.memo_clear()
+        config = {'week_format': 'W%02d'}
+        expect = CalendarCommand(dict(config, query='8 2014')).execute()
+        actual = CalendarCommand(dict(config, query='w32 2014')).execute()
+        CalendarCommand.memo_clear()
+
+        assert expect == actual
+        assert '<title>W32\t04\t05\t06\t07\t08\t09\t10\t</title>' in actual
+
+    @patch('alc.command.CalendarCommand.error_action', return_value='dummy')
+    def test_week_is_out_of_range(self, m_error_action):
+        '''
+        :type: error
+        :case: week 53 of a year which has 52 weeks.
+        :expect: return string of *error_action*.
+        '''
+        assert 'dummy' == CalendarCommand({'query': 'w53 2014'}).execute()
+
+
+class TestGetRange():
+    '''
+    Unit test for *CalendarCommand.get_range()*.
+    '''
+
+    @freeze_time('2014-07-24 23:18:00')
+    def test_default(self):
+        '''
+        :type: normal
+        :case: query is empty.
+        :expect: return current datetime.
+        '''
+        cmd = CalendarCommand({})
+        actual = cmd.get_range({'month': None, 'year': None, 'span': None})
+
+        assert (datetime(2014, 7, 24, 23, 18, 0),
+                cmd._default_datetime_format, 1) == actual
+
+    @freeze_time('2014-07-24 23:18:00')
+    def test_specified_month(self):
+        '''
+        :type: normal
+        :case: month, year and span are specified.
+        :expect: return specified month and number of months.
+        '''
+        cmd = CalendarCommand({})
+        fmt = cmd._specified_datetime_format
+
+        assert (datetime(2014, 3, 1), fmt, 1) == \
+            cmd.get_range({'month': 3, 'year': None, 'span': None})
+        assert (datetime(2015, 3, 1), fmt, 3) == \
+            cmd.get_range({'month': 3, 'year': 2015, 'span': 2})
+        assert (datetime(2014, 7, 1), fmt, 3) == \
+            cmd.get_range({'month': None, 'year': None, 'span': 2})
+
+    def test_specified_year(self):
+        '''
+        :type: normal
+        :case: only year is specified.
+        :expect: return whole year.
+        '''
+        cmd = CalendarCommand({})
+        fmt = cmd._specified_datetime_format
+
+        assert (datetime(2015, 1, 1), fmt, 12) == \
+            cmd.get_range({'month': None, 'year': 2015, 'span': None})
+        assert (datetime(2015, 1, 1), fmt, 3) == \
+            cmd.get_range({'month': None, 'year': 2015, 'span': 2})
+
+
 class TestErrorAction():
     '''
     Unit test for *CalendarCommand.error_action()*.
     '''
 
+    def setup(self):
+        CalendarCommand.memo_clear()
+
+    def teardown(self):
+        CalendarCommand.memo_clear()
+
     @patch('alc.script_filter.ScriptFilter.xml_s')
     @patch('alc.script_filter.ScriptFilter.append_item')
     def test_default(self, m_append_item, m_xml_s):
@@ -244,3 +1013,152 @@ class TestErrorAction():
 
         assert expect_args_list == m_append_item.call_args_list
         assert m_xml_s == actual_xml
+
+
+class TestMemo():
+    '''
+    Unit test for the last result of *CalendarCommand*.
+    '''
+
+    def setup(self):
+        CalendarCommand.memo_clear()
+
+    def teardown(self):
+        CalendarCommand.memo_clear()
+
+    @patch('alc.formatter.CalendarFormatter.months',
+           return_value=iter([(datetime(2014, 12, 1), ('dummy',))]))
+    def test_default(self, m_months):
+        '''
+        :type: normal
+        :case: execute queries which are same after parsing.
+        :expect: rendered once, and the last result is returned.
+        '''
+        first = CalendarCommand({'query': '12 2014'}).execute()
+        second = CalendarCommand({'query': '12 2014 '}).execute()
+
+        assert first == second
+        assert 1 == m_months.call_count
+        assert 1 == CalendarCommand.memo_info()['hits']
+
+    def test_query_is_changed(self):
+        '''
+        :type: normal
+        :case: execute different queries in turn.
+        :expect: each query is rendered.
+        '''
+        first = CalendarCommand({'query': '12 2014'}).execute()
+        second = CalendarCommand({'query': '1 2015'}).execute()
+
+        assert first != second
+        assert 0 == CalendarCommand.memo_info()['hits']
+
+    def test_config_is_changed(self):
+        '''
+        :type: normal
+        :case: execute same query with different config.
+        :expect: each config is rendered.
+        '''
+        first = CalendarCommand({'query': '12 2014'}).execute()
+        second = CalendarCommand({'query': '12 2014',
+                                  'first_week_day': 6}).execute()
+
+        assert first != second
+        assert 0 == CalendarCommand.memo_info()['hits']
+
+    @patch('alc.script_filter.ScriptFilter.append_item')
+    def test_error(self, m_append_item):
+        '''
+        :type: error
+        :case: execute different invalid queries in turn.
+        :expect: usage is rendered once.
+        '''
+        CalendarCommand({'query': '13'}).execute()
+        CalendarCommand({'query': '12 x'}).execute()
+
+        assert 1 == m_append_item.call_count
+        assert 1 == CalendarCommand.memo_info()['hits']
+
+
+class TestWrite():
+    '''
+    Unit test for *CalendarCommand.write()*.
+    '''
+
+    def setup(self):
+        CalendarCommand.memo_clear()
+        self.directory = tempfile.mkdtemp()
+
+    def teardown(self):
+        CalendarCommand.memo_clear()
+        shutil.rmtree(self.directory)
+
+    def _write(self, config):
+        fp = StringIO()
+        CalendarCommand(config).write(fp)
+        CalendarCommand.memo_clear()
+        return fp.getvalue()
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: write queries of months, expression and an invalid query.
+        :expect: same as *execute*.
+        '''
+        for query in ['7 2014', '2014 +2', '2014', '1 2015 +1',
+                      'today', '13 2014', '12 x']:
+            config = {'query': query}
+            actual = self._write(config)
+            assert CalendarCommand(config).execute() == actual, query
+            CalendarCommand.memo_clear()
+
+    def test_config_is_specified(self):
+        '''
+        :type: normal
+        :case: write with output format, week numbers and holidays.
+        :expect: same as *execute*.
+        '''
+        path = os.path.join(self.directory, 'holidays.json')
+        with open(path, 'w') as f:
+            f.write('[{"name": "Marine Day", "month": 7, "weekday": 0, '
+                    '"nth": 3}]')
+        config = {'query': '6 2014 +2', 'output_format': 'json',
+                  'week_format': 'W%02d', 'holidays_path': path}
+
+        with patch.dict('os.environ',
+                        {'alfred_workflow_data': self.directory}):
+            actual = self._write(config)
+            expect = CalendarCommand(config).execute()
+
+        assert 'business days' in actual
+        assert expect == actual
+
+    @patch('alc.formatter.CalendarFormatter.months')
+    def test_months_are_streamed(self, m_months):
+        '''
+        :type: normal
+        :case: write months.
+        :expect: a month is written before the next month is rendered.
+        '''
+        fp = StringIO()
+
+        def months(*args):
+            yield datetime(2014, 7, 1), ('first',)
+            assert 'first' in fp.getvalue()
+            yield datetime(2014, 8, 1), ('second',)
+
+        m_months.side_effect = months
+        CalendarCommand({'query': '7 2014 +2'}).write(fp)
+
+        assert fp.getvalue().endswith('</items>')
+        assert 'second' in fp.getvalue()
+
+    @patch('alc.command.CalendarCommand.error_action',
+           return_value='error')
+    def test_year_is_out_of_range(self, m_error_action):
+        '''
+        :type: error
+        :case: the last month is after year 9999.
+        :expect: only error is written.
+        '''
+        assert 'error' == self._write({'query': '12 9999 +2'})
@@ -0,0 +1,44 @@
+# -*- coding:utf-8 -*-
+
+import calendar
+
+from alc.days import days_in_month, isleap, weeks
+
+
+def test_isleap():
+    '''
+    Unit test for *isleap()*.
+
+    :type: normal
+    :case: call this function with years in 1-9999.
+    :expect: same as *calendar.isleap*.
+    '''
+    assert all(calendar.isleap(y) == isleap(y) for y in xrange(1, 10000))
+
+
+def test_days_in_month():
+    '''
+    Unit test for *days_in_month()*.
+
+    :type: normal
+    :case: call this function with months of common and leap years.
+    :expect: same as *calendar.monthrange*.
+    '''
+    for y in (1900, 2000, 2014, 2016):
+        for m in xrange(1, 13):
+            assert calendar.monthrange(y, m)[1] == days_in_month(y, m)
+
+
+def test_weeks():
+    '''
+    Unit test for *weeks()*.
+
+    :type: normal
+    :case: call this function with offset and days of months.
+    :expect: same as *calendar.monthcalendar*.
+    '''
+    c = calendar.Calendar(calendar.MONDAY)
+    for y, m in [(2014, 7), (2015, 2), (2016, 2), (2014, 6)]:
+        offset = calendar.weekday(y, m, 1)
+        assert c.monthdayscalendar(y, m) == \
+            weeks(offset, days_in_month(y, m))
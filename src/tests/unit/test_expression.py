@@ -0,0 +1,105 @@
+# -*- coding:utf-8 -*-
+
+from mock import patch
+from nose.tools import raises
+from datetime import date
+from alc.expression import ExpressionError, add_months, compile_expression, \
+    evaluate, is_keyword, plan_cache_info, _tokenize
+
+TODAY = date(2014, 7, 26)  # Saturday
+
+
+def test_is_keyword():
+    '''
+    Unit test for *is_keyword()*.
+
+    :type: normal
+    :case: call this function with keywords and month names.
+    :expect: True only for keywords.
+    '''
+    assert is_keyword(u'Today')
+    assert is_keyword(u'next')
+    assert is_keyword(u'fri')
+    assert not is_keyword(u'jul')
+    assert not is_keyword(u'x')
+
+
+def test_add_months():
+    '''
+    Unit test for *add_months()*.
+
+    :type: normal
+    :case: add months to end of months.
+    :expect: day is clamped to the last day of month.
+    '''
+    assert date(2014, 2, 28) == add_months(date(2014, 1, 31), 1)
+    assert date(2012, 2, 29) == add_months(date(2012, 3, 31), -1)
+    assert date(2015, 1, 31) == add_months(date(2014, 12, 31), 1)
+
+
+class TestEvaluate:
+    '''
+    Unit test for *evaluate()*.
+    '''
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: evaluate expressions.
+        :expect: date or number of days.
+        '''
+        for expression, expect in [
+                ('2014-12-25', date(2014, 12, 25)),
+                ('today', TODAY),
+                ('Yesterday', date(2014, 7, 25)),
+                ('+30d', date(2014, 8, 25)),
+                ('-2w', date(2014, 7, 12)),
+                ('+1y', date(2015, 7, 26)),
+                ('next fri', date(2014, 8, 1)),
+                ('next saturday', date(2014, 8, 2)),
+                ('last sat', date(2014, 7, 19)),
+                ('2014-01-31 +1m', date(2014, 2, 28)),
+                ('2014-07-26  +  30d', date(2014, 8, 25)),
+                ('2014-07-26 - 1d', date(2014, 7, 25)),
+                ('2014-07-26 next mon +1w', date(2014, 8, 4)),
+                ('2014-12-25 - 2014-07-26', 152),
+                ('2014-07-26 - 2014-12-25', -152),
+                ('today - next fri', -6)]:
+            assert expect == evaluate(expression, TODAY), expression
+
+    def test_expression_is_invalid(self):
+        '''
+        :type: error
+        :case: evaluate invalid expressions.
+        :expect: raise ExpressionError.
+        '''
+        @raises(ExpressionError)
+        def execute(expression):
+            evaluate(expression, TODAY)
+
+        for expression in ['', 'foo', '2014-13-01', 'next', 'next foo',
+                           '+', '+ 2014-07-26', '2014-07-26 -',
+                           '2014-07-26 - 2014-07-01 +1d', '+30x',
+                           '9999-12-31 +1d']:
+            execute(expression)
+
+
+class TestCompileExpression:
+    '''
+    Unit test for *compile_expression()*.
+    '''
+
+    @patch('alc.expression._tokenize', wraps=_tokenize)
+    def test_plan_is_cached(self, m_tokenize):
+        '''
+        :type: normal
+        :case: compile same expression with different spaces and case.
+        :expect: expression is compiled once, and plan is reused.
+        '''
+        hits = plan_cache_info()['hits']
+        plan = compile_expression('2014-07-26 NEXT fri')
+
+        assert plan is compile_expression(' 2014-07-26  next FRI ')
+        assert 1 == m_tokenize.call_count
+        assert hits + 1 == plan_cache_info()['hits']
+        assert date(2014, 8, 1) == plan(TODAY)
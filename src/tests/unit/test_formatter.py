@@ -3,8 +3,10 @@
 import calendar
 
 from mock import patch
-from datetime import datetime
-from alc.formatter import CalendarFormatter
+from nose.tools import raises
+from datetime import date, datetime
+from alc.formatter import CalendarFormatter, cell_table, monthcalendars, \
+    week_month, week_numbers, _month_offsets, _rows
 
 
 class TestDatetime:
@@ -44,6 +46,9 @@ class TestWeekheader:
     Unit test for *CalendarFormatter.weekheader()*.
     '''
 
+    def setup(self):
+        calendar.setfirstweekday(calendar.MONDAY)
+
     def test_default(self):
         '''
         :type: normal
@@ -51,10 +56,22 @@ class TestWeekheader:
         :expect: get a week header.
         '''
         expect = 'Mo\tTu\tWe\tTh\tFr\tSa\tSu'
-        actual = CalendarFormatter.weekheader()
+        actual = CalendarFormatter(datetime(2014, 7, 24)).weekheader()
         assert expect == actual
 
     def test_first_weekday_is_specified(self):
+        '''
+        :type: normal
+        :case: specify the first week day. (Sunday)
+        :expect: get a week header of start Sunday.
+        '''
+        expect = 'Su\tMo\tTu\tWe\tTh\tFr\tSa'
+        actual = CalendarFormatter(datetime(2014, 7, 24),
+                                   calendar.SUNDAY).weekheader()
+        assert expect == actual
+        assert calendar.MONDAY == calendar.firstweekday()
+
+    def test_first_weekday_is_set_in_advance(self):
         '''
         :type: normal
         :case: set the first week day in advance. (Sunday)
@@ -62,7 +79,8 @@ class TestWeekheader:
         '''
         calendar.setfirstweekday(calendar.SUNDAY)
         expect = 'Su\tMo\tTu\tWe\tTh\tFr\tSa'
-        actual = CalendarFormatter.weekheader()
+        actual = CalendarFormatter(datetime(2014, 7, 24)).weekheader()
+        calendar.setfirstweekday(calendar.MONDAY)
         assert expect == actual
 
 
@@ -91,6 +109,206 @@ class TestWeekdays:
             assert expect[i] == w
 
 
+class TestMonths:
+    '''
+    Unit test for *CalendarFormatter.months()*.
+    '''
+
+    def setup(self):
+        calendar.setfirstweekday(calendar.MONDAY)
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: call this method. datetime is '2014/12/24'.
+        :expect: get calendars from '2014/12' to '2015/01'.
+        '''
+        cf = CalendarFormatter(datetime(2014, 12, 24, 23, 18, 00))
+        actual = list(cf.months(2))
+
+        assert datetime(2014, 12, 24, 23, 18, 00) == actual[0][0]
+        assert '01\t02\t03\t04\t05\t06\t07\t' == actual[0][1][0]
+        assert datetime(2015, 1, 1, 23, 18, 00) == actual[1][0]
+        assert '\t\t\t01\t02\t03\t04\t' == actual[1][1][0]
+
+
+class TestHighlight:
+    '''
+    Unit test for highlight of *CalendarFormatter.weekdays()*.
+    '''
+
+    def setup(self):
+        CalendarFormatter.cache_clear()
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: highlight a day in the month.
+        :expect: only the cell of the day is replaced.
+        '''
+        cf = CalendarFormatter(datetime(2014, 7, 24), calendar.MONDAY)
+        plain = list(cf.weekdays())
+        actual = list(cf.weekdays(date(2014, 7, 24)))
+
+        assert '21\t22\t23\t[24]\t25\t26\t27\t' == actual[3]
+        assert plain[:3] + plain[4:] == actual[:3] + actual[4:]
+        assert plain == list(cf.weekdays())
+        assert 2 == CalendarFormatter.cache_info()['hits']
+
+    def test_highlight_format_is_specified(self):
+        '''
+        :type: normal
+        :case: highlight the first and last day with a format.
+        :expect: cells are replaced with the format.
+        '''
+        cf = CalendarFormatter(datetime(2014, 7, 1), calendar.MONDAY,
+                               highlight_format='*%02d')
+
+        assert '\t*01\t02\t03\t04\t05\t06\t' == \
+            list(cf.weekdays(date(2014, 7, 1)))[0]
+        assert '28\t29\t30\t*31\t\t\t\t' == \
+            list(cf.weekdays(date(2014, 7, 31)))[4]
+
+    def test_day_is_out_of_month(self):
+        '''
+        :type: normal
+        :case: highlight a day in another month.
+        :expect: rows are not changed.
+        '''
+        cf = CalendarFormatter(datetime(2014, 7, 24), calendar.MONDAY)
+
+        assert list(cf.weekdays()) == list(cf.weekdays(date(2014, 8, 1)))
+
+
+class TestCellTable:
+    '''
+    Unit test for *cell_table()*.
+    '''
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: call this function.
+        :expect: blank cell and days formatted as '%02d'.
+        '''
+        cells = cell_table()
+
+        assert 32 == len(cells)
+        assert '\t' == cells[0]
+        assert ['%02d\t' % d for d in range(1, 32)] == list(cells[1:])
+        assert cells is cell_table()
+
+    def test_style_is_specified(self):
+        '''
+        :type: normal
+        :case: day format and blank are specified.
+        :expect: rows of formatter are made of the cells.
+        '''
+        cells = cell_table('%2d', '  ')
+        cf = CalendarFormatter(datetime(2014, 7, 24), calendar.MONDAY,
+                               '%2d', '  ')
+
+        assert ('  \t', ' 7\t') == (cells[0], cells[7])
+        assert '  \t 1\t 2\t 3\t 4\t 5\t 6\t' == list(cf.weekdays())[0]
+
+
+class TestWeekNumbers:
+    '''
+    Unit test for *week_numbers()*.
+    '''
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: call this function for every first week day.
+        :expect: same as ISO week of Thursday of each row.
+        '''
+        for firstweekday in range(7):
+            cal = calendar.Calendar(firstweekday)
+            for y, m, offset, days in _month_offsets(2009, 1, 96,
+                                                     firstweekday):
+                weeks = cal.monthdatescalendar(y, m)
+                expect = [[d for d in w if d.weekday() == calendar.THURSDAY]
+                          [0].isocalendar()[1] for w in weeks]
+                assert expect == week_numbers(y, m, offset, firstweekday,
+                                              len(weeks))
+
+    def test_formatter(self):
+        '''
+        :type: normal
+        :case: *week_format* is specified, and highlight a day.
+        :expect: rows start with week number, and header with blank cell.
+        '''
+        cf = CalendarFormatter(datetime(2014, 12, 24), calendar.MONDAY,
+                               week_format='W%02d')
+        actual = list(cf.weekdays(date(2014, 12, 31)))
+
+        assert '\tMo\tTu\tWe\tTh\tFr\tSa\tSu' == cf.weekheader()
+        assert 'W49\t01\t02\t03\t04\t05\t06\t07\t' == actual[0]
+        assert 'W01\t29\t30\t[31]\t\t\t\t\t' == actual[4]
+        assert 'Mo\tTu\tWe\tTh\tFr\tSa\tSu' == \
+            CalendarFormatter(datetime(2014, 12, 24),
+                              calendar.MONDAY).weekheader()
+
+
+class TestWeekMonth:
+    '''
+    Unit test for *week_month()*.
+    '''
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: weeks across months and years.
+        :expect: month of Thursday of the week.
+        '''
+        assert 8 == week_month(2014, 32)
+        assert 1 == week_month(2015, 1)
+        assert 12 == week_month(2015, 53)
+        assert 1 == week_month(2016, 1)
+
+    def test_week_is_out_of_range(self):
+        '''
+        :type: error
+        :case: week 53 of a year which has 52 weeks.
+        :expect: raise ValueError.
+        '''
+        @raises(ValueError)
+        def execute():
+            week_month(2014, 53)
+
+        execute()
+
+
+class TestMonthcalendars:
+    '''
+    Unit test for *monthcalendars()*.
+    '''
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: call this function for every first week day.
+        :expect: same as *calendar.monthcalendar*.
+        '''
+        for firstweekday in range(7):
+            cal = calendar.Calendar(firstweekday)
+            for y, m, weeks in monthcalendars(1999, 1, 24, firstweekday):
+                assert cal.monthdayscalendar(y, m) == weeks
+
+    def test_year_is_out_of_range(self):
+        '''
+        :type: error
+        :case: months exceed year 9999.
+        :expect: raise ValueError.
+        '''
+        @raises(ValueError)
+        def execute():
+            list(monthcalendars(9999, 12, 2))
+
+        execute()
+
+
 class TestSetfirstweekday:
     '''
     Unit test for *CalendarFormatter.setfirstweekday()*.
@@ -105,3 +323,85 @@ class TestSetfirstweekday:
         '''
         CalendarFormatter.setfirstweekday(calendar.MONDAY)
         m_setfirstweekday.assert_called_once_with(calendar.MONDAY)
+
+
+class TestCache:
+    '''
+    Unit test for cache of *CalendarFormatter*.
+    '''
+
+    def setup(self):
+        calendar.setfirstweekday(calendar.MONDAY)
+        CalendarFormatter.cache_clear()
+
+    @patch('alc.formatter._rows', wraps=_rows)
+    def test_weekdays(self, m_rows):
+        '''
+        :type: normal
+        :case: call *weekdays* of same month twice.
+        :expect: calendar is computed only once.
+        '''
+        cf1 = CalendarFormatter(datetime(2014, 7, 24, 23, 18, 00))
+        cf2 = CalendarFormatter(datetime(2014, 7, 1, 00, 00, 00))
+
+        assert list(cf1.weekdays()) == list(cf2.weekdays())
+        assert 1 == m_rows.call_count
+        assert 1 == CalendarFormatter.cache_info()['hits']
+        assert 1 == CalendarFormatter.cache_info()['misses']
+
+    def test_first_weekday_is_changed(self):
+        '''
+        :type: normal
+        :case: formatters of different first week days.
+        :expect: rows of each first week day are returned.
+        '''
+        d = datetime(2014, 7, 24, 23, 18, 00)
+        monday = list(CalendarFormatter(d, calendar.MONDAY).weekdays())
+        sunday = list(CalendarFormatter(d, calendar.SUNDAY).weekdays())
+
+        assert '\t01\t02\t03\t04\t05\t06\t' == monday[0]
+        assert '\t\t01\t02\t03\t04\t05\t' == sunday[0]
+        assert 2 == CalendarFormatter.cache_info()['misses']
+
+
+class TestConcurrency:
+    '''
+    Rendering in threads of different first week days.
+    '''
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: format months in threads of Monday and Sunday at once.
+        :expect: each thread gets rows of its first week day.
+        '''
+        import threading
+
+        d = datetime(2014, 1, 1)
+        expect = {}
+        for firstweekday in (calendar.MONDAY, calendar.SUNDAY):
+            cal = calendar.Calendar(firstweekday)
+            expect[firstweekday] = [
+                len([x for x in cal.monthdayscalendar(2014 + i // 12,
+                                                      i % 12 + 1)[0]
+                     if x == 0])
+                for i in range(48)]
+        errors = []
+
+        def render(firstweekday):
+            for _ in range(50):
+                CalendarFormatter.cache_clear()
+                f = CalendarFormatter(d, firstweekday)
+                blanks = [len(rows[0]) - len(rows[0].lstrip('\t'))
+                          for _, rows in f.months(48)]
+                if blanks != expect[firstweekday]:
+                    errors.append(firstweekday)
+
+        threads = [threading.Thread(target=render, args=(w,))
+                   for w in (calendar.MONDAY, calendar.SUNDAY) * 2]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert [] == errors
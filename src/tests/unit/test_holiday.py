@@ -0,0 +1,153 @@
+# -*- coding:utf-8 -*-
+
+import json
+import os
+import shutil
+import tempfile
+
+from mock import patch
+from nose.tools import raises
+from datetime import date
+from alc.holiday import HolidayCalendar, compile_year, easter, load_rules
+
+RULES = [
+    {'name': "New Year's Day", 'month': 1, 'day': 1},
+    {'name': 'Marine Day', 'month': 7, 'weekday': 0, 'nth': 3},
+    {'name': 'Memorial Day', 'month': 5, 'weekday': 0, 'nth': -1},
+    {'name': 'Good Friday', 'easter': -2},
+    {'name': 'Leap Day', 'month': 2, 'day': 29},
+    {'name': 'Old Day', 'month': 7, 'day': 4, 'until': 2000}
+]
+
+
+def test_easter():
+    '''
+    Unit test for *easter()*.
+
+    :type: normal
+    :case: call this function for some years.
+    :expect: Easter Sunday of Gregorian calendar.
+    '''
+    assert date(2014, 4, 20) == easter(2014)
+    assert date(2000, 4, 23) == easter(2000)
+    assert date(2038, 4, 25) == easter(2038)
+    assert date(2285, 3, 22) == easter(2285)
+
+
+class TestRules:
+    '''
+    Unit test for *load_rules()* and *compile_year()*.
+    '''
+
+    def setup(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'holidays.json')
+
+    def teardown(self):
+        shutil.rmtree(self.directory)
+
+    def _load(self, rules):
+        with open(self.path, 'w') as f:
+            json.dump(rules, f)
+        return load_rules(self.path)
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: compile rules of 2014 and 2000.
+        :expect: bit of each holiday is set.
+        '''
+        rules = self._load(RULES)
+
+        masks = compile_year(rules, 2014)
+        assert 1 << 1 == masks[1]
+        assert 1 << 18 == masks[4]
+        assert 1 << 26 == masks[5]
+        assert 1 << 21 == masks[7]
+        assert 0 == masks[2]
+
+        masks = compile_year(rules, 2000)
+        assert 1 << 29 == masks[2]
+        assert (1 << 4) | (1 << 17) == masks[7]
+
+    def test_rule_is_invalid(self):
+        '''
+        :type: error
+        :case: rule has unknown keys or invalid values.
+        :expect: raise ValueError.
+        '''
+        @raises(ValueError)
+        def execute(rules):
+            self._load(rules)
+
+        execute({'month': 1, 'day': 1})
+        execute([{'month': 1}])
+        execute([{'month': 1, 'weekday': 0, 'nth': 0}])
+        execute([{'month': 1, 'weekday': 7, 'nth': 1}])
+        execute([{'month': None, 'day': 1}])
+        execute([{'month': 1, 'day': [1]}])
+        execute([{'easter': {}}])
+        execute([{'month': 1, 'day': 1, 'since': None}])
+        execute(['1/1'])
+
+
+class TestHolidayCalendar:
+    '''
+    Unit test for *HolidayCalendar*.
+    '''
+
+    def setup(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'holidays.json')
+        self.cache_path = os.path.join(self.directory, 'holidays.cache')
+        with open(self.path, 'w') as f:
+            json.dump(RULES, f)
+
+    def teardown(self):
+        shutil.rmtree(self.directory)
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: look up holidays of a month.
+        :expect: holidays and business days.
+        '''
+        holidays = HolidayCalendar(self.path)
+
+        assert set([21]) == holidays.days(2014, 7)
+        assert holidays.is_holiday(date(2014, 7, 21))
+        assert not holidays.is_holiday(date(2014, 7, 22))
+        assert 22 == holidays.business_days(2014, 7)
+        assert 21 == holidays.business_days(2014, 6)
+
+    @patch('alc.holiday.load_rules', wraps=load_rules)
+    def test_cache(self, m_load_rules):
+        '''
+        :type: normal
+        :case: save and create again.
+        :expect: rules are not loaded again.
+        '''
+        holidays = HolidayCalendar(self.path, self.cache_path)
+        holidays.days(2014, 7)
+        holidays.save()
+
+        holidays = HolidayCalendar(self.path, self.cache_path)
+        assert set([21]) == holidays.days(2014, 7)
+        assert 1 == m_load_rules.call_count
+
+    @patch('alc.holiday.load_rules', wraps=load_rules)
+    def test_rule_file_is_changed(self, m_load_rules):
+        '''
+        :type: normal
+        :case: rule file is changed after save.
+        :expect: cache is discarded.
+        '''
+        holidays = HolidayCalendar(self.path, self.cache_path)
+        holidays.days(2014, 7)
+        holidays.save()
+        with open(self.path, 'w') as f:
+            json.dump(RULES[:1], f)
+
+        holidays = HolidayCalendar(self.path, self.cache_path)
+        assert set() == holidays.days(2014, 7)
+        assert 2 == m_load_rules.call_count
@@ -0,0 +1,166 @@
+# -*- coding:utf-8 -*-
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from mock import patch
+from StringIO import StringIO
+from alc.__main__ import main, parse_argv
+
+# Modules which must not be imported until they are used.
+HEAVY_MODULES = ['argparse', 'calendar', 'json', 'locale', 'sqlite3',
+                 'xml.etree.ElementTree',
+                 'alc.formatter', 'alc.script_filter']
+
+_PROBE = '''
+import sys
+
+import alc.__main__
+import alc.command
+
+%s
+
+modules = [m for m, v in sys.modules.items() if v is not None]
+print repr(modules)
+'''
+
+
+def _probe(statements=''):
+    src_dir = os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+    output = subprocess.check_output([sys.executable, '-c',
+                                      _PROBE % statements],
+                                     cwd=src_dir)
+    return eval(output.splitlines()[-1])
+
+
+class TestParseArgv:
+    '''
+    Unit test for *parse_argv()*.
+    '''
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: call this function with query and config.
+        :expect: return config including query.
+        '''
+        actual = parse_argv(['--first-week-day=6', '7',
+                             '--output_format=json', '2014'])
+
+        assert {'query': '7 2014', 'first_week_day': 6,
+                'output_format': 'json'} == actual
+
+    def test_argv_is_empty(self):
+        '''
+        :type: normal
+        :case: no argument.
+        :expect: query is empty.
+        '''
+        assert {'query': ''} == parse_argv([])
+
+
+class TestMain:
+    '''
+    Unit test for *main()*.
+    '''
+
+    @patch('sys.stdout', new_callable=StringIO)
+    @patch('alc.command.CalendarCommand.write',
+           side_effect=lambda fp, flush: fp.write('dummy'))
+    def test_default(self, m_write, m_stdout):
+        '''
+        :type: normal
+        :case: call this function.
+        :expect: output of command is streamed to stdout.
+        '''
+        main(['7', '2014'])
+
+        m_write.assert_called_once_with(m_stdout, flush=True)
+        assert 'dummy\n' == m_stdout.getvalue()
+
+    @patch('sys.stdout', new_callable=StringIO)
+    @patch('sys.stdin', new_callable=lambda: StringIO('7 2014\n'))
+    @patch('alc.batch.run')
+    def test_batch(self, m_run, m_stdin, m_stdout):
+        '''
+        :type: normal
+        :case: call this function with *--batch*.
+        :expect: queries are read from stdin.
+        '''
+        main(['--batch', '--first_week_day=6'])
+
+        m_run.assert_called_once_with(m_stdin, m_stdout,
+                                      {'query': '', 'first_week_day': 6}, 1)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    @patch('alc.batch.run')
+    def test_batch_jobs(self, m_run, m_stdout):
+        '''
+        :type: normal
+        :case: call this function with *--batch*, *--jobs* and *--input*.
+        :expect: queries are read from the file by worker processes.
+        '''
+        with tempfile.NamedTemporaryFile() as f:
+            main(['--batch', '--jobs=4', '--input=%s' % f.name])
+            stdin = m_run.call_args[0][0]
+
+        assert f.name == stdin.name
+        assert stdin.closed
+        assert (m_stdout, {'query': ''}, 4) == m_run.call_args[0][1:]
+
+
+class TestImportTime:
+    '''
+    Check imports of start-up. Time of imports is measured by
+    *tests.benchmark.bench* (*import_time*), because wall clock time
+    is not stable in unit tests.
+    '''
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: import entry module and command.
+        :expect: heavy modules are not imported.
+        '''
+        modules = _probe()
+
+        assert [] == [m for m in HEAVY_MODULES if m in modules]
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_cache_hit(self, m_stdout):
+        '''
+        :type: normal
+        :case: execute a query which is cached.
+        :expect: modules for rendering are not imported.
+        '''
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'cache.sqlite')
+        try:
+            main(['--cache_path=%s' % path, '7', '2014'])
+            modules = _probe('alc.__main__.main(%r)'
+                                % ['--cache_path=%s' % path, '7', '2014'])
+        finally:
+            shutil.rmtree(directory)
+
+        assert 'sqlite3' in modules
+        assert [] == [m for m in HEAVY_MODULES
+                      if m in modules and m != 'sqlite3']
+
+    def test_query_is_invalid(self):
+        '''
+        :type: error
+        :case: execute a query which is not valid.
+        :expect: modules for rendering months and expressions are not
+            imported.
+        '''
+        modules = _probe("alc.command.CalendarCommand("
+                         "{'query': '13 2014'}).execute()")
+
+        assert 'calendar' not in modules
+        assert 'locale' not in modules
+        assert 'alc.expression' not in modules
+        assert 'alc.formatter' not in modules
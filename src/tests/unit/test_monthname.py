@@ -0,0 +1,205 @@
+# -*- coding:utf-8 -*-
+
+import calendar
+import shutil
+import tempfile
+
+from mock import patch
+from alc.monthname import MonthNameIndex, complete, index_clear, \
+    month_index, _names_path
+
+GERMAN = [u'', u'Januar', u'Februar', u'März', u'April', u'Mai', u'Juni',
+          u'Juli', u'August', u'September', u'Oktober', u'November',
+          u'Dezember']
+
+
+def german():
+    return MonthNameIndex(GERMAN, [n[:3] for n in GERMAN])
+
+
+class TestMonthNameIndex:
+    '''
+    Unit test for *MonthNameIndex*.
+    '''
+
+    def test_exact(self):
+        '''
+        :type: normal
+        :case: look up full names and abbreviations.
+        :expect: return the month.
+        '''
+        index = german()
+
+        assert [7] == index.exact(u'juli')
+        assert [3] == index.exact(u'mär')
+        assert [] == index.exact(u'ju')
+
+    def test_prefix(self):
+        '''
+        :type: normal
+        :case: look up prefixes.
+        :expect: return months which start with the prefix once.
+        '''
+        index = german()
+
+        assert [6, 7] == index.prefix(u'ju')
+        assert [3] == index.prefix(u'mä')
+        assert [] == index.prefix(u'x')
+
+    def test_fuzzy(self):
+        '''
+        :type: normal
+        :case: look up letters of a full name in order.
+        :expect: return the month only for 3 letters or more.
+        '''
+        index = german()
+
+        assert [10] == index.fuzzy(u'okt')
+        assert [12] == index.fuzzy(u'dzb')
+        assert [] == index.fuzzy(u'dz')
+
+
+class TestMonthIndex:
+    '''
+    Unit test for *month_index()*.
+    '''
+
+    def setup(self):
+        index_clear()
+        self.directory = tempfile.mkdtemp()
+        self.env = patch.dict('os.environ',
+                              {'alfred_workflow_data': self.directory})
+        self.env.start()
+
+    def teardown(self):
+        index_clear()
+        self.env.stop()
+        shutil.rmtree(self.directory)
+
+    @patch('alc.monthname._read_names',
+           return_value=(list(calendar.month_name),
+                         list(calendar.month_abbr)))
+    def test_default(self, m_read_names):
+        '''
+        :type: normal
+        :case: get index of current locale twice.
+        :expect: index is built only once.
+        '''
+        index = month_index()
+
+        assert index is month_index()
+        assert 1 == m_read_names.call_count
+        assert [7] == index.exact(u'jul')
+
+    def test_locale_is_specified(self):
+        '''
+        :type: normal
+        :case: get index of another locale.
+        :expect: names are read without changing locale of this process.
+        '''
+        import locale
+
+        with patch('locale.setlocale', wraps=locale.setlocale) as m:
+            index = month_index('C.UTF-8')
+
+        assert [7] == index.exact(u'july')
+        assert all(len(args) == 1 for args, _ in m.call_args_list)
+
+    def test_locale_is_not_supported(self):
+        '''
+        :type: error
+        :case: get index of unknown locale.
+        :expect: return None, and current locale is not changed.
+        '''
+        import locale
+        current = locale.setlocale(locale.LC_TIME)
+
+        assert month_index('xx_XX.UNKNOWN') is None
+        assert current == locale.setlocale(locale.LC_TIME)
+
+    def test_names_are_stored(self):
+        '''
+        :type: normal
+        :case: get index of other locales in a new process.
+        :expect: names are read from the stored file without a child
+            process, including a locale which is not supported.
+        '''
+        month_index('C.UTF-8')
+        month_index('xx_XX.UNKNOWN')
+        index_clear()
+
+        with patch('alc.monthname._read_locale_names') as m_read:
+            index = month_index('C.UTF-8')
+            assert month_index('xx_XX.UNKNOWN') is None
+
+        assert 0 == m_read.call_count
+        assert [7] == index.exact(u'july')
+
+    def test_version_is_changed(self):
+        '''
+        :type: normal
+        :case: get index of another locale after *alc* is upgraded.
+        :expect: names are read in a child process again.
+        '''
+        month_index('C.UTF-8')
+        index_clear()
+
+        names = (list(calendar.month_name), list(calendar.month_abbr))
+        with patch('alc.__version__', 'upgraded'), \
+                patch('alc.monthname._read_locale_names',
+                      return_value=names) as m_read:
+            month_index('C.UTF-8')
+
+        m_read.assert_called_once_with('C.UTF-8')
+
+    def test_file_is_broken(self):
+        '''
+        :type: error
+        :case: stored file is not JSON.
+        :expect: names are read in a child process again.
+        '''
+        month_index('C.UTF-8')
+        index_clear()
+        with open(_names_path('C.UTF-8'), 'w') as f:
+            f.write('{')
+
+        assert [7] == month_index('C.UTF-8').exact(u'july')
+
+
+class TestComplete:
+    '''
+    Unit test for *complete()*.
+    '''
+
+    def setup(self):
+        index_clear()
+
+    def teardown(self):
+        index_clear()
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: complete names in current locale.
+        :expect: exact name is prior to prefix, and prefix to fuzzy.
+        '''
+        assert [(5, 'May')] == complete(u'may')
+        assert [(3, 'March'), (5, 'May')] == complete(u'MA')
+        assert [(7, 'July')] == complete(u'jly')
+        assert [] == complete(u'x')
+
+    @patch('alc.monthname._build')
+    def test_locales_are_specified(self, m_build):
+        '''
+        :type: normal
+        :case: complete names in current locale and German.
+        :expect: names of both locales are matched, and the name of
+            the first matched locale is returned.
+        '''
+        english = MonthNameIndex(calendar.month_name, calendar.month_abbr)
+        m_build.side_effect = \
+            lambda name: german() if name == 'de_DE' else english
+
+        assert [(7, u'Juli')] == complete(u'juli', ['de_DE'])
+        assert [(6, 'June'), (7, 'July')] == complete(u'ju', ['de_DE'])
+        assert [(3, u'März')] == complete(u'mär', ['de_DE'])
@@ -0,0 +1,57 @@
+# -*- coding:utf-8 -*-
+
+from nose.tools import raises
+from alc.protocol import decode_request, to_str
+
+
+def test_to_str():
+    '''
+    Unit test for *to_str()*.
+
+    :type: normal
+    :case: call this function with decoded JSON.
+    :expect: all unicode is converted to UTF-8 string.
+    '''
+    actual = to_str({u'query': u'7', u'first_week_day': 6,
+                     u'list': [u'月']})
+
+    assert {'query': '7', 'first_week_day': 6,
+            'list': ['\xe6\x9c\x88']} == actual
+    assert all(isinstance(k, str) for k in actual.keys())
+    assert isinstance(actual['query'], str)
+
+
+class TestDecodeRequest:
+    '''
+    Unit test for *decode_request()*.
+    '''
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: request has query and config.
+        :expect: query overrides config, and config overrides defaults.
+        '''
+        line = '{"query": "7 2014", "config": {"query": "1", ' \
+               '"first_week_day": 6}}\n'
+        actual = decode_request(line, {'first_week_day': 0,
+                                       'output_format': 'json'})
+
+        assert {'query': '7 2014', 'first_week_day': 6,
+                'output_format': 'json'} == actual
+
+    def test_request_is_invalid(self):
+        '''
+        :type: error
+        :case: request is not JSON object.
+        :expect: raise ValueError.
+        '''
+        @raises(ValueError)
+        def execute(line):
+            decode_request(line)
+
+        execute('7 2014')
+        execute('[]')
+        execute('{"config": [1]}')
+        execute('{"query": 5}')
+        execute('{"config": {"query": ["7"]}}')
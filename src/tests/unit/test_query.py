@@ -0,0 +1,116 @@
+# -*- coding:utf-8 -*-
+
+from nose.tools import raises
+from alc.query import ArgumentParserError, Namespace, QueryParser, \
+    is_expression
+
+
+class TestParseArgs:
+    '''
+    Unit test for *QueryParser.parse_args()*.
+    '''
+
+    def setup(self):
+        self.parser = QueryParser()
+        self.parser.add_argument('month', 1, 12)
+        self.parser.add_argument('year', 0, 9999)
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: all arguments are specified.
+        :expect: return parsed arguments.
+        '''
+        actual = self.parser.parse_args(['7', '2014'])
+
+        assert {'month': 7, 'year': 2014} == vars(actual)
+
+    def test_args_are_omitted(self):
+        '''
+        :type: normal
+        :case: arguments are omitted.
+        :expect: omitted argument is None.
+        '''
+        assert Namespace(month=7, year=None) == self.parser.parse_args(['7'])
+        assert Namespace(month=None, year=None) == self.parser.parse_args('')
+
+    def test_args_are_invalid(self):
+        '''
+        :type: error
+        :case: argument is out of range, not integer or too many.
+        :expect: raise ArgumentParserError.
+        '''
+        @raises(ArgumentParserError)
+        def execute(args):
+            self.parser.parse_args(args)
+
+        execute(['0'])
+        execute(['13'])
+        execute(['7', '10000'])
+        execute(['7', '-1'])
+        execute(['a'])
+        execute(['-h'])
+        execute(['7', '2014', '1'])
+
+
+class TestParseArgsExtended:
+    '''
+    Unit test for *QueryParser.parse_args()* with *prefix* and *skippable*.
+    '''
+
+    def setup(self):
+        self.parser = QueryParser()
+        self.parser.add_argument('month', 1, 12, skippable=True)
+        self.parser.add_argument('year', 0, 9999)
+        self.parser.add_argument('span', 0, 1199, prefix='+')
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: prefixed argument is specified.
+        :expect: return parsed arguments.
+        '''
+        assert Namespace(month=3, year=2015, span=2) == \
+            self.parser.parse_args(['3', '2015', '+2'])
+        assert Namespace(month=3, year=2015, span=2) == \
+            self.parser.parse_args(['+2', '3', '2015'])
+
+    def test_value_is_skipped(self):
+        '''
+        :type: normal
+        :case: value is out of range of skippable argument.
+        :expect: value is given to the next argument.
+        '''
+        assert Namespace(month=None, year=2015, span=None) == \
+            self.parser.parse_args(['2015'])
+
+    def test_args_are_invalid(self):
+        '''
+        :type: error
+        :case: argument is out of range, not integer or too many.
+        :expect: raise ArgumentParserError.
+        '''
+        @raises(ArgumentParserError)
+        def execute(args):
+            self.parser.parse_args(args)
+
+        execute(['13', '2013'])
+        execute(['2015', '3'])
+        execute(['10000'])
+        execute(['3', '+a'])
+        execute(['3', '+1200'])
+
+
+def test_is_expression():
+    '''
+    Unit test for *is_expression()*.
+
+    :type: normal
+    :case: call this function with queries of months and expressions.
+    :expect: True only for expressions.
+    '''
+    assert not is_expression('')
+    assert not is_expression('7 2014 +2')
+    assert is_expression('+30d')
+    assert is_expression('2014-07-26')
+    assert is_expression('next fri')
@@ -1,7 +1,11 @@
 # -*- coding:utf-8 -*-
 
-from mock import MagicMock, patch
-from alc.script_filter import ScriptFilter
+import json
+import xml.etree.ElementTree as etree
+
+from mock import patch
+from StringIO import StringIO
+from alc.script_filter import ScriptFilter, ScriptFilterWriter
 from nose.tools import raises
 
 
@@ -10,12 +14,7 @@ class TestAppendItem:
     Unit test for *ScriptFilter.append_item()*.
     '''
 
-    m_node_item = MagicMock()
-    m_node_title = MagicMock()
-
-    @patch('xml.etree.ElementTree.SubElement',
-           side_effect=[m_node_item, m_node_title])
-    def test_default(self, m_SubElement):
+    def test_default(self):
         '''
         :type: normal
         :case: argument *title* is only specified.
@@ -24,15 +23,12 @@ class TestAppendItem:
         sf = ScriptFilter()
         sf.append_item('sample')
 
-        expect = [((sf.xml, 'item'),
-                   {'uid': '0', 'valid': 'no', 'autocomplete': ''},),
-                  ((self.m_node_item, 'title'),)]
-        assert expect == m_SubElement.call_args_list
-        assert self.m_node_title.text == 'sample'
+        node_item = sf.xml.find('item')
+        assert {'uid': '0', 'valid': 'no', 'autocomplete': ''} == \
+            node_item.attrib
+        assert 'sample' == node_item.find('title').text
 
-    @patch('xml.etree.ElementTree.SubElement',
-           side_effect=[m_node_item, m_node_title])
-    def test_valid_is_true(self, m_SubElement):
+    def test_valid_is_true(self):
         '''
         :type: normal
         :case: keyword argument *valid* is True.
@@ -41,15 +37,12 @@ class TestAppendItem:
         sf = ScriptFilter()
         sf.append_item('sample', valid=True)
 
-        expect = [((sf.xml, 'item'),
-                   {'uid': '0', 'valid': 'yes', 'autocomplete': ''},),
-                  ((self.m_node_item, 'title'),)]
-        assert expect == m_SubElement.call_args_list
-        assert self.m_node_title.text == 'sample'
+        node_item = sf.xml.find('item')
+        assert {'uid': '0', 'valid': 'yes', 'autocomplete': ''} == \
+            node_item.attrib
+        assert 'sample' == node_item.find('title').text
 
-    @patch('xml.etree.ElementTree.SubElement',
-           side_effect=[m_node_item, m_node_title])
-    def test_autocomplete_is_specified(self, m_SubElement):
+    def test_autocomplete_is_specified(self):
         '''
         :type: normal
         :case: keyword argument *autocomplete* is not None.
@@ -58,15 +51,12 @@ class TestAppendItem:
         sf = ScriptFilter()
         sf.append_item('sample', autocomplete='comp_test')
 
-        expect = [((sf.xml, 'item'),
-                   {'uid': '0', 'valid': 'no', 'autocomplete': 'comp_test'},),
-                  ((self.m_node_item, 'title'),)]
-        assert expect == m_SubElement.call_args_list
-        assert self.m_node_title.text == 'sample'
+        node_item = sf.xml.find('item')
+        assert {'uid': '0', 'valid': 'no', 'autocomplete': 'comp_test'} == \
+            node_item.attrib
+        assert 'sample' == node_item.find('title').text
 
-    @patch('xml.etree.ElementTree.SubElement',
-           side_effect=[m_node_item, m_node_title])
-    def test_uid_is_specified(self, m_SubElement):
+    def test_uid_is_specified(self):
         '''
         :type: normal
         :case: keyword argument *uid* is not None.
@@ -75,11 +65,37 @@ class TestAppendItem:
         sf = ScriptFilter()
         sf.append_item('sample', uid='uid_test')
 
-        expect = [((sf.xml, 'item'),
-                   {'uid': 'uid_test', 'valid': 'no', 'autocomplete': ''},),
-                  ((self.m_node_item, 'title'),)]
-        assert expect == m_SubElement.call_args_list
-        assert self.m_node_title.text == 'sample'
+        node_item = sf.xml.find('item')
+        assert {'uid': 'uid_test', 'valid': 'no', 'autocomplete': ''} == \
+            node_item.attrib
+        assert 'sample' == node_item.find('title').text
+
+    def test_items_are_appended(self):
+        '''
+        :type: normal
+        :case: append some items.
+        :expect: default *uid* is index of item.
+        '''
+        sf = ScriptFilter()
+        sf.append_item('first')
+        sf.append_item('second')
+
+        assert ['0', '1'] == [n.get('uid') for n in sf.xml.findall('item')]
+
+    def test_uid_is_mixed(self):
+        '''
+        :type: normal
+        :case: append items with and without *uid*.
+        :expect: default *uid* is index of item including others.
+        '''
+        sf = ScriptFilter()
+        sf.append_item('first')
+        sf.append_item('second', uid='uid_test')
+        sf.append_item('third')
+
+        assert ['0', 'uid_test', '2'] == \
+            [n.get('uid') for n in sf.xml.findall('item')]
+        assert '"uid":"2"' in sf.json_s
 
     def test_title_is_invalid(self):
         '''
@@ -96,28 +112,243 @@ class TestAppendItem:
         execute('')
 
 
-def test_xml():
+class TestXml:
     '''
     Unit test for *ScriptFilter.xml*.
-
-    :type: normal
-    :case: call this method.
-    :expect: return *Script Filter XML* as DOM tree.
     '''
-    sf = ScriptFilter()
-    assert sf.xml == sf._node_items
+
+    @patch('xml.etree.ElementTree.SubElement')
+    def test_default(self, m_SubElement):
+        '''
+        :type: normal
+        :case: append an item, and do not read this property.
+        :expect: DOM elements are not built.
+        '''
+        sf = ScriptFilter()
+        sf.append_item('sample')
+
+        assert not m_SubElement.called
+
+    def test_item_is_appended_after_read(self):
+        '''
+        :type: normal
+        :case: append an item after reading this property.
+        :expect: DOM elements are rebuilt.
+        '''
+        sf = ScriptFilter()
+        sf.append_item('first')
+        assert 1 == len(sf.xml)
+
+        sf.append_item('second')
+        assert 2 == len(sf.xml)
 
 
-@patch('xml.etree.ElementTree.tostring')
-def test_xml_s(m_tostring):
+class TestXmlS:
     '''
     Unit test for *ScriptFilter.xml_s*.
+    '''
+
+    @patch('xml.etree.ElementTree.tostring')
+    def test_default(self, m_tostring):
+        '''
+        :type: normal
+        :case: call this method.
+        :expect: return string without *xml.etree.ElementTree.tostring*.
+        '''
+        sf = ScriptFilter()
+        sf.append_item('sample')
+
+        expect = '<items>' + \
+                 '<item autocomplete="" uid="0" valid="no">' + \
+                 '<title>sample</title>' + \
+                 '</item>' + \
+                 '</items>'
+
+        assert expect == sf.xml_s
+        assert not m_tostring.called
+
+    def test_same_as_element_tree(self):
+        '''
+        :type: normal
+        :case: items include characters to be escaped.
+        :expect: same string as *xml.etree.ElementTree.tostring*.
+        '''
+        sf = ScriptFilter()
+        sf.append_item('<a & b>\t"c"\n', uid='<&>"\n', autocomplete='\'"')
+        sf.append_item(u'月曜日', valid=True,
+                       autocomplete=u'月')
+        sf.append_item('sample')
+
+        assert etree.tostring(sf.xml) == sf.xml_s
+
+    def test_item_is_empty(self):
+        '''
+        :type: normal
+        :case: no item is appended.
+        :expect: same string as *xml.etree.ElementTree.tostring*.
+        '''
+        sf = ScriptFilter()
+
+        assert etree.tostring(sf.xml) == sf.xml_s
+
+
+class TestJsonS:
+    '''
+    Unit test for *ScriptFilter.json_s*.
+    '''
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: call this method.
+        :expect: return items as JSON.
+        '''
+        sf = ScriptFilter()
+        sf.append_item('sample')
+        sf.append_item('Firefox', uid='fx-uid', autocomplete='fx', valid=True)
+
+        expect = '{"items":[' + \
+                 '{"uid":"0","valid":false,"autocomplete":"",' + \
+                 '"title":"sample"},' + \
+                 '{"uid":"fx-uid","valid":true,"autocomplete":"fx",' + \
+                 '"title":"Firefox"}' + \
+                 ']}'
+
+        assert expect == sf.json_s
+
+    def test_same_as_json_module(self):
+        '''
+        :type: normal
+        :case: items include characters to be escaped.
+        :expect: decoded JSON is same as items.
+        '''
+        sf = ScriptFilter()
+        sf.append_item('<a & b>\t"c"\n\\', uid='"')
+        sf.append_item(u'月曜日', autocomplete='\xe6\x9c\x88')
+
+        expect = {'items': [
+            {'uid': '"', 'valid': False, 'autocomplete': '',
+             'title': '<a & b>\t"c"\n\\'},
+            {'uid': '1', 'valid': False, 'autocomplete': u'\u6708',
+             'title': u'\u6708\u66dc\u65e5'}
+        ]}
+
+        assert expect == json.loads(sf.json_s)
+
+    def test_item_is_empty(self):
+        '''
+        :type: normal
+        :case: no item is appended.
+        :expect: return empty items.
+        '''
+        assert '{"items":[]}' == ScriptFilter().json_s
 
-    :type: normal
-    :case: call this method.
-    :expect: call *xml.etree.ElementTree.tostring*.
+
+class TestScriptFilterWriter:
+    '''
+    Unit test for *ScriptFilterWriter*.
     '''
-    sf = ScriptFilter()
-    sf.xml_s
 
-    m_tostring.assert_called_once_with(sf._node_items)
+    def _items(self, sf):
+        sf.append_item('first')
+        sf.append_item('<second> & "third"', uid='uid', valid=True,
+                       autocomplete='a\nb')
+        sf.append_item(u'\u6708')
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: append items and close.
+        :expect: same as *xml_s* of *ScriptFilter*.
+        '''
+        sf = ScriptFilter()
+        self._items(sf)
+
+        fp = StringIO()
+        with ScriptFilterWriter(fp) as writer:
+            self._items(writer)
+
+        assert sf.xml_s == fp.getvalue()
+
+    def test_output_format_is_json(self):
+        '''
+        :type: normal
+        :case: *output_format* is 'json'.
+        :expect: same as *json_s* of *ScriptFilter*.
+        '''
+        sf = ScriptFilter()
+        self._items(sf)
+
+        fp = StringIO()
+        with ScriptFilterWriter(fp, 'json') as writer:
+            self._items(writer)
+
+        assert sf.json_s == fp.getvalue()
+
+    def test_items_are_empty(self):
+        '''
+        :type: normal
+        :case: close without items.
+        :expect: same as empty *ScriptFilter*.
+        '''
+        for output_format, expect in [('xml', ScriptFilter().xml_s),
+                                      ('json', ScriptFilter().json_s)]:
+            fp = StringIO()
+            ScriptFilterWriter(fp, output_format).close()
+            assert expect == fp.getvalue()
+
+    def test_item_is_written_at_once(self):
+        '''
+        :type: normal
+        :case: append an item.
+        :expect: the item is written before close.
+        '''
+        fp = StringIO()
+        writer = ScriptFilterWriter(fp)
+        writer.append_item('first')
+
+        assert fp.getvalue().startswith('<items><item ')
+        assert not fp.getvalue().endswith('</items>')
+
+    def test_flush_is_specified(self):
+        '''
+        :type: normal
+        :case: *flush* is True.
+        :expect: file is flushed after each item and close.
+        '''
+        fp = StringIO()
+        with patch.object(fp, 'flush') as m_flush:
+            writer = ScriptFilterWriter(fp, flush=True)
+            writer.append_item('first')
+            assert 1 == m_flush.call_count
+            writer.append_item('second')
+            writer.close()
+
+        assert 3 == m_flush.call_count
+
+    def test_writer_is_closed(self):
+        '''
+        :type: error
+        :case: append an item after close.
+        :expect: raise ValueError.
+        '''
+        writer = ScriptFilterWriter(StringIO())
+        writer.close()
+
+        @raises(ValueError)
+        def execute():
+            writer.append_item('first')
+
+        execute()
+
+    def test_output_format_is_invalid(self):
+        '''
+        :type: error
+        :case: *output_format* is unknown.
+        :expect: raise ValueError.
+        '''
+        @raises(ValueError)
+        def execute():
+            ScriptFilterWriter(StringIO(), 'yaml')
+
+        execute()
@@ -0,0 +1,157 @@
+# -*- coding:utf-8 -*-
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+from mock import patch
+from nose.tools import raises
+from alc.client import request
+from alc.server import CalendarServer, Coalescer, ThreadingCalendarServer
+
+
+class TestDispatch:
+    '''
+    Unit test for *CalendarServer.dispatch()*.
+    '''
+
+    def setup(self):
+        self.path = os.path.join(tempfile.mkdtemp(), 'alc.sock')
+        self.server = CalendarServer(self.path)
+
+    def teardown(self):
+        self.server.server_close()
+        os.rmdir(os.path.dirname(self.path))
+
+    @patch('alc.command.CalendarCommand.execute', return_value='dummy')
+    def test_default(self, m_execute):
+        '''
+        :type: normal
+        :case: call this method with request.
+        :expect: return output of *CalendarCommand.execute* as JSON.
+        '''
+        line = json.dumps({'config': {'query': '7 2014'}})
+
+        actual = self.server.dispatch(line)
+        m_execute.assert_called_once_with()
+
+        assert {'output': 'dummy'} == json.loads(actual)
+
+    def test_request_is_invalid(self):
+        '''
+        :type: error
+        :case: request is not JSON.
+        :expect: return error as JSON.
+        '''
+        actual = self.server.dispatch('invalid\n')
+
+        assert 'error' in json.loads(actual)
+
+
+class TestCoalescer:
+    '''
+    Unit test for *Coalescer*.
+    '''
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: same config is called while it is executed.
+        :expect: function is executed once, and both get the result.
+        '''
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def execute(config):
+            calls.append(config)
+            started.set()
+            release.wait()
+            return 'dummy'
+
+        coalescer = Coalescer(execute)
+        results = []
+        leader = threading.Thread(
+            target=lambda: results.append(coalescer({'query': '2014'})))
+        leader.start()
+        started.wait()
+        follower = threading.Thread(
+            target=lambda: results.append(coalescer({'query': '2014'})))
+        follower.start()
+        for _ in range(100):
+            if coalescer.coalesced:
+                break
+            time.sleep(0.01)
+        release.set()
+        leader.join()
+        follower.join()
+
+        assert [{'query': '2014'}] == calls
+        assert ['dummy', 'dummy'] == results
+        assert 1 == coalescer.coalesced
+
+    def test_config_is_different(self):
+        '''
+        :type: normal
+        :case: call with different configs in turn.
+        :expect: function is executed for each call.
+        '''
+        coalescer = Coalescer(lambda config: config['query'])
+
+        assert '7' == coalescer({'query': '7'})
+        assert '7' == coalescer({'query': '7'})
+        assert '8' == coalescer({'query': '8'})
+        assert 0 == coalescer.coalesced
+
+    def test_raise_exception(self):
+        '''
+        :type: error
+        :case: function raises an exception.
+        :expect: the exception is raised to the caller.
+        '''
+        def execute(config):
+            raise ValueError('dummy')
+
+        @raises(ValueError)
+        def call():
+            Coalescer(execute)({})
+
+        call()
+
+
+class TestThreadingCalendarServer:
+    '''
+    Unit test for *ThreadingCalendarServer*.
+    '''
+
+    def setup(self):
+        self.path = os.path.join(tempfile.mkdtemp(), 'alc.sock')
+        self.server = ThreadingCalendarServer(self.path)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def teardown(self):
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+        os.rmdir(os.path.dirname(self.path))
+
+    @patch('alc.command.CalendarCommand.execute', return_value='dummy')
+    def test_default(self, m_execute):
+        '''
+        :type: normal
+        :case: send requests from threads.
+        :expect: all requests are answered.
+        '''
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            request({'query': '7 2014'}, self.path)))
+            for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert ['dummy'] * 4 == results
@@ -0,0 +1,165 @@
+# -*- coding:utf-8 -*-
+
+import json
+import os
+import shutil
+import tempfile
+
+from mock import MagicMock, patch
+from nose.tools import raises
+from StringIO import StringIO
+from alc.timing import make_timer, NullTimer, Timer
+
+
+class TestTimer:
+    '''
+    Unit test for *Timer*.
+    '''
+
+    def test_default(self):
+        '''
+        :type: normal
+        :case: record phases and emit.
+        :expect: sinks receive a record, and phases are reset.
+        '''
+        sink = MagicMock()
+        timer = Timer([sink])
+        with timer.phase('a'):
+            pass
+        with timer.phase('b'):
+            pass
+        timer.emit(query='7 2014')
+
+        record = sink.call_args[0][0]
+        assert ['a', 'b'] == sorted(record['phases'].keys())
+        assert '7 2014' == record['query']
+        assert record['total'] >= sum(record['phases'].values())
+        assert {} == timer.phases
+
+    def test_phase_raises(self):
+        '''
+        :type: normal
+        :case: an exception is raised in a phase.
+        :expect: the phase is recorded and the exception is not suppressed.
+        '''
+        timer = Timer([])
+
+        @raises(KeyError)
+        def execute():
+            with timer.phase('a'):
+                raise KeyError()
+
+        execute()
+        assert 'a' in timer.phases
+
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_sink_raises(self, m_stderr):
+        '''
+        :type: error
+        :case: a sink raises an exception on every emit.
+        :expect: it is reported once and removed, and others still work.
+        '''
+        broken = MagicMock(side_effect=OSError('read-only'))
+        sink = MagicMock()
+        timer = Timer([broken, sink])
+        timer.emit(query='1')
+        timer.emit(query='2')
+
+        assert 1 == broken.call_count
+        assert 2 == sink.call_count
+        assert 1 == m_stderr.getvalue().count('read-only')
+
+
+class TestMakeTimer:
+    '''
+    Unit test for *make_timer()*.
+    '''
+
+    @patch.dict('os.environ', {}, clear=True)
+    def test_default(self):
+        '''
+        :type: normal
+        :case: spec and environment variable are not specified.
+        :expect: return NullTimer.
+        '''
+        assert isinstance(make_timer(), NullTimer)
+
+    @patch.dict('os.environ', {'ALC_TIMING': 'stderr'})
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_environment_variable(self, m_stderr):
+        '''
+        :type: normal
+        :case: environment variable is 'stderr'.
+        :expect: record is written to stderr as JSON.
+        '''
+        timer = make_timer()
+        timer.emit(query='')
+
+        assert '' == json.loads(m_stderr.getvalue())['query']
+
+    def test_jsonl(self):
+        '''
+        :type: normal
+        :case: spec is 'jsonl:<path>'.
+        :expect: records are appended to the file.
+        '''
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'data', 'timing.jsonl')
+        try:
+            timer = make_timer('jsonl:%s' % path)
+            timer.emit(query='1')
+            timer.emit(query='2')
+            with open(path) as f:
+                actual = [json.loads(l)['query'] for l in f]
+        finally:
+            shutil.rmtree(directory)
+
+        assert ['1', '2'] == actual
+
+    def test_callable(self):
+        '''
+        :type: normal
+        :case: spec is a list of callables.
+        :expect: all callables receive a record.
+        '''
+        sinks = [MagicMock(), MagicMock()]
+        make_timer(sinks).emit()
+
+        assert all(s.called for s in sinks)
+
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_spec_is_invalid(self, m_stderr):
+        '''
+        :type: error
+        :case: spec is unknown (e.g. typo of environment variable).
+        :expect: it is reported and return NullTimer.
+        '''
+        with patch.dict('os.environ', {'ALC_TIMING': 'stdrr'}):
+            actual = make_timer()
+
+        assert isinstance(actual, NullTimer)
+        assert 'stdrr' in m_stderr.getvalue()
+
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_jsonl_is_not_writable(self, m_stderr):
+        '''
+        :type: error
+        :case: file of 'jsonl:<path>' is not able to be written.
+        :expect: output of command is not changed.
+        '''
+        from alc.command import CalendarCommand
+
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'file')
+        try:
+            open(path, 'w').close()
+            expect = CalendarCommand({'query': '7 2014'}).execute()
+            actual = CalendarCommand(
+                {'query': '7 2014',
+                 'timing': 'jsonl:%s' % os.path.join(path, 'timing.jsonl')}
+            ).execute()
+        finally:
+            shutil.rmtree(directory)
+
+        assert expect == actual
+        assert 'timing sink is disabled' in m_stderr.getvalue()